@@ -0,0 +1,68 @@
+"""
+Prometheus Metrics for the FastAPI Apps
+
+Shared instrumentation for the ticket booking, restaurant, university and
+blog apps. One call wires an app up:
+
+    from app_metrics import instrument_app
+
+    instrument_app(app, "restaurant", engines={"primary": engine}, caches={"redis": cache})
+
+and GET /metrics then serves, all labelled with the app name:
+
+- http_requests_total{method, route, status}: requests per route
+  template (so /events/1 and /events/2 are one series)
+- http_request_duration_seconds{method, route}: latency histogram
+- http_requests_in_progress{method}: requests being handled
+- db_pool_*{engine}: pool capacity, open and checked-out connections,
+  checkouts
+- cache_requests_total{cache, result}: cache hits and misses, for hit
+  ratios such as
+  rate(cache_requests_total{result="hit"}[5m]) / rate(cache_requests_total[5m])
+
+Multi-worker servers: every worker keeps its own metrics, so a scrape
+that lands on one worker would only see its share. Set
+PROMETHEUS_MULTIPROC_DIR to an empty directory before the workers start;
+each worker then writes its values to files there and /metrics merges
+them. With gunicorn, also load this package's hooks so files of exited
+workers stop counting towards the gauges:
+
+    PROMETHEUS_MULTIPROC_DIR=/tmp/metrics gunicorn -c python:app_metrics.gunicorn \\
+        -k uvicorn.workers.UvicornWorker app.main:app
+
+The package lives at the repository root; run the apps with the root on
+PYTHONPATH and prometheus-client installed. Apps call
+load_instrument_app(), which reads METRICS_ENABLED and returns None when
+metrics are off or prometheus-client is missing (see loader.py). The
+other names are imported on first use, so importing the package itself
+does not need prometheus-client.
+"""
+
+import importlib
+
+from .loader import load_instrument_app
+
+_LAZY = {
+    "PrometheusMiddleware": ".middleware",
+    "instrument_app": ".middleware",
+    "instrument_engine": ".collectors",
+    "metrics_endpoint": ".endpoint",
+    "register_cache": ".collectors",
+    "sync_cache_counters": ".collectors",
+}
+
+__all__ = [
+    "PrometheusMiddleware",
+    "instrument_app",
+    "instrument_engine",
+    "load_instrument_app",
+    "metrics_endpoint",
+    "register_cache",
+    "sync_cache_counters",
+]
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
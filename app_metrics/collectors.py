@@ -0,0 +1,96 @@
+"""
+Database pool and cache metrics
+
+Pool gauges follow SQLAlchemy pool events, so they are exact and work
+per worker in multiprocess mode.
+
+Caches keep their own hit and miss counters (an int attribute each);
+register_cache() remembers where to read them, and sync_cache_counters()
+adds what changed since the last call to cache_requests_total. That
+keeps the caches free of any Prometheus code and makes their counts
+mergeable across workers like any other counter.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+
+from .metrics import (
+    CACHE_REQUESTS, DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUTS, DB_POOL_CONNECTIONS, DB_POOL_SIZE,
+)
+
+# Seconds between cache counter syncs triggered by requests
+CACHE_SYNC_INTERVAL = 1.0
+
+
+def instrument_engine(app_name: str, name: str, engine: Any):
+    """Track the connection pool of a sync or async SQLAlchemy engine"""
+    engine = getattr(engine, "sync_engine", engine)
+    labels = (app_name, name)
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        DB_POOL_SIZE.labels(*labels).set(size())
+
+    connections = DB_POOL_CONNECTIONS.labels(*labels)
+    checked_out = DB_POOL_CHECKED_OUT.labels(*labels)
+    checkouts = DB_POOL_CHECKOUTS.labels(*labels)
+
+    def on_connect(dbapi_connection, connection_record):
+        connections.inc()
+
+    def on_close(dbapi_connection, connection_record):
+        connections.dec()
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+        checkouts.inc()
+
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "close", on_close)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+
+
+class _CacheSource:
+    __slots__ = ("name", "cache", "hits", "misses")
+
+    def __init__(self, name: str, cache: Any):
+        self.name = name
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+
+
+_caches: Dict[str, List[_CacheSource]] = {}
+_sync_lock = threading.Lock()
+_last_sync = 0.0
+
+
+def register_cache(app_name: str, name: str, cache: Any):
+    """Export the `hits` and `misses` counters of `cache` as cache_requests_total"""
+    _caches.setdefault(app_name, []).append(_CacheSource(name, cache))
+
+
+def sync_cache_counters(force: bool = True):
+    """Add the hits and misses counted since the last sync to cache_requests_total"""
+    global _last_sync
+    now = time.monotonic()
+    if not force and now - _last_sync < CACHE_SYNC_INTERVAL:
+        return
+    with _sync_lock:
+        _last_sync = now
+        for app_name, sources in _caches.items():
+            for source in sources:
+                for result, attribute in (("hit", "hits"), ("miss", "misses")):
+                    current = getattr(source.cache, attribute)
+                    previous = getattr(source, attribute)
+                    # A counter that went down was reset; count it from zero
+                    delta = current - previous if current >= previous else current
+                    if delta:
+                        CACHE_REQUESTS.labels(app_name, source.name, result).inc(delta)
+                    setattr(source, attribute, current)
@@ -0,0 +1,32 @@
+"""
+/metrics endpoint
+
+Serves this process's registry, or with PROMETHEUS_MULTIPROC_DIR set,
+the values every worker wrote to that directory.
+"""
+
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .collectors import sync_cache_counters
+
+
+def _collect() -> bytes:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus text exposition of every metric"""
+    sync_cache_counters()
+    # Merging multiprocess files reads one file per worker and metric type
+    body = await run_in_threadpool(_collect)
+    # Passed as a header: media_type would append a second charset
+    return Response(body, headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,15 @@
+"""
+Gunicorn hooks for multiprocess metrics
+
+    gunicorn -c python:app_metrics.gunicorn -k uvicorn.workers.UvicornWorker app.main:app
+
+PROMETHEUS_MULTIPROC_DIR must point at a directory that is empty when
+the server starts (stale files from an earlier run would be merged in).
+"""
+
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited"""
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,41 @@
+"""
+Optional metrics for the apps
+
+METRICS_ENABLED is read here only; every app gets its instrument_app
+with one call:
+
+    instrument_app = load_instrument_app(__name__)
+
+This module does not import prometheus-client, so it works when the
+rest of the package cannot be imported.
+"""
+
+import logging
+import os
+from typing import Callable, Optional
+
+METRICS_OFF = ("0", "false", "no", "off")
+
+
+def load_instrument_app(logger_name: str = __name__) -> Optional[Callable]:
+    """
+    Return instrument_app, or None when metrics are off or unavailable
+
+    Unset ("auto"), METRICS_ENABLED logs a warning to `logger_name` when
+    prometheus-client is missing; "true" makes that an error and
+    "false" turns metrics off.
+    """
+    enabled = os.getenv("METRICS_ENABLED", "auto").lower()
+    if enabled in METRICS_OFF:
+        return None
+    try:
+        from .middleware import instrument_app
+    except ImportError as e:
+        if enabled != "auto":
+            raise RuntimeError(
+                f"METRICS_ENABLED is set but app_metrics cannot be imported ({e}); "
+                "install prometheus-client"
+            ) from e
+        logging.getLogger(logger_name).warning("app_metrics cannot be imported (%s); GET /metrics is disabled", e)
+        return None
+    return instrument_app
@@ -0,0 +1,60 @@
+"""
+Metric definitions
+
+Created once per process at import. In multiprocess mode
+(PROMETHEUS_MULTIPROC_DIR set before this module is imported) gauges
+are summed over live workers.
+"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status",
+    ["app", "method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["app", "method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled",
+    ["app", "method"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections the pool keeps open (excluding overflow)",
+    ["app", "engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Open database connections",
+    ["app", "engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections checked out of the pool",
+    ["app", "engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connection checkouts",
+    ["app", "engine"],
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by result (hit or miss)",
+    ["app", "cache", "result"],
+)
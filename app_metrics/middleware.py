@@ -0,0 +1,76 @@
+"""
+Request metrics middleware
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from .collectors import instrument_engine, register_cache, sync_cache_counters
+from .endpoint import metrics_endpoint
+from .metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS
+
+# Route label of requests no route matched (404s for arbitrary paths)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class PrometheusMiddleware:
+    """
+    Count and time every HTTP request by route template
+
+    Pure ASGI middleware; add it last (outermost) so its latency covers
+    the other middleware too. The route label is the matched route's
+    path template, which FastAPI puts in the scope while routing.
+    """
+
+    def __init__(self, app, app_name: str):
+        self.app = app
+        self.app_name = app_name
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(self.app_name, method)
+        in_progress.inc()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            HTTP_REQUESTS.labels(self.app_name, method, route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(self.app_name, method, route).observe(elapsed)
+            sync_cache_counters(force=False)
+
+
+def instrument_app(
+    app,
+    app_name: str,
+    engines: Optional[Dict[str, Any]] = None,
+    caches: Optional[Dict[str, Any]] = None,
+    metrics_path: str = "/metrics",
+):
+    """
+    Add request metrics and a /metrics route to a FastAPI app
+
+    `engines` maps a label to a SQLAlchemy engine whose pool is tracked;
+    `caches` maps a label to an object with `hits` and `misses` counters.
+    Call before the app starts serving (middleware cannot be added later).
+    """
+    app.add_middleware(PrometheusMiddleware, app_name=app_name)
+    app.add_api_route(metrics_path, metrics_endpoint, methods=["GET"], include_in_schema=False)
+    for name, engine in (engines or {}).items():
+        instrument_engine(app_name, name, engine)
+    for name, cache in (caches or {}).items():
+        register_cache(app_name, name, cache)
@@ -0,0 +1,8 @@
+"""Alembic environment of the blog schema"""
+
+from schema_migrations import run_migrations
+
+from blog import models  # noqa: F401 - registers the tables on Base.metadata
+from blog.databse import Base, engine
+
+run_migrations(Base.metadata, engine)
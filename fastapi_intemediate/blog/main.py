@@ -1,12 +1,24 @@
+import os
+
 from fastapi import FastAPI
 
-from . import models
+from app_metrics import load_instrument_app
+from schema_migrations import check_schema
+
+# Prometheus metrics, unless METRICS_ENABLED turns them off (see app_metrics/loader.py)
+instrument_app = load_instrument_app(__name__)
+
 from .databse import engine
 from .routers import blog, user
 
 app = FastAPI(title="FastAPI tutorial")
 
-models.Base.metadata.create_all(bind=engine)
+# Migrations run out of band (alembic -c blog/alembic.ini upgrade head); startup only checks the revision
+with engine.connect() as conn:
+    check_schema(conn, os.path.join(os.path.dirname(__file__), "alembic.ini"))
+
+if instrument_app is not None:
+    instrument_app(app, "blog", engines={"primary": engine})
 
 app.include_router(blog.router)
 app.include_router(user.router)
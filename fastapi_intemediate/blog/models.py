@@ -8,7 +8,7 @@ class Blog(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String)
     body: Mapped[str] = mapped_column(String)
-    user_id:Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
+    user_id:Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True)
 
     creator = relationship("User", back_populates="blogs")
 
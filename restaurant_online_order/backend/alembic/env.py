@@ -0,0 +1,8 @@
+"""Alembic environment of the restaurant schema"""
+
+from schema_migrations import run_migrations
+
+import models  # noqa: F401 - registers the tables on Base.metadata
+from database import Base, engine
+
+run_migrations(Base.metadata, engine)
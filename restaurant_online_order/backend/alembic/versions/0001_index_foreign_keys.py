@@ -0,0 +1,35 @@
+"""Index foreign keys of menu items, orders, order items and reviews
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Menus, order history and cascading deletes filter on these
+INDEXES = [
+    ("ix_menu_items_restaurant_id", "menu_items", ["restaurant_id"]),
+    ("ix_orders_customer_id", "orders", ["customer_id"]),
+    ("ix_orders_restaurant_id", "orders", ["restaurant_id"]),
+    ("ix_order_items_order_id", "order_items", ["order_id"]),
+    ("ix_reviews_restaurant_id", "reviews", ["restaurant_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -12,6 +12,14 @@ redis_client = redis.from_url(REDIS_URL, decode_responses=True)
 
 CACHE_TTL = os.getenv("CACHE_TTL")
 
+class CacheStats:
+    """Hits and misses of get_cache in this process"""
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+cache_stats = CacheStats()
+
 def make_key(prefix: str, **kwargs) -> str:
     parts = [prefix] + [f"{k}={kwargs[k]}" for k in sorted(kwargs) if kwargs[k] is not None]
     return "|".join(parts)
@@ -20,9 +28,13 @@ async def get_cache(key: str):
     cached = await redis_client.get(key)
     if cached:
         try:
-            return json.loads(cached)
+            value = json.loads(cached)
         except json.JSONDecodeError:
+            cache_stats.misses += 1
             return None
+        cache_stats.hits += 1
+        return value
+    cache_stats.misses += 1
     return None
 
 async def set_cache(key: str, value: Any, ttl: int = CACHE_TTL) -> None:
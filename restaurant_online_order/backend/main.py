@@ -1,11 +1,21 @@
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from models import Base
+from app_metrics import load_instrument_app
+from schema_migrations import check_schema
+
 from database import engine
+from cache import cache_stats
 from routes import restaurant, user, menu_items
 
-Base.metadata.create_all(bind=engine)
+# Prometheus metrics, unless METRICS_ENABLED turns them off (see app_metrics/loader.py)
+instrument_app = load_instrument_app(__name__)
+
+# Migrations run out of band (alembic upgrade head); startup only checks the revision
+with engine.connect() as conn:
+    check_schema(conn, os.path.join(os.path.dirname(__file__), "alembic.ini"))
 
 app = FastAPI(title="Restaurant Online Order API", version="1.0.0")
 
@@ -17,6 +27,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if instrument_app is not None:
+    instrument_app(app, "restaurant", engines={"primary": engine}, caches={"redis": cache_stats})
+
 app.include_router(restaurant.router)
 app.include_router(user.router)
 app.include_router(menu_items.router)
@@ -23,8 +23,8 @@ class Orders(Base):
     __tablename__ = "orders"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    customer_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
-    restaurant_id: Mapped[int] = mapped_column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    customer_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    restaurant_id: Mapped[int] = mapped_column(Integer, ForeignKey("restaurants.id"), index=True, nullable=False)
     order_status: Mapped[str] = mapped_column(String(50), nullable=False)
     total_amount: Mapped[float] = mapped_column(Float, nullable=False)
     delivery_address: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -75,7 +75,7 @@ class MenuItems(Base):
     is_vegan: Mapped[bool] = mapped_column(Boolean, default=False)
     is_available: Mapped[bool] = mapped_column(Boolean, default=True)
     preparation_time: Mapped[int] = mapped_column(Integer, nullable=False)
-    restaurant_id: Mapped[int] = mapped_column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    restaurant_id: Mapped[int] = mapped_column(Integer, ForeignKey("restaurants.id"), index=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())  # Timestamp
 
@@ -86,7 +86,7 @@ class OrderItems(Base):
     __tablename__ = "order_items"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id"), index=True, nullable=False)
     menu_item_id: Mapped[int] = mapped_column(Integer, ForeignKey("menu_items.id"), nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     item_price: Mapped[float] = mapped_column(Float, nullable=False)
@@ -100,7 +100,7 @@ class Reviews(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     customer_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
-    restaurant_id: Mapped[int] = mapped_column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    restaurant_id: Mapped[int] = mapped_column(Integer, ForeignKey("restaurants.id"), index=True, nullable=False)
     order_id: Mapped[int] = mapped_column(Integer, ForeignKey("orders.id"), nullable=False)
     rating: Mapped[float] = mapped_column(Float, nullable=False)
     comment: Mapped[str] = mapped_column(String(500))
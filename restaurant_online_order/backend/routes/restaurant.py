@@ -1,3 +1,4 @@
+import logging
 import os
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
@@ -12,6 +13,8 @@ from cache import make_key, get_cache, set_cache
 
 router = APIRouter(prefix="/restaurants", tags=["Restaurants"])
 
+logger = logging.getLogger(__name__)
+
 ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30)
 
 load_dotenv()
@@ -25,7 +28,7 @@ async def get_restaurants(db: Session = Depends(get_db)):
     cache_data = await get_cache(cache_key)
 
     if cache_data:
-        print("fetched restaurants data from CACHE", cache_data)
+        logger.debug("Fetched %d restaurants from cache", len(cache_data))
         return [restaurants.RestaurantResponse(**item) for item in cache_data]
 
     db_restaurants = db.query(Restaurants).all()
@@ -0,0 +1,36 @@
+"""
+Alembic Glue Shared by the FastAPI Apps
+
+Each app keeps its schema changes as alembic revisions (alembic.ini and
+an alembic/ directory next to the app) and runs them once per deploy,
+out of band, before the new code starts:
+
+    alembic upgrade head          # apply pending revisions
+    alembic upgrade head --sql    # print the SQL instead (offline mode)
+    alembic downgrade -1          # undo the last revision
+    alembic history / current     # list revisions / show the database's
+
+This package holds the two pieces every app would otherwise copy:
+
+- run_migrations(), called by each app's alembic/env.py. A brand-new
+  database gets every table from create_all() in its latest shape and
+  is stamped with the head revision instead of replaying history. A
+  database migrated by the numbered runner these apps used before
+  alembic is stamped with the revision matching its schema_version row,
+  so revision ids are the zero-padded step numbers ("0001", "0002", ...).
+- check_schema(), called on app startup. It reads the alembic_version
+  row and refuses to start on a database that is behind, so workers do
+  not race each other through DDL.
+
+The package lives at the repository root; run the apps and alembic with
+the root on PYTHONPATH.
+"""
+
+from .check import SchemaVersionError, check_schema
+from .environment import run_migrations
+
+__all__ = [
+    "SchemaVersionError",
+    "check_schema",
+    "run_migrations",
+]
@@ -0,0 +1,53 @@
+"""
+Startup schema check against the app's alembic head revision
+"""
+
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from alembic.util import CommandError
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is older than the running code"""
+
+
+@lru_cache(maxsize=None)
+def _script_directory(alembic_ini: str) -> ScriptDirectory:
+    return ScriptDirectory.from_config(Config(alembic_ini))
+
+
+def check_schema(conn: Connection, alembic_ini: str) -> str:
+    """
+    Return the database's alembic revision, failing if it is behind
+
+    Reads the alembic_version row and nothing else - no DDL - so it is
+    cheap enough for every worker's startup; the revision scripts are
+    parsed once per process. A revision this release does not know is
+    accepted as newer: migrations only add, so old workers keep running
+    while a deploy rolls out.
+    """
+    script = _script_directory(str(alembic_ini))
+    head = script.get_current_head()
+    current = MigrationContext.configure(conn).get_current_revision()
+    if current == head:
+        return current
+
+    try:
+        known = current is not None and script.get_revision(current) is not None
+    except CommandError:
+        known = False
+    if current is None or known:
+        raise SchemaVersionError(
+            f"Database schema is at revision {current} but this release needs {head}; "
+            f"run `alembic upgrade head` in {Path(alembic_ini).parent} before starting the app"
+        )
+    logger.warning("Database schema revision %s is newer than this release (%s)", current, head)
+    return current
@@ -0,0 +1,91 @@
+"""
+Shared body of the apps' alembic env.py
+"""
+
+import logging
+from contextlib import nullcontext
+from logging.config import fileConfig
+
+from alembic import context
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Table of the numbered migration runner used before alembic
+LEGACY_VERSION_TABLE = "schema_version"
+
+
+def run_migrations(metadata: MetaData, engine: Engine):
+    """
+    Run the pending revisions of the current alembic command
+
+    Uses the connection passed in config.attributes["connection"] when
+    there is one (the apps' own upgrade helpers and tests), else
+    connects with `engine`. Every revision commits together with the
+    alembic_version row, so a failing revision leaves the schema at the
+    last one that fully applied. Logging is configured from alembic.ini
+    only when alembic runs from the command line.
+    """
+    config = context.config
+    connection = config.attributes.get("connection")
+    if config.cmd_opts is not None and config.config_file_name is not None:
+        fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+    if context.is_offline_mode():
+        context.configure(
+            url=engine.url,
+            target_metadata=metadata,
+            literal_binds=True,
+            dialect_opts={"paramstyle": "named"},
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    if connection is not None:
+        _run_online(connection, metadata)
+        return
+    with engine.connect() as connection:
+        _run_online(connection, metadata)
+
+
+def _run_online(connection: Connection, metadata: MetaData):
+    autogenerate = getattr(context.config.cmd_opts, "autogenerate", False)
+    if not autogenerate and _stamp_unversioned(connection, metadata):
+        return
+    context.configure(connection=connection, target_metadata=metadata, transaction_per_migration=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _stamp_unversioned(connection: Connection, metadata: MetaData) -> bool:
+    """
+    Stamp a database alembic has not seen yet; True when it is brand new
+
+    A brand-new database is created from the models and stamped with the
+    head revision. One the numbered runner migrated is stamped with the
+    revision of its schema_version row, so only later revisions run.
+    Anything else without an alembic_version row predates both and
+    replays every revision.
+    """
+    with connection.begin() if not connection.in_transaction() else nullcontext():
+        migration_context = MigrationContext.configure(connection)
+        if migration_context.get_current_revision() is not None:
+            return False
+
+        tables = set(inspect(connection).get_table_names())
+        if not tables & set(metadata.tables):
+            metadata.create_all(bind=connection)
+            migration_context.stamp(context.script, "head")
+            logger.info("Created the schema and stamped it at head")
+            return True
+
+        if LEGACY_VERSION_TABLE in tables:
+            version = connection.scalar(text(f"SELECT MAX(version) FROM {LEGACY_VERSION_TABLE}"))
+            if version:
+                migration_context.stamp(context.script, f"{version:04d}")
+                logger.info("Stamped schema_version %s as revision %04d", version, version)
+    return False
@@ -0,0 +1,47 @@
+"""
+Synthetic Data Seeding for the FastAPI Apps
+
+Fills an app's database with realistic, deterministic data at millions
+of rows per minute, as fixtures for benchmarks and load tests:
+
+    python -m seeding ticket_booking --database sqlite:///ticket_booking_crud/bench.db --bookings 10000000
+    python -m seeding restaurant --database sqlite:///restaurants.db --orders 5000000
+    python -m seeding university --database sqlite:///university-data.db
+    python -m seeding blog --database postgresql://localhost/blog
+
+The schema must already exist and its tables must be empty: run the
+app's migrations against the database first. The seeder
+reflects the tables instead of importing the apps, so it needs nothing
+but SQLAlchemy and the database driver.
+
+See loader.py for how rows get in fast, and each app's module for the
+shape of its data (and its size options, also listed by
+`python -m seeding <app> --help`).
+"""
+
+from . import blog, restaurant, ticket_booking, university
+from .loader import LoadStats, load
+
+# Generator module of each app: Spec, TABLES, generate() and optionally finalize()
+APPS = {
+    "ticket_booking": ticket_booking,
+    "restaurant": restaurant,
+    "university": university,
+    "blog": blog,
+}
+
+
+def seed(engine, app: str, spec=None, **options) -> LoadStats:
+    """Seed `app`'s tables on `engine` with `spec` (the app's Spec; defaults if omitted)"""
+    module = APPS[app]
+    spec = spec or module.Spec()
+    return load(
+        engine,
+        module.TABLES,
+        lambda tables: module.generate(spec, tables),
+        finalize=getattr(module, "finalize", None),
+        **options,
+    )
+
+
+__all__ = ["APPS", "LoadStats", "load", "seed"]
@@ -0,0 +1,55 @@
+"""
+Seeding CLI: python -m seeding <app> --database URL [size options]
+"""
+
+import argparse
+import sys
+from dataclasses import asdict
+
+from sqlalchemy import create_engine
+
+from . import APPS, seed
+from .loader import COMMIT_EVERY, LoadStats
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m seeding", description=sys.modules[__package__].__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="app", required=True)
+    for name, module in APPS.items():
+        subparser = subparsers.add_parser(name, help=module.__doc__.strip().splitlines()[0],
+                                          description=module.__doc__,
+                                          formatter_class=argparse.RawDescriptionHelpFormatter)
+        subparser.add_argument("--database", required=True, help="SQLAlchemy URL of a sync driver")
+        subparser.add_argument("--commit-every", type=int, default=COMMIT_EVERY, help="Rows per transaction")
+        subparser.add_argument("--keep-indexes", action="store_true", help="Do not drop indexes while loading")
+        for option, value in asdict(module.Spec()).items():
+            subparser.add_argument(f"--{option.replace('_', '-')}", type=int, default=value)
+    args = parser.parse_args()
+
+    module = APPS[args.app]
+    spec = module.Spec(**{option: getattr(args, option) for option in asdict(module.Spec())})
+    engine = create_engine(args.database)
+
+    def progress(stats: LoadStats):
+        print(f"\r{stats.total_rows:>14,} rows  {stats.total_rows / stats.insert_seconds:>10,.0f}/s",
+              end="", flush=True)
+
+    try:
+        stats = seed(engine, args.app, spec, commit_every=args.commit_every,
+                     defer_indexes=not args.keep_indexes, progress=progress)
+    except (RuntimeError, ValueError) as e:
+        parser.exit(1, f"\nCannot seed {args.app}: {e}\n")
+    finally:
+        engine.dispose()
+
+    total = stats.insert_seconds + stats.index_seconds + stats.finalize_seconds
+    print(f"\n{'table':<24}{'rows':>14}")
+    for table, rows in stats.rows.items():
+        print(f"{table:<24}{rows:>14,}")
+    print(f"\ninsert {stats.insert_seconds:.1f}s, indexes {stats.index_seconds:.1f}s, "
+          f"finalize {stats.finalize_seconds:.1f}s: {stats.total_rows / total * 60:,.0f} rows/minute")
+
+
+if __name__ == "__main__":
+    main()
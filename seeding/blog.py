@@ -0,0 +1,57 @@
+"""
+Blog app: users and blog posts
+
+A few prolific users write most of the posts. The app stores passwords
+as given; every user's password is "password".
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Dict
+
+from sqlalchemy import Table
+
+from .loader import BATCH_SIZE, Batches
+
+TABLES = ["users", "blogs"]
+
+# Higher values concentrate posts on fewer users
+AUTHOR_SKEW = 2.0
+
+TITLE_WORDS = ["Notes", "Thoughts", "Lessons", "Guide", "Tips", "Story", "Review", "Ideas"]
+SUBJECTS = ["FastAPI", "SQLAlchemy", "Python", "testing", "caching", "async IO", "databases", "deployment"]
+SENTENCES = [
+    "This post walks through a small example end to end.",
+    "The first version was simple and it worked well enough.",
+    "Measuring before optimizing saved a lot of guesswork.",
+    "Most of the time went into reading the documentation.",
+    "A few edge cases only showed up under load.",
+    "The final code is shorter than the first draft.",
+    "Feedback from readers is always welcome.",
+    "Next time I would start with the tests.",
+]
+
+
+@dataclass
+class Spec:
+    """Sizes and seed of a generated dataset"""
+    users: int = 10_000
+    blogs: int = 1_000_000
+    seed: int = 42
+
+
+def generate(spec: Spec, tables: Dict[str, Table]) -> Batches:
+    rng = random.Random(spec.seed)
+
+    for offset in range(0, spec.users, BATCH_SIZE):
+        yield "users", [
+            {"id": u, "name": f"User {u}", "email": f"user{u}@example.com", "password": "password"}
+            for u in range(offset + 1, min(offset + BATCH_SIZE, spec.users) + 1)
+        ]
+    for offset in range(0, spec.blogs, BATCH_SIZE):
+        yield "blogs", [
+            {"id": b, "title": f"{rng.choice(TITLE_WORDS)} on {rng.choice(SUBJECTS)} #{b}",
+             "body": " ".join(rng.choices(SENTENCES, k=rng.randint(3, 12))),
+             "user_id": int(spec.users * rng.random() ** AUTHOR_SKEW) + 1}
+            for b in range(offset + 1, min(offset + BATCH_SIZE, spec.blogs) + 1)
+        ]
@@ -0,0 +1,140 @@
+"""
+Restaurant app: users, restaurants, menu items, orders, order items and reviews
+
+- Every restaurant has the same number of menu items across the four
+  categories; a few restaurants get most of the orders.
+- Orders have 1 to `max_items_per_order` items from their restaurant's
+  menu. The order total is the sum of its items.
+- Orders span the last year. Most are delivered; a share of the
+  delivered orders is reviewed.
+- Every user's password is "password".
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Dict, List
+
+from sqlalchemy import Table
+
+from .loader import BATCH_SIZE, Batches
+
+TABLES = ["users", "restaurants", "menu_items", "orders", "order_items", "reviews"]
+
+# bcrypt hash of "password", as created by auth.get_password_hash (hashing per user would take hours)
+PASSWORD_HASH = "$2b$12$F0N0pbXsbG6aJLn0Q6ctsOoL6qkMSj8r0uTy25/0Bll.ReuQvG/H2"
+# Higher values concentrate orders on fewer restaurants
+RESTAURANT_SKEW = 2.0
+
+CUISINES = ["Italian", "Chinese", "Indian", "Mexican", "Japanese", "Thai", "American", "French", "Greek", "Korean"]
+NAME_WORDS = ["Golden", "Little", "Blue", "Spicy", "Happy", "Royal", "Green", "Old Town", "Lucky", "Urban"]
+NAME_NOUNS = ["Kitchen", "Bistro", "Garden", "House", "Table", "Spoon", "Grill", "Corner", "Palace", "Cafe"]
+MENU = {
+    "Appetizer": (["Soup", "Salad", "Spring Rolls", "Bruschetta", "Dumplings", "Wings"], 4.0, 12.0),
+    "Main Course": (["Curry", "Pasta", "Noodles", "Burger", "Steak", "Stir Fry", "Pizza", "Tacos"], 10.0, 32.0),
+    "Dessert": (["Cheesecake", "Ice Cream", "Brownie", "Tiramisu", "Mochi"], 4.0, 10.0),
+    "Beverage": (["Lemonade", "Iced Tea", "Soda", "Coffee", "Smoothie"], 2.0, 6.0),
+}
+ORDER_STATUSES = (["delivered", "cancelled", "out_for_delivery", "preparing", "pending"], [85, 6, 3, 3, 3])
+COMMENTS = ["Great food!", "Arrived cold.", "Would order again.", "Portions were small.", "Fast delivery.", ""]
+
+
+@dataclass
+class Spec:
+    """Sizes and seed of a generated dataset"""
+    users: int = 50_000
+    restaurants: int = 2_000
+    menu_items_per_restaurant: int = 30
+    orders: int = 1_000_000
+    max_items_per_order: int = 5
+    review_percent: int = 20
+    seed: int = 42
+
+
+def _batched(name: str, rows):
+    batch: List[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            yield name, batch
+            batch = []
+    yield name, batch
+
+
+def generate(spec: Spec, tables: Dict[str, Table]) -> Batches:
+    rng = random.Random(spec.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    categories = list(MENU)
+
+    yield from _batched("users", (
+        {"id": u, "username": f"user{u}", "password": PASSWORD_HASH, "email": f"user{u}@example.com"}
+        for u in range(1, spec.users + 1)
+    ))
+    yield from _batched("restaurants", (
+        {"id": r, "name": f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_NOUNS)} {r}",
+         "description": "Neighbourhood favourite", "cuisine_type": rng.choice(CUISINES),
+         "address": f"{r} Market St", "phone_number": f"555{r:07d}", "email": f"restaurant{r}@example.com",
+         "rating": round(rng.uniform(2.5, 5.0), 1), "is_active": rng.random() < 0.95,
+         "opening_time": time(rng.randint(7, 11)), "closing_time": time(rng.randint(20, 23))}
+        for r in range(1, spec.restaurants + 1)
+    ))
+
+    # Menu item ids of restaurant r are (r - 1) * per + 1 .. r * per
+    per = spec.menu_items_per_restaurant
+    prices: List[float] = []
+
+    def menu_items():
+        for r in range(1, spec.restaurants + 1):
+            for i in range(per):
+                category = categories[i % len(categories)]
+                dishes, low, high = MENU[category]
+                price = round(rng.uniform(low, high), 2)
+                prices.append(price)
+                vegan = rng.random() < 0.1
+                yield {"id": len(prices), "name": f"{rng.choice(dishes)} #{i + 1}", "description": f"House {category.lower()}",
+                       "price": price, "category": category, "is_vegetarian": vegan or rng.random() < 0.25,
+                       "is_vegan": vegan, "is_available": rng.random() < 0.95,
+                       "preparation_time": rng.randint(5, 45), "restaurant_id": r}
+
+    yield from _batched("menu_items", menu_items())
+
+    statuses, weights = ORDER_STATUSES
+    orders: List[dict] = []
+    items: List[dict] = []
+    reviews: List[dict] = []
+    item_id = review_id = 0
+    for o in range(1, spec.orders + 1):
+        restaurant = int(spec.restaurants * rng.random() ** RESTAURANT_SKEW) + 1
+        customer = rng.randint(1, spec.users)
+        status = rng.choices(statuses, weights)[0]
+        ordered = now - timedelta(seconds=rng.randint(0, 365 * 86400))
+        total = 0.0
+        for _ in range(rng.randint(1, spec.max_items_per_order)):
+            menu_item = (restaurant - 1) * per + rng.randint(1, per)
+            quantity = rng.choice([1, 1, 1, 2, 3])
+            total += quantity * prices[menu_item - 1]
+            item_id += 1
+            items.append({"id": item_id, "order_id": o,
+                          "menu_item_id": menu_item, "quantity": quantity,
+                          "item_price": prices[menu_item - 1], "special_requests": ""})
+        orders.append({
+            "id": o, "customer_id": customer, "restaurant_id": restaurant, "order_status": status,
+            "total_amount": round(total, 2), "delivery_address": f"{customer} Elm St",
+            "special_instructions": "Leave at the door" if rng.random() < 0.1 else "",
+            # Delivered orders: when they arrived; the others: when they are expected
+            "order_date": ordered,
+            "delivery_time": ordered + timedelta(minutes=rng.randint(20, 70)),
+        })
+        if status == "delivered" and rng.randrange(100) < spec.review_percent:
+            review_id += 1
+            reviews.append({"id": review_id, "customer_id": customer, "restaurant_id": restaurant, "order_id": o,
+                            "rating": float(rng.randint(1, 5)), "comment": rng.choice(COMMENTS),
+                            "created_at": min(now, ordered + timedelta(hours=rng.randint(1, 48)))})
+        if len(orders) == BATCH_SIZE:
+            yield "orders", orders
+            yield "order_items", items
+            yield "reviews", reviews
+            orders, items, reviews = [], [], []
+    yield "orders", orders
+    yield "order_items", items
+    yield "reviews", reviews
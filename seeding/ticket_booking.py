@@ -0,0 +1,194 @@
+"""
+Ticket booking app: venues, ticket types, events and bookings
+
+Shaped like a real box office:
+
+- Events run from six months ago to a year ahead; past events are
+  completed. Sales opened up to a year before each event, so revenue
+  reports find bookings in every period.
+- Demand is skewed: a few popular events take most of the bookings,
+  until they sell out.
+- Some bookings are cancelled; some are pending holds, half of them
+  already expired.
+- The last `on_sale_events` events have no bookings yet, for on-sale
+  burst benchmarks.
+- Confirmation codes use the legacy "BK" + 10 hex digits format, which
+  the app accepts and can never issue again.
+
+finalize() computes the denormalized counters (events.booked_count,
+ticket type availability, the booking stats tables) from the loaded
+bookings, the same way app.aggregates.rebuild_booking_aggregates does.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import Table, func, insert, select, update
+from sqlalchemy.engine import Connection
+
+from .loader import BATCH_SIZE, Batches
+
+TABLES = ["venues", "ticket_types", "events", "bookings", "event_booking_stats", "venue_booking_stats"]
+
+# Higher values concentrate bookings on fewer events
+EVENT_SKEW = 3.0
+# Generation refuses to fill more than this share of all seats
+MAX_FILL = 0.8
+# Seats each ticket type starts with, before the generated bookings claim theirs
+TICKET_STOCK = 10 ** 9
+
+CITIES = [
+    ("New York", "NY"), ("Los Angeles", "CA"), ("Chicago", "IL"), ("Houston", "TX"), ("Phoenix", "AZ"),
+    ("Philadelphia", "PA"), ("San Antonio", "TX"), ("San Diego", "CA"), ("Dallas", "TX"), ("Austin", "TX"),
+    ("Seattle", "WA"), ("Denver", "CO"), ("Boston", "MA"), ("Nashville", "TN"), ("Portland", "OR"),
+    ("Las Vegas", "NV"), ("Atlanta", "GA"), ("Miami", "FL"), ("Minneapolis", "MN"), ("New Orleans", "LA"),
+]
+VENUE_CAPACITIES = [500, 1500, 5000, 20000, 60000]
+TICKET_TIERS = [("VIP", 300.0), ("Premium", 180.0), ("Standard", 100.0), ("Economy", 50.0), ("Student", 35.0)]
+QUANTITIES = ([1, 2, 3, 4, 6], [35, 40, 10, 10, 5])
+RESERVED = ["PENDING", "CONFIRMED"]
+
+
+@dataclass
+class Spec:
+    """Sizes and seed of a generated dataset"""
+    venues: int = 200
+    events: int = 5000
+    ticket_types: int = 10
+    bookings: int = 1_000_000
+    on_sale_events: int = 5
+    on_sale_capacity: int = 100_000
+    seed: int = 42
+
+
+def generate(spec: Spec, tables: Dict[str, Table]) -> Batches:
+    if spec.events <= spec.on_sale_events:
+        raise ValueError("events must be greater than on_sale_events")
+
+    rng = random.Random(spec.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    venue_capacities = [rng.choice(VENUE_CAPACITIES) for _ in range(spec.venues)]
+    prices = [
+        round(TICKET_TIERS[t % len(TICKET_TIERS)][1] * (1 + t // len(TICKET_TIERS) * 0.25), 2)
+        for t in range(spec.ticket_types)
+    ]
+
+    # (event_date, venue_id, max_capacity) of every event, in id order
+    events = []
+    first, span = now - timedelta(days=182), timedelta(days=545)
+    for _ in range(spec.events - spec.on_sale_events):
+        venue_id = rng.randint(1, spec.venues)
+        event_date = (first + span * rng.random()).replace(minute=0, second=0)
+        events.append((event_date, venue_id, venue_capacities[venue_id - 1]))
+    for e in range(spec.on_sale_events):
+        events.append((now + timedelta(days=60 + e), rng.randint(1, spec.venues), spec.on_sale_capacity))
+
+    quantities, weights = QUANTITIES
+    regular = len(events) - spec.on_sale_events
+    seats = sum(capacity for _, _, capacity in events[:regular])
+    expected = spec.bookings * sum(q * w for q, w in zip(quantities, weights)) / sum(weights)
+    if expected > seats * MAX_FILL:
+        raise ValueError(
+            f"{spec.bookings} bookings need about {expected:.0f} seats but the events only have {seats}; "
+            "generate more events or venues"
+        )
+
+    yield "venues", [
+        {"id": v, "name": f"Venue {v}", "address": f"{v} Main St",
+         "city": CITIES[v % len(CITIES)][0], "state": CITIES[v % len(CITIES)][1],
+         "country": "USA", "capacity": venue_capacities[v - 1]}
+        for v in range(1, spec.venues + 1)
+    ]
+    yield "ticket_types", [
+        {"id": t + 1, "name": f"{TICKET_TIERS[t % len(TICKET_TIERS)][0]} {t // len(TICKET_TIERS) + 1}",
+         "price": prices[t], "availability_count": TICKET_STOCK}
+        for t in range(spec.ticket_types)
+    ]
+    for offset in range(0, len(events), BATCH_SIZE):
+        yield "events", [
+            {"id": e + 1, "name": f"Event {e + 1}", "event_date": event_date, "duration_minutes": 120,
+             "venue_id": venue_id, "max_capacity": capacity, "booked_count": 0,
+             "status": "completed" if event_date < now else "active"}
+            for e, (event_date, venue_id, capacity) in enumerate(events[offset:offset + BATCH_SIZE], offset)
+        ]
+
+    booked = [0] * len(events)
+    customers = max(1000, spec.bookings // 4)
+    rows: List[dict] = []
+    for n in range(spec.bookings):
+        quantity = rng.choices(quantities, weights)[0]
+        index = int(regular * rng.random() ** EVENT_SKEW)
+        # Sold out: the customer settles for any event with seats left
+        while booked[index] + quantity > events[index][2]:
+            index = rng.randrange(regular)
+        event_date, venue_id, _ = events[index]
+
+        # Sales open a year ahead, and at least a week before today, and close when the event starts
+        opened = min(event_date - timedelta(days=365), now - timedelta(days=7))
+        closed = min(event_date, now)
+        booking_date = opened + (closed - opened) * rng.random()
+        roll = rng.random()
+        expires_at = None
+        if roll < 0.12:
+            status = "CANCELLED"
+        elif roll < 0.2 and event_date > now:
+            status = "PENDING"
+            # Half the holds have lapsed and wait for the hold sweeper
+            expires_at = now + timedelta(seconds=rng.randint(-900, 900))
+            booking_date = expires_at - timedelta(minutes=15)
+        else:
+            status = "CONFIRMED"
+        if status != "CANCELLED":
+            booked[index] += quantity
+
+        ticket_type_id = rng.randint(1, len(prices))
+        customer = rng.randint(1, customers)
+        rows.append({
+            "id": n + 1,
+            "event_id": index + 1,
+            "venue_id": venue_id,
+            "ticket_type_id": ticket_type_id,
+            "customer_name": f"Customer {customer}",
+            "customer_email": f"customer{customer}@example.com",
+            "quantity": quantity,
+            "total_amount": quantity * prices[ticket_type_id - 1],
+            "status": status,
+            "confirmation_code": f"BK{n:010X}",
+            "booking_date": booking_date,
+            "expires_at": expires_at,
+        })
+        if len(rows) == BATCH_SIZE:
+            yield "bookings", rows
+            rows = []
+    yield "bookings", rows
+
+
+def finalize(conn: Connection, tables: Dict[str, Table]):
+    bookings, events, ticket_types = tables["bookings"], tables["events"], tables["ticket_types"]
+    confirmed = bookings.c.status == "CONFIRMED"
+    totals = (func.sum(bookings.c.quantity), func.sum(bookings.c.total_amount), func.count(bookings.c.id))
+    counters = ["confirmed_tickets", "confirmed_revenue", "confirmed_bookings"]
+
+    conn.execute(insert(tables["event_booking_stats"]).from_select(
+        ["event_id", "venue_id", *counters],
+        select(bookings.c.event_id, func.min(bookings.c.venue_id), *totals).where(confirmed).group_by(bookings.c.event_id),
+    ))
+    conn.execute(insert(tables["venue_booking_stats"]).from_select(
+        ["venue_id", *counters],
+        select(bookings.c.venue_id, *totals).where(confirmed).group_by(bookings.c.venue_id),
+    ))
+
+    def reserved(column):
+        return (
+            select(func.coalesce(func.sum(bookings.c.quantity), 0))
+            .where(column, bookings.c.status.in_(RESERVED))
+            .scalar_subquery()
+        )
+
+    conn.execute(update(events).values(booked_count=reserved(bookings.c.event_id == events.c.id)))
+    conn.execute(update(ticket_types).values(
+        availability_count=TICKET_STOCK - reserved(bookings.c.ticket_type_id == ticket_types.c.id)
+    ))
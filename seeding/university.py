@@ -0,0 +1,106 @@
+"""
+University app: professors, courses, students and enrollments
+
+- Courses belong to departments and are taught by a professor of any
+  department; popular courses fill up first.
+- Every student enrolls in `enrollments_per_student` distinct courses
+  that still have seats. Courses completed earlier have a grade; the
+  current term's courses have 0.0 (the column is not nullable).
+- GPAs use the app's 3.0-9.0 scale.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List
+
+from sqlalchemy import Table
+
+from .loader import BATCH_SIZE, Batches
+
+TABLES = ["professors", "courses", "students", "enrollments"]
+
+# Higher values concentrate enrollments on fewer courses
+COURSE_SKEW = 1.5
+# Generation refuses to fill more than this share of all seats
+MAX_FILL = 0.8
+
+DEPARTMENTS = [
+    ("Computer Science", "CS"), ("Mathematics", "MATH"), ("Physics", "PHYS"), ("Chemistry", "CHEM"),
+    ("Biology", "BIO"), ("History", "HIST"), ("Economics", "ECON"), ("Philosophy", "PHIL"),
+    ("Literature", "LIT"), ("Psychology", "PSY"),
+]
+TOPICS = ["Introduction to", "Foundations of", "Topics in", "Advanced", "Seminar in", "Applied"]
+CAPACITIES = [30, 60, 120, 250]
+FIRST_NAMES = ["Ada", "Alan", "Grace", "Linus", "Marie", "Niels", "Rosalind", "Carl", "Emmy", "Kurt"]
+LAST_NAMES = ["Lovelace", "Turing", "Hopper", "Pauling", "Curie", "Bohr", "Franklin", "Gauss", "Noether", "Godel"]
+
+
+@dataclass
+class Spec:
+    """Sizes and seed of a generated dataset"""
+    professors: int = 500
+    courses: int = 6_000
+    students: int = 100_000
+    enrollments_per_student: int = 5
+    seed: int = 42
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def generate(spec: Spec, tables: Dict[str, Table]) -> Batches:
+    rng = random.Random(spec.seed)
+    today = date.today()
+
+    capacities = [rng.choice(CAPACITIES) for _ in range(spec.courses)]
+    if spec.courses < spec.enrollments_per_student:
+        raise ValueError("enrollments_per_student must not exceed courses")
+    if spec.students * spec.enrollments_per_student > sum(capacities) * MAX_FILL:
+        raise ValueError(
+            f"{spec.students * spec.enrollments_per_student} enrollments do not fit in {sum(capacities)} seats; "
+            "generate more courses"
+        )
+
+    yield "professors", [
+        {"id": p, "name": _name(rng), "email": f"professor{p}@university.edu",
+         "department": rng.choice(DEPARTMENTS)[0], "hire_date": today - timedelta(days=rng.randint(100, 30 * 365))}
+        for p in range(1, spec.professors + 1)
+    ]
+    for offset in range(0, spec.courses, BATCH_SIZE):
+        rows = []
+        for c in range(offset + 1, min(offset + BATCH_SIZE, spec.courses) + 1):
+            department, code = DEPARTMENTS[c % len(DEPARTMENTS)]
+            rows.append({"id": c, "name": f"{rng.choice(TOPICS)} {department} {c}", "code": f"{code}{c:05d}",
+                         "credits": rng.randint(1, 4), "professor_id": rng.randint(1, spec.professors),
+                         "max_capacity": capacities[c - 1]})
+        yield "courses", rows
+
+    enrolled = [0] * spec.courses
+    students: List[dict] = []
+    enrollments: List[dict] = []
+    for s in range(1, spec.students + 1):
+        students.append({"id": s, "name": _name(rng), "email": f"student{s}@university.edu",
+                         "major": rng.choice(DEPARTMENTS)[0], "year": rng.randint(1, 4),
+                         "gpa": round(rng.uniform(3.0, 9.0), 2)})
+        chosen = set()
+        while len(chosen) < spec.enrollments_per_student:
+            course = int(spec.courses * rng.random() ** COURSE_SKEW)
+            # Full or already taken: any other course with seats left
+            while course in chosen or enrolled[course] >= capacities[course]:
+                course = rng.randrange(spec.courses)
+            chosen.add(course)
+            enrolled[course] += 1
+            current = rng.random() < 0.4
+            enrollments.append({
+                "student_id": s, "course_id": course + 1,
+                "enrollment_date": today - timedelta(days=rng.randint(0, 120) if current else rng.randint(121, 4 * 365)),
+                "grade": 0.0 if current else round(rng.uniform(3.0, 10.0), 1),
+            })
+        if len(enrollments) >= BATCH_SIZE:
+            yield "students", students
+            yield "enrollments", enrollments
+            students, enrollments = [], []
+    yield "students", students
+    yield "enrollments", enrollments
@@ -0,0 +1,8 @@
+"""Alembic environment of the ticket booking schema"""
+
+from schema_migrations import run_migrations
+
+from app import models  # noqa: F401 - registers the tables on Base.metadata
+from app.database import Base, engine
+
+run_migrations(Base.metadata, engine)
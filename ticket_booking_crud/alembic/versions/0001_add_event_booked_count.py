@@ -0,0 +1,40 @@
+"""Add events.booked_count inventory counter
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+events = sa.table("events", sa.column("id", sa.Integer), sa.column("booked_count", sa.Integer))
+bookings = sa.table(
+    "bookings",
+    sa.column("event_id", sa.Integer),
+    sa.column("quantity", sa.Integer),
+    sa.column("status", sa.String),
+)
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("booked_count", sa.Integer(), nullable=False, server_default="0"))
+    # Backfill from the tickets held by pending and confirmed bookings
+    reserved = (
+        sa.select(sa.func.coalesce(sa.func.sum(bookings.c.quantity), 0))
+        .where(bookings.c.event_id == events.c.id, bookings.c.status.in_(["PENDING", "CONFIRMED"]))
+        .scalar_subquery()
+    )
+    op.execute(events.update().values(booked_count=reserved))
+
+
+def downgrade() -> None:
+    op.drop_column("events", "booked_count")
@@ -0,0 +1,74 @@
+"""Add and populate event/venue booking aggregates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+bookings = sa.table(
+    "bookings",
+    sa.column("id", sa.Integer),
+    sa.column("event_id", sa.Integer),
+    sa.column("venue_id", sa.Integer),
+    sa.column("quantity", sa.Integer),
+    sa.column("total_amount", sa.Float),
+    sa.column("status", sa.String),
+)
+COUNTERS = ["confirmed_tickets", "confirmed_revenue", "confirmed_bookings"]
+
+
+def _counter_columns():
+    return [
+        sa.Column("confirmed_tickets", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("confirmed_revenue", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("confirmed_bookings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+
+
+def upgrade() -> None:
+    event_stats = op.create_table(
+        "event_booking_stats",
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), primary_key=True),
+        sa.Column("venue_id", sa.Integer(), sa.ForeignKey("venues.id"), nullable=False),
+        *_counter_columns(),
+    )
+    venue_stats = op.create_table(
+        "venue_booking_stats",
+        sa.Column("venue_id", sa.Integer(), sa.ForeignKey("venues.id"), primary_key=True),
+        *_counter_columns(),
+    )
+
+    # Confirmed totals of the existing bookings
+    totals = (
+        sa.func.sum(bookings.c.quantity),
+        sa.func.sum(bookings.c.total_amount),
+        sa.func.count(bookings.c.id),
+    )
+    confirmed = bookings.c.status == "CONFIRMED"
+    op.execute(event_stats.insert().from_select(
+        ["event_id", "venue_id", *COUNTERS],
+        sa.select(bookings.c.event_id, sa.func.min(bookings.c.venue_id), *totals)
+        .where(confirmed)
+        .group_by(bookings.c.event_id),
+    ))
+    op.execute(venue_stats.insert().from_select(
+        ["venue_id", *COUNTERS],
+        sa.select(bookings.c.venue_id, *totals).where(confirmed).group_by(bookings.c.venue_id),
+    ))
+
+
+def downgrade() -> None:
+    op.drop_table("venue_booking_stats")
+    op.drop_table("event_booking_stats")
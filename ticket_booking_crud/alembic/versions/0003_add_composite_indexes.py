@@ -0,0 +1,39 @@
+"""Add composite indexes on bookings and events
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_events_venue_id_event_date", "events", ["venue_id", "event_date"]),
+    ("ix_events_status_event_date", "events", ["status", "event_date"]),
+    ("ix_bookings_event_id", "bookings", ["event_id"]),
+    ("ix_bookings_event_id_status", "bookings", ["event_id", "status"]),
+    ("ix_bookings_venue_id_status", "bookings", ["venue_id", "status"]),
+    ("ix_bookings_ticket_type_id", "bookings", ["ticket_type_id"]),
+    ("ix_bookings_status_booking_date", "bookings", ["status", "booking_date"]),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently on PostgreSQL, so bookings keep being written
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,33 @@
+"""Add bookings booking_date and status indexes for searches
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_bookings_booking_date", "bookings", ["booking_date"]),
+    ("ix_bookings_status", "bookings", ["status"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
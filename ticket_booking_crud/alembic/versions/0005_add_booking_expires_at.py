@@ -0,0 +1,27 @@
+"""Add bookings.expires_at for seat holds
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("expires_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_bookings_status_expires_at", "bookings", ["status", "expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_status_expires_at", table_name="bookings")
+    op.drop_column("bookings", "expires_at")
@@ -0,0 +1,50 @@
+"""Add code_sequences and idempotency_keys tables
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _missing(table: str) -> bool:
+    # Both tables shipped before this revision, and the numbered runner
+    # used before alembic created missing tables on every run
+    return context.is_offline_mode() or not sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if _missing("code_sequences"):
+        op.create_table(
+            "code_sequences",
+            sa.Column("name", sa.String(50), primary_key=True),
+            sa.Column("next_value", sa.BigInteger(), nullable=False, server_default="0"),
+        )
+    if _missing("idempotency_keys"):
+        op.create_table(
+            "idempotency_keys",
+            sa.Column("key", sa.String(255), primary_key=True),
+            sa.Column("fingerprint", sa.String(64), nullable=False),
+            sa.Column("status_code", sa.Integer(), nullable=True),
+            sa.Column("response_headers", sa.Text(), nullable=True),
+            sa.Column("response_body", sa.LargeBinary(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_idempotency_keys_expires_at", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
+    op.drop_table("code_sequences")
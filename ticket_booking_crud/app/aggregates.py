@@ -0,0 +1,125 @@
+"""
+Booking Aggregates
+
+Confirmed-booking totals per event and per venue live in the
+event_booking_stats and venue_booking_stats tables. Every code path that
+confirms or un-confirms a booking calls apply_booking_delta() inside its
+own transaction, so the totals commit or roll back together with the
+booking itself and reports become single-row lookups.
+
+If the tables ever drift (manual SQL, restored backups), rebuild them
+from the bookings table:
+
+    python -m app.aggregates
+"""
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import UPSERT_INSERTS
+from .models import Booking, BookingStatus, Event, EventBookingStats, VenueBookingStats
+
+_COUNTERS = ("confirmed_tickets", "confirmed_revenue", "confirmed_bookings")
+
+
+def _increment(dialect_name: str, model, keys: dict, deltas: dict, **values):
+    """
+    Build an upsert that adds `deltas` to the counters of the `keys` row
+
+    Extra `values` are only written when the row is first created.
+    """
+    stmt = UPSERT_INSERTS[dialect_name](model).values(**keys, **deltas, **values)
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={
+            **{name: getattr(model, name) + stmt.excluded[name] for name in deltas},
+            "updated_at": func.now(),
+        },
+    )
+
+
+async def apply_booking_delta(
+    db: AsyncSession,
+    event_id: int,
+    venue_id: int,
+    tickets: int,
+    revenue: float,
+    bookings: int,
+):
+    """
+    Add to the confirmed totals of an event and its venue
+
+    Pass negative values when bookings leave the confirmed state. Does not
+    commit: the caller's transaction covers both the booking change and
+    the aggregates.
+    """
+    dialect_name = db.get_bind().dialect.name
+    deltas = {
+        "confirmed_tickets": tickets,
+        "confirmed_revenue": revenue,
+        "confirmed_bookings": bookings,
+    }
+    await db.execute(
+        _increment(dialect_name, EventBookingStats, {"event_id": event_id}, deltas, venue_id=venue_id)
+    )
+    await db.execute(
+        _increment(dialect_name, VenueBookingStats, {"venue_id": venue_id}, deltas)
+    )
+
+
+def rebuild_booking_aggregates(conn: Connection):
+    """
+    Recompute every aggregate from the bookings table
+
+    Replaces both stats tables with grouped sums over confirmed bookings
+    and resets events.booked_count to the tickets held by pending and
+    confirmed bookings. Runs in the caller's transaction.
+    """
+    confirmed = Booking.status == BookingStatus.CONFIRMED
+    totals = (
+        func.sum(Booking.quantity),
+        func.sum(Booking.total_amount),
+        func.count(Booking.id),
+    )
+
+    conn.execute(delete(EventBookingStats))
+    conn.execute(
+        insert(EventBookingStats).from_select(
+            ["event_id", "venue_id", *_COUNTERS],
+            select(Booking.event_id, func.min(Booking.venue_id), *totals)
+            .where(confirmed)
+            .group_by(Booking.event_id),
+        )
+    )
+
+    conn.execute(delete(VenueBookingStats))
+    conn.execute(
+        insert(VenueBookingStats).from_select(
+            ["venue_id", *_COUNTERS],
+            select(Booking.venue_id, *totals)
+            .where(confirmed)
+            .group_by(Booking.venue_id),
+        )
+    )
+
+    reserved = (
+        select(func.coalesce(func.sum(Booking.quantity), 0))
+        .where(
+            Booking.event_id == Event.id,
+            Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+        )
+        .scalar_subquery()
+    )
+    conn.execute(update(Event.__table__).values(booked_count=reserved))
+
+
+if __name__ == "__main__":
+    from .database import create_tables, engine
+
+    create_tables()
+    with engine.begin() as conn:
+        rebuild_booking_aggregates(conn)
+        events = conn.scalar(select(func.count()).select_from(EventBookingStats))
+        venues = conn.scalar(select(func.count()).select_from(VenueBookingStats))
+    print(f"Rebuilt booking aggregates for {events} events and {venues} venues")
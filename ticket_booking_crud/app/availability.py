@@ -0,0 +1,179 @@
+"""
+Event Availability Cache
+
+During an on-sale thousands of clients poll one event's availability
+every second. Each event's availability is cached for a short time, and
+the cache guarantees:
+
+- Single flight: at most one recompute per event is in flight; every
+  request that needs a fresh value awaits that same computation.
+- Probabilistic early refresh (XFetch): as an entry approaches its TTL,
+  each read has a growing chance of starting a background refresh while
+  the current value is still served, so entries are usually replaced
+  before they expire instead of all readers missing at once.
+- Bounded staleness: a value is served for at most
+  AVAILABILITY_MAX_STALENESS seconds after it was computed. Between the
+  TTL and that bound it is served while a refresh runs; past the bound
+  readers wait for the refresh.
+
+Booking writes in this process drop the event's entry, so a client sees
+its own booking immediately; other workers converge within the bound.
+
+The same writes notify `availability_broker`, which pushes changes to
+clients of the availability stream (see app/streams.py) at most
+AVAILABILITY_STREAM_MAX_RATE times per second per event.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .cache import TTLCache
+from .database import AsyncSessionLocal
+from .models import Event
+from .streams import LatestValueBroker
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_TTL = float(os.getenv("AVAILABILITY_TTL", "1.0"))
+AVAILABILITY_MAX_STALENESS = float(os.getenv("AVAILABILITY_MAX_STALENESS", "2.0"))
+
+# Live stream: updates/sec per event, seconds between re-checks for
+# changes made by other workers, and seconds between heartbeats
+AVAILABILITY_STREAM_MAX_RATE = float(os.getenv("AVAILABILITY_STREAM_MAX_RATE", "2"))
+AVAILABILITY_STREAM_POLL_INTERVAL = float(os.getenv("AVAILABILITY_STREAM_POLL_INTERVAL", "5"))
+AVAILABILITY_STREAM_HEARTBEAT = float(os.getenv("AVAILABILITY_STREAM_HEARTBEAT", "15"))
+AVAILABILITY_STREAM_MAX_CLIENTS = int(os.getenv("AVAILABILITY_STREAM_MAX_CLIENTS", "50000"))
+
+# XFetch beta: >1 refreshes earlier, <1 later
+EARLY_REFRESH_BETA = 1.0
+
+
+class SingleFlightCache:
+    """TTL cache whose misses and refreshes are coalesced per key"""
+
+    def __init__(self, ttl: float, max_staleness: float, maxsize: int = 10000, beta: float = EARLY_REFRESH_BETA):
+        self.ttl = ttl
+        self.max_staleness = max(max_staleness, ttl)
+        self.beta = beta
+        # Entries disappear once they reach the staleness bound
+        self._entries = TTLCache(maxsize=maxsize, ttl=self.max_staleness)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Bumped by invalidate() so loads that started earlier are discarded
+        self._generations: Dict[Hashable, int] = {}
+        self.loads = 0
+
+    @property
+    def hits(self) -> int:
+        return self._entries.hits
+
+    @property
+    def misses(self) -> int:
+        return self._entries.misses
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable]):
+        """Return the cached value for `key`, computing it with `load` if needed"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return await self._refresh(key, load)
+
+        value, computed_at, duration = entry
+        now = time.monotonic()
+        expires_at = computed_at + self.ttl
+        # XFetch: -log(U) is exponentially distributed, so the chance of an
+        # early refresh grows as expiry nears and with the cost of loading
+        if now - duration * self.beta * math.log(random.random() or 1e-12) >= expires_at:
+            self._start_refresh(key, load)
+        return value
+
+    def invalidate(self, key: Hashable):
+        self._entries.delete(key)
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._inflight.pop(key, None)
+
+    def _start_refresh(self, key: Hashable, load: Callable[[], Awaitable]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, load))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return task
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the error so background refreshes do not log "never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Loading %r failed: %s", key, task.exception())
+
+    async def _refresh(self, key: Hashable, load: Callable[[], Awaitable]):
+        # Shielded so a cancelled request does not cancel the shared load
+        return await asyncio.shield(self._start_refresh(key, load))
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable]):
+        generation = self._generations.get(key, 0)
+        started = time.monotonic()
+        self.loads += 1
+        value = await load()
+        duration = time.monotonic() - started
+        # Age counts from the start of the load, when the data was read
+        if self._generations.get(key, 0) == generation and duration < self.max_staleness:
+            self._entries.set(key, (value, started, duration), ttl=self.max_staleness - duration)
+        return value
+
+
+availability_cache = SingleFlightCache(AVAILABILITY_TTL, AVAILABILITY_MAX_STALENESS)
+
+
+def invalidate_availability(event_id: int):
+    """Drop an event's cached availability after its bookings change"""
+    availability_cache.invalidate(event_id)
+    availability_broker.notify(event_id)
+
+
+async def load_availability(session_factory: async_sessionmaker, event_id: int) -> dict:
+    """Read an event's ticket availability (404 if the event does not exist)"""
+    async with session_factory() as db:
+        event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Event with ID {event_id} not found"
+        )
+
+    # Tickets reserved so far are kept on the event by the booking engine
+    total_booked = event.booked_count
+    available_tickets = event.max_capacity - total_booked
+    return {
+        "event_id": event_id,
+        "event_name": event.name,
+        "max_capacity": event.max_capacity,
+        "booked_tickets": total_booked,
+        "available_tickets": max(0, available_tickets),
+        "is_sold_out": available_tickets <= 0,
+        "occupancy_rate": round((total_booked / event.max_capacity) * 100, 2) if event.max_capacity > 0 else 0
+    }
+
+
+async def _stream_availability(event_id: int) -> Optional[dict]:
+    # Read from the primary: a notification means it just changed there
+    try:
+        return await availability_cache.get(event_id, lambda: load_availability(AsyncSessionLocal, event_id))
+    except HTTPException as e:
+        if e.status_code == status.HTTP_404_NOT_FOUND:
+            return None
+        raise
+
+
+availability_broker = LatestValueBroker(
+    _stream_availability,
+    max_rate=AVAILABILITY_STREAM_MAX_RATE,
+    poll_interval=AVAILABILITY_STREAM_POLL_INTERVAL,
+)
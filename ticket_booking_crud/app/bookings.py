@@ -0,0 +1,157 @@
+"""
+Booking Engine
+
+Seat reservation for new bookings. Inventory is tracked in two
+denormalized counters - events.booked_count and
+ticket_types.availability_count - and each one is claimed with a single
+conditional UPDATE. The database only applies the change when enough
+seats remain, so concurrent requests can never oversell: a request that
+loses the race matches no row and is rejected, with no read-then-write
+window in between.
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .aggregates import apply_booking_delta
+from .database import write_transaction
+from .models import Booking, BookingStatus, Event, TicketType
+from .schemas import BookingCreate
+from .availability import invalidate_availability
+from .codes import confirmation_codes
+from .holds import HOLD_TTL_SECONDS
+from .stats import invalidate_stats
+
+
+async def _event_rejection(db: AsyncSession, booking: BookingCreate, now: datetime) -> HTTPException:
+    """
+    Explain why the event counter could not be claimed
+
+    Only runs on the failure path, so successful bookings never pay for
+    the extra read.
+    """
+    event = await db.get(Event, booking.event_id)
+    if not event:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Event with ID {booking.event_id} not found"
+        )
+    if event.venue_id != booking.venue_id:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Event {event.id} is not held at venue {booking.venue_id}"
+        )
+    if event.status != "active":
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Event {event.id} is not open for booking (status: {event.status})"
+        )
+    if event.event_date <= now:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Event {event.id} has already taken place"
+        )
+    available = max(0, event.max_capacity - event.booked_count)
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Only {available} tickets left for event {event.id}"
+    )
+
+
+async def _ticket_type_rejection(db: AsyncSession, booking: BookingCreate) -> HTTPException:
+    """Explain why the ticket type counter could not be claimed"""
+    ticket_type = await db.get(TicketType, booking.ticket_type_id)
+    if not ticket_type:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ticket type with ID {booking.ticket_type_id} not found"
+        )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Only {ticket_type.availability_count} {ticket_type.name} tickets left"
+    )
+
+
+async def reserve_booking(db: AsyncSession, booking: BookingCreate) -> Booking:
+    """
+    Reserve seats and create a confirmed booking in one transaction
+
+    1. Claim seats on the event: booked_count + quantity <= max_capacity
+    2. Claim seats on the ticket type: availability_count >= quantity,
+       returning the ticket price
+    3. Insert the booking and add it to the confirmed aggregates
+
+    With `booking.hold` the booking is instead inserted as a PENDING hold
+    expiring in HOLD_TTL_SECONDS and left out of the confirmed aggregates
+    until it is confirmed (see app/holds.py).
+
+    If either claim matches no row the transaction is rolled back and an
+    HTTPException (404/400/409) describing the reason is raised.
+    On SQLite the transaction runs under write_transaction() so bursts
+    queue in-process instead of timing out on the database lock.
+    """
+    quantity = booking.quantity
+    # Issued before the write lock is taken: refilling the code block
+    # reserves numbers in a transaction of its own
+    confirmation_code = await confirmation_codes.next_code()
+    # Event dates and booking timestamps are both naive UTC
+    now = datetime.utcnow()
+
+    async with write_transaction():
+        claimed = await db.execute(
+            update(Event)
+            .where(
+                Event.id == booking.event_id,
+                Event.venue_id == booking.venue_id,
+                Event.status == "active",
+                Event.event_date > now,
+                Event.booked_count + quantity <= Event.max_capacity,
+            )
+            .values(booked_count=Event.booked_count + quantity)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount != 1:
+            await db.rollback()
+            raise await _event_rejection(db, booking, now)
+
+        price = await db.scalar(
+            update(TicketType)
+            .where(
+                TicketType.id == booking.ticket_type_id,
+                TicketType.availability_count >= quantity,
+            )
+            .values(availability_count=TicketType.availability_count - quantity)
+            .returning(TicketType.price)
+            .execution_options(synchronize_session=False)
+        )
+        if price is None:
+            await db.rollback()
+            raise await _ticket_type_rejection(db, booking)
+
+        db_booking = Booking(
+            **booking.model_dump(exclude={"hold"}),
+            total_amount=round(price * quantity, 2),
+            status=BookingStatus.PENDING if booking.hold else BookingStatus.CONFIRMED,
+            confirmation_code=confirmation_code,
+            booking_date=now,
+            expires_at=now + timedelta(seconds=HOLD_TTL_SECONDS) if booking.hold else None,
+        )
+        db.add(db_booking)
+        if not booking.hold:
+            await apply_booking_delta(
+                db,
+                event_id=booking.event_id,
+                venue_id=booking.venue_id,
+                tickets=quantity,
+                revenue=db_booking.total_amount,
+                bookings=1,
+            )
+        await db.commit()
+    invalidate_stats()
+    invalidate_availability(booking.event_id)
+
+    await db.refresh(db_booking)
+    return db_booking
@@ -0,0 +1,187 @@
+"""
+Bulk Import
+
+Inserts large batches of venues, events or ticket types in one request.
+Rows arrive either as a JSON array or as an NDJSON stream (one JSON
+object per line, Content-Type: application/x-ndjson), which is parsed as
+it is received. Each row is validated through the regular Create schema,
+valid rows are written in chunks with one executemany INSERT and one
+commit per chunk, and rejected rows are reported by position instead of
+failing the whole import.
+"""
+
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import write_transaction
+from .models import Venue
+from .schemas import BulkImportResult, BulkRowError
+
+# Rows per INSERT/commit
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+
+# Rejected rows listed in the response; the failed count is always exact
+MAX_REPORTED_ERRORS = 1000
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+# (position in request, validated row)
+Row = Tuple[int, Dict[str, Any]]
+ChunkCheck = Callable[[AsyncSession, List[Row]], Awaitable[Dict[int, str]]]
+
+
+def _parse_error(message: str) -> List[Dict[str, Any]]:
+    return [{"loc": [], "msg": message, "type": "json_invalid"}]
+
+
+async def iter_records(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (index, decoded JSON value) for each row of the request body
+
+    NDJSON bodies are decoded line by line as chunks arrive, so memory use
+    does not grow with the size of the import. Lines that are not valid
+    JSON are yielded as ValueError instances.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type not in NDJSON_CONTENT_TYPES:
+        try:
+            records = json.loads(await request.body())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Request body is not valid JSON: {e}"
+            )
+        if not isinstance(records, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Request body must be a JSON array or an NDJSON stream"
+            )
+        for index, record in enumerate(records):
+            yield index, record
+        return
+
+    index = 0
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _decode_line(line)
+                index += 1
+    if buffer.strip():
+        yield index, _decode_line(buffer)
+
+
+def _decode_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON: {e}")
+
+
+async def _flush(
+    db: AsyncSession,
+    model,
+    rows: List[Row],
+    check_chunk: Optional[ChunkCheck],
+    result: BulkImportResult,
+):
+    """Check and insert one chunk of validated rows in a single transaction"""
+    if check_chunk:
+        rejected = await check_chunk(db, rows)
+        for index, message in rejected.items():
+            _reject(result, index, [{"loc": [], "msg": message, "type": "value_error"}])
+        rows = [row for row in rows if row[0] not in rejected]
+    if not rows:
+        return
+
+    try:
+        async with write_transaction():
+            await db.execute(insert(model), [values for _, values in rows])
+            await db.commit()
+        result.inserted += len(rows)
+    except Exception:
+        # A constraint failed somewhere in the chunk: retry row by row so
+        # only the offending rows are rejected
+        await db.rollback()
+        for index, values in rows:
+            try:
+                async with write_transaction():
+                    await db.execute(insert(model), [values])
+                    await db.commit()
+                result.inserted += 1
+            except Exception as e:
+                await db.rollback()
+                _reject(result, index, [{"loc": [], "msg": str(e.__cause__ or e), "type": "database_error"}])
+
+
+def _reject(result: BulkImportResult, index: int, errors: List[Dict[str, Any]]):
+    result.failed += 1
+    if len(result.errors) < MAX_REPORTED_ERRORS:
+        result.errors.append(BulkRowError(index=index, errors=errors))
+
+
+async def bulk_insert(
+    db: AsyncSession,
+    request: Request,
+    schema: Type[BaseModel],
+    model,
+    check_chunk: Optional[ChunkCheck] = None,
+) -> BulkImportResult:
+    """
+    Validate every row of the request with `schema` and insert into `model`
+
+    `check_chunk` may reject rows that need the database to validate
+    (e.g. foreign keys); it receives each chunk before insertion and
+    returns {index: message} for the rows to drop.
+    """
+    result = BulkImportResult(received=0, inserted=0, failed=0)
+    chunk: List[Row] = []
+
+    async for index, record in iter_records(request):
+        result.received += 1
+        if isinstance(record, ValueError):
+            _reject(result, index, _parse_error(str(record)))
+            continue
+        try:
+            values = schema.model_validate(record).model_dump()
+        except ValidationError as e:
+            _reject(result, index, [
+                {"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]}
+                for err in e.errors()
+            ])
+            continue
+
+        chunk.append((index, values))
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            await _flush(db, model, chunk, check_chunk, result)
+            chunk = []
+
+    await _flush(db, model, chunk, check_chunk, result)
+    return result
+
+
+async def check_event_venues(db: AsyncSession, rows: List[Row]) -> Dict[int, str]:
+    """Reject events whose venue is missing or smaller than max_capacity"""
+    venue_ids = {values["venue_id"] for _, values in rows}
+    result = await db.execute(select(Venue.id, Venue.capacity).where(Venue.id.in_(venue_ids)))
+    capacities = dict(result.all())
+
+    rejected = {}
+    for index, values in rows:
+        capacity = capacities.get(values["venue_id"])
+        if capacity is None:
+            rejected[index] = f"Venue with ID {values['venue_id']} not found"
+        elif values["max_capacity"] > capacity:
+            rejected[index] = (
+                f"Event capacity ({values['max_capacity']}) cannot exceed venue capacity ({capacity})"
+            )
+    return rejected
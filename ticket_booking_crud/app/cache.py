@@ -0,0 +1,65 @@
+"""
+In-Process Caches
+
+A small LRU cache with per-entry expiry for values that are expensive to
+compute and fine to serve slightly stale (dashboard statistics, reports).
+Entries live in the worker process only; every worker keeps its own copy.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries expire `ttl` seconds after set
+
+    Not thread-safe; meant to be used from the event loop thread.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` when missing or expired"""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Dashboard statistics and reports; cleared on every booking write
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "5"))
+stats_cache = TTLCache(maxsize=64, ttl=STATS_CACHE_TTL)
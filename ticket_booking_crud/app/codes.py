@@ -0,0 +1,176 @@
+"""
+Confirmation Codes
+
+Booking confirmation codes look like "BK7D2QX9MAF": the "BK" prefix,
+eight Crockford base32 digits and a check digit. They are collision-free
+by construction, so issuing one never needs a uniqueness check:
+
+- Numbers come from the "booking" row of the code_sequences table. Each
+  worker reserves CONFIRMATION_CODE_BLOCK_SIZE numbers at a time in its
+  own short committed transaction, then hands them out from memory; two
+  workers can never hold the same number.
+- Each number is scrambled with a keyed Feistel permutation of the
+  40-bit code space (CONFIRMATION_CODE_KEY), so consecutive bookings get
+  unrelated-looking codes but distinct numbers still map to distinct
+  codes.
+- The check digit (Luhn mod 32) catches every single mistyped digit and
+  most swaps of adjacent ones, so lookups of mistyped codes are answered
+  without querying the database.
+
+Crockford base32 leaves out I, L, O and U; when reading a code,
+lowercase letters, hyphens and spaces are accepted, and I/L and O are
+read as 1 and 0.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+from typing import Awaitable, Callable, Optional
+
+from .database import UPSERT_INSERTS, async_engine, write_transaction
+from .models import CodeSequence
+
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+CODE_PREFIX = "BK"
+CODE_DIGITS = 8
+CODE_BITS = CODE_DIGITS * 5
+
+CONFIRMATION_CODE_BLOCK_SIZE = int(os.getenv("CONFIRMATION_CODE_BLOCK_SIZE", "1000"))
+CONFIRMATION_CODE_KEY = os.getenv("CONFIRMATION_CODE_KEY", "ticket-booking-codes")
+
+CODE_SEQUENCE = "booking"
+
+# Codes issued before this module existed: "BK" + 10 random hex digits
+_LEGACY_CODE = re.compile(r"^BK[0-9A-F]{10}$")
+
+_DIGIT_VALUES = {char: value for value, char in enumerate(CROCKFORD_ALPHABET)}
+_DIGIT_VALUES.update({"O": 0, "I": 1, "L": 1})
+
+_HALF_BITS = CODE_BITS // 2
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_ROUND_KEYS = [
+    int.from_bytes(hashlib.blake2b(f"{CONFIRMATION_CODE_KEY}:{i}".encode(), digest_size=4).digest(), "big")
+    for i in range(4)
+]
+
+
+def _round(half: int, key: int) -> int:
+    x = ((half ^ key) * 0x45D9F3B) & 0xFFFFFFFF
+    x ^= x >> 16
+    return x & _HALF_MASK
+
+
+def scramble(number: int) -> int:
+    """Map a number in [0, 2**40) to a unique, unrelated-looking number in the same range"""
+    left, right = number >> _HALF_BITS, number & _HALF_MASK
+    for key in _ROUND_KEYS:
+        left, right = right, left ^ _round(right, key)
+    return (left << _HALF_BITS) | right
+
+
+def unscramble(value: int) -> int:
+    """Inverse of scramble()"""
+    left, right = value >> _HALF_BITS, value & _HALF_MASK
+    for key in reversed(_ROUND_KEYS):
+        left, right = right ^ _round(left, key), left
+    return (left << _HALF_BITS) | right
+
+
+def check_digit(digits: str) -> str:
+    """Luhn mod 32 check digit for a string of Crockford digits"""
+    total = 0
+    for position, char in enumerate(reversed(digits)):
+        value = _DIGIT_VALUES[char]
+        if position % 2 == 0:
+            value *= 2
+            value = value // 32 + value % 32
+        total += value
+    return CROCKFORD_ALPHABET[(32 - total % 32) % 32]
+
+
+def encode_code(number: int) -> str:
+    """Confirmation code for a sequence number"""
+    if not 0 <= number < 1 << CODE_BITS:
+        raise ValueError(f"Confirmation code sequence exhausted at {number}")
+    value = scramble(number)
+    digits = "".join(
+        CROCKFORD_ALPHABET[(value >> shift) & 31] for shift in range(CODE_BITS - 5, -1, -5)
+    )
+    return CODE_PREFIX + digits + check_digit(digits)
+
+
+def normalize_code(code: str) -> Optional[str]:
+    """
+    Canonical form of a code as typed by a customer
+
+    Returns None when the code cannot be valid (wrong shape or check
+    digit), so callers can skip the database lookup.
+    """
+    code = code.strip().upper().replace("-", "").replace(" ", "")
+    if _LEGACY_CODE.match(code):
+        return code
+    if not code.startswith(CODE_PREFIX) or len(code) != len(CODE_PREFIX) + CODE_DIGITS + 1:
+        return None
+    try:
+        body = "".join(CROCKFORD_ALPHABET[_DIGIT_VALUES[char]] for char in code[len(CODE_PREFIX):])
+    except KeyError:
+        return None
+    digits, check = body[:-1], body[-1]
+    if check_digit(digits) != check:
+        return None
+    return CODE_PREFIX + body
+
+
+async def reserve_code_block(size: int, sequence: str = CODE_SEQUENCE) -> int:
+    """
+    Reserve `size` numbers of a sequence and return the first one
+
+    Runs in its own transaction on its own connection, committed before
+    any code from the block is used, so a rolled-back booking never
+    returns numbers to the pool.
+    """
+    async with write_transaction():
+        async with async_engine.begin() as conn:
+            stmt = UPSERT_INSERTS[conn.dialect.name](CodeSequence).values(name=sequence, next_value=size)
+            next_value = await conn.scalar(
+                stmt.on_conflict_do_update(
+                    index_elements=[CodeSequence.name],
+                    set_={"next_value": CodeSequence.next_value + size},
+                ).returning(CodeSequence.next_value)
+            )
+    return next_value - size
+
+
+class ConfirmationCodeGenerator:
+    """Hand out confirmation codes from blocks of reserved sequence numbers"""
+
+    def __init__(self, reserve: Callable[[int], Awaitable[int]], block_size: int = CONFIRMATION_CODE_BLOCK_SIZE):
+        self.reserve = reserve
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = asyncio.Lock()
+        self.blocks = 0
+
+    async def next_code(self) -> str:
+        """
+        Return a new confirmation code
+
+        Only touches the database when the current block is used up. Must
+        not be awaited inside write_transaction(), which a block
+        reservation also takes.
+        """
+        if self._next >= self._end:
+            async with self._lock:
+                # Another coroutine may have refilled the block meanwhile
+                if self._next >= self._end:
+                    self._next = await self.reserve(self.block_size)
+                    self._end = self._next + self.block_size
+                    self.blocks += 1
+        number = self._next
+        self._next += 1
+        return encode_code(number)
+
+
+confirmation_codes = ConfirmationCodeGenerator(reserve_code_block)
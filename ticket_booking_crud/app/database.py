@@ -3,55 +3,248 @@ Database Connection Configuration
 
 This file contains the SQLAlchemy database setup including:
 - Database URL configuration
-- Session management
+- Async engine and session management (used by the API handlers)
+- Sync engine and session (used by scripts such as create_tables.py)
+- Connection pool sizing and SQLite pragmas from environment variables
 - Base class for models
 """
 
-from sqlalchemy import create_engine
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
+from .pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+
 # Load environment variables
 load_dotenv()
 
 # Database URL - will use SQLite for development, PostgreSQL for production
 DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
+    "DATABASE_URL",
     "sqlite:///./ticket_booking.db"  # Default to SQLite file
 )
 
-# Create database engine
+# Async driver used for each backend when DATABASE_URL names a sync one,
+# and the sync driver used when it names an async one
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+SYNC_DRIVERS = {
+    "sqlite": "sqlite",
+    "postgresql": "postgresql+psycopg2",
+}
+
+
+def get_async_url(url: str) -> str:
+    """
+    Return the async variant of a database URL
+
+    URLs that already name a driver (e.g. "sqlite+aiosqlite://" or
+    "postgresql+asyncpg://") are returned unchanged.
+    """
+    parsed = make_url(url)
+    if "+" in parsed.drivername:
+        return url
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def get_sync_url(url: str) -> str:
+    """Return the sync variant of a database URL"""
+    parsed = make_url(url)
+    if not parsed.get_dialect().is_async:
+        return url
+    driver = SYNC_DRIVERS.get(parsed.get_backend_name(), parsed.get_backend_name())
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = get_async_url(DATABASE_URL)
+SYNC_DATABASE_URL = get_sync_url(DATABASE_URL)
+
 # For SQLite, we add check_same_thread=False to allow multiple threads
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+# Connection pool settings (per engine, so per worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Unset: ping before each checkout only for network databases, where idle
+# connections can be dropped; a SQLite file connection cannot go stale
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING")
+
+# SQLite pragmas applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    WAL lets readers run alongside the single writer, synchronous=NORMAL
+    skips the fsync per commit that WAL makes unnecessary, and mmap avoids
+    a copy per page read. busy_timeout makes a blocked writer wait instead
+    of failing immediately with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def _pool_pre_ping(url: str) -> bool:
+    if DB_POOL_PRE_PING is not None:
+        return _env_flag("DB_POOL_PRE_PING", "false")
+    return make_url(url).get_backend_name() != "sqlite"
+
+
+def _engine_options(url: str, poolclass, overrides: dict) -> dict:
+    """Pool settings from the environment; in-memory SQLite keeps its default pool"""
+    options = {"connect_args": connect_args}
+    if not _is_memory_sqlite(url):
+        options.update(
+            poolclass=poolclass,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=_pool_pre_ping(url),
+        )
+    options.update(overrides)
+    return options
+
+
+def create_async_db_engine(url: str, **overrides):
+    """
+    Create an async engine with the configured pool and SQLite pragmas
+
+    Keyword arguments override the environment settings (e.g. pool_size).
+    """
+    async_db_engine = create_async_engine(
+        url, **_engine_options(url, InstrumentedAsyncAdaptedQueuePool, overrides)
+    )
+    if async_db_engine.dialect.name == "sqlite":
+        event.listen(async_db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return async_db_engine
+
+
+def create_db_engine(url: str, **overrides):
+    """Create a sync engine with the configured pool and SQLite pragmas"""
+    db_engine = create_engine(url, **_engine_options(url, InstrumentedQueuePool, overrides))
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+# Async engine - used by the FastAPI handlers so queries never block the event loop
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+
+# Create AsyncSessionLocal class - each instance will be an async database session.
+# expire_on_commit=False keeps loaded attributes usable after commit, since
+# lazy refreshes are not allowed on an AsyncSession.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
+# Sync engine - used by scripts and one-off maintenance tasks
+engine = create_db_engine(SYNC_DATABASE_URL)
+
 # Create SessionLocal class - each instance will be a database session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create Base class for our models
 Base = declarative_base()
 
+# INSERT constructs with ON CONFLICT (upsert) support, by dialect name
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# SQLite allows a single writer at a time and makes the others spin in its
+# busy handler, which times out under bursts of concurrent writes. Queueing
+# write transactions in-process keeps them in a fair FIFO instead.
+_sqlite_write_lock = asyncio.Lock() if DATABASE_URL.startswith("sqlite") else None
+
+
+@asynccontextmanager
+async def write_transaction():
+    """
+    Serialize short write transactions on SQLite (no-op elsewhere)
+
+    Wrap the statements of a write transaction, including its commit or
+    rollback, so only one of them holds the SQLite write lock at a time.
+    """
+    if _sqlite_write_lock is None:
+        yield
+        return
+    async with _sqlite_write_lock:
+        yield
+
 # Dependency to get database session
-def get_db():
+async def get_db():
     """
     Database session dependency for FastAPI
-    
-    This function creates a new database session for each request
+
+    This function creates a new async database session for each request
     and closes it when the request is complete.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Function to create all tables
 def create_tables():
     """
-    Create all database tables based on the models
+    Create all database tables based on the models and apply any
+    pending alembic revisions (see app/migrations.py)
+    """
+    from .migrations import upgrade  # alembic imports the models
+
+    with engine.connect() as conn:
+        upgrade(conn)
+
+
+async def create_tables_async():
+    """
+    Create all database tables without blocking the event loop
     """
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    from .migrations import upgrade
+
+    async with async_engine.connect() as conn:
+        await conn.run_sync(upgrade)
+
+
+async def check_schema_async() -> str:
+    """
+    Return the alembic revision of the database, failing if it needs
+    migrations - the only schema work done at app startup
+    """
+    from .migrations import check_schema_version
+
+    async with async_engine.connect() as conn:
+        return await conn.run_sync(check_schema_version)
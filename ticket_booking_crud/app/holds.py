@@ -0,0 +1,162 @@
+"""
+Seat Holds
+
+A booking created with `hold: true` reserves its seats like any other
+booking (events.booked_count and ticket_types.availability_count are
+claimed by the booking engine) but stays PENDING with an expires_at
+HOLD_TTL_SECONDS in the future. Until then it can be confirmed, which
+adds it to the confirmed aggregates.
+
+Holds that are never confirmed are released by `hold_sweeper_loop`:
+every HOLD_SWEEP_INTERVAL seconds it cancels expired holds in batches of
+HOLD_SWEEP_BATCH_SIZE, found through the (status, expires_at) index,
+and gives their seats back to the event and ticket type counters in the
+same transaction. Confirming and releasing are both conditional UPDATEs
+on status = PENDING, so a hold that races the sweeper ends up either
+confirmed or released, never both.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .aggregates import apply_booking_delta
+from .availability import invalidate_availability
+from .database import AsyncSessionLocal, write_transaction
+from .models import Booking, BookingStatus
+from .stats import invalidate_stats
+from .transitions import release_seats
+
+logger = logging.getLogger(__name__)
+
+HOLD_TTL_SECONDS = int(os.getenv("HOLD_TTL_SECONDS", "600"))
+HOLD_SWEEP_INTERVAL = float(os.getenv("HOLD_SWEEP_INTERVAL", "5"))
+HOLD_SWEEP_BATCH_SIZE = int(os.getenv("HOLD_SWEEP_BATCH_SIZE", "1000"))
+
+
+async def _hold_rejection(db: AsyncSession, booking_id: int, now: datetime) -> HTTPException:
+    """Explain why a hold could not be confirmed"""
+    booking = await db.get(Booking, booking_id)
+    if not booking:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Booking with ID {booking_id} not found"
+        )
+    if booking.status != BookingStatus.PENDING:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Booking {booking_id} is {booking.status.value}, not a pending hold"
+        )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Hold on booking {booking_id} expired at {booking.expires_at.isoformat()}"
+    )
+
+
+async def confirm_hold(db: AsyncSession, booking_id: int) -> Booking:
+    """
+    Confirm a pending hold before it expires
+
+    The seats are already reserved, so only the booking's status and the
+    confirmed aggregates change. Raises 404 for unknown bookings and 409
+    when the booking is not pending or its hold has expired.
+    """
+    now = datetime.utcnow()
+    async with write_transaction():
+        confirmed = await db.execute(
+            update(Booking)
+            .where(
+                Booking.id == booking_id,
+                Booking.status == BookingStatus.PENDING,
+                Booking.expires_at > now,
+            )
+            .values(status=BookingStatus.CONFIRMED, expires_at=None)
+            .returning(Booking.event_id, Booking.venue_id, Booking.quantity, Booking.total_amount)
+            .execution_options(synchronize_session=False)
+        )
+        row = confirmed.first()
+        if row is None:
+            await db.rollback()
+            raise await _hold_rejection(db, booking_id, now)
+
+        await apply_booking_delta(
+            db,
+            event_id=row.event_id,
+            venue_id=row.venue_id,
+            tickets=row.quantity,
+            revenue=row.total_amount,
+            bookings=1,
+        )
+        await db.commit()
+    invalidate_stats()
+
+    return await db.get(Booking, booking_id, populate_existing=True)
+
+
+async def release_expired_holds(
+    db: AsyncSession,
+    now: Optional[datetime] = None,
+    batch_size: int = HOLD_SWEEP_BATCH_SIZE,
+) -> int:
+    """
+    Cancel every hold that expired by `now` and return its seats
+
+    Each batch is one transaction: the expired holds are cancelled with a
+    single UPDATE ... RETURNING, then release_seats() adds the returned
+    quantities back to the inventory counters. Returns the number of
+    holds released.
+    """
+    now = now or datetime.utcnow()
+    released = 0
+    while True:
+        expired = (
+            select(Booking.id)
+            .where(Booking.status == BookingStatus.PENDING, Booking.expires_at <= now)
+            .order_by(Booking.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with write_transaction():
+            result = await db.execute(
+                update(Booking)
+                .where(Booking.id.in_(expired.scalar_subquery()), Booking.status == BookingStatus.PENDING)
+                .values(status=BookingStatus.CANCELLED)
+                .returning(Booking.event_id, Booking.ticket_type_id, Booking.quantity)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            if not rows:
+                await db.rollback()
+                break
+
+            event_ids = await release_seats(db, rows)
+            await db.commit()
+
+        released += len(rows)
+        for event_id in event_ids:
+            invalidate_availability(event_id)
+        if len(rows) < batch_size:
+            break
+
+    if released:
+        invalidate_stats()
+    return released
+
+
+async def hold_sweeper_loop():
+    """Release expired holds every HOLD_SWEEP_INTERVAL seconds"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                released = await release_expired_holds(db)
+            if released:
+                logger.info("Released %s expired seat holds", released)
+        except Exception as e:
+            logger.error("Error releasing expired seat holds: %s", e)
+        await asyncio.sleep(HOLD_SWEEP_INTERVAL)
@@ -0,0 +1,390 @@
+"""
+Idempotency Keys
+
+Clients that retry a POST after a timeout send the same `Idempotency-Key`
+header with every attempt. IdempotencyMiddleware runs the handler for the
+first attempt only and answers every retry with the stored response
+(marked with `Idempotent-Replayed: true`) instead of creating a second
+venue, event or booking:
+
+- The first attempt claims the key by inserting an idempotency_keys row
+  with no response yet, before reading the body. The body streams to the
+  handler unbuffered (bulk NDJSON imports keep their memory bound) and is
+  hashed on the way into a fingerprint of the request (method, path,
+  query string and body). The response and fingerprint are stored in
+  that row when the handler finishes, and kept in an in-process LRU
+  cache so most replays never touch the database.
+- Duplicates that arrive while the first attempt is still running wait
+  for it: inside one worker they queue on the key, across workers they
+  poll the row, for up to IDEMPOTENCY_WAIT_SECONDS before getting a 409.
+- Retries are hashed the same way, without being buffered either.
+  Reusing a key for a different request is rejected with 422.
+- Server errors (5xx) and failed handlers release the key, so the client
+  can retry for real. A claim left behind by a crashed worker is taken
+  over after IDEMPOTENCY_LOCK_SECONDS.
+
+Keys expire IDEMPOTENCY_TTL_SECONDS after the first attempt; expired rows
+are purged every IDEMPOTENCY_PURGE_INTERVAL seconds.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select, update
+from starlette.responses import JSONResponse
+
+from .cache import TTLCache
+from .database import UPSERT_INSERTS, async_engine, write_transaction
+from .models import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10"))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+IDEMPOTENCY_MAX_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", "65536"))
+IDEMPOTENCY_PURGE_INTERVAL = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL", "3600"))
+
+# Outcomes of IdempotencyStore.claim()
+CLAIMED = "claimed"
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+_records = IdempotencyRecord.__table__
+_KEY_HEADER = IDEMPOTENCY_HEADER.lower().encode()
+
+
+@dataclass
+class StoredResponse:
+    """A response recorded for an idempotency key"""
+    fingerprint: str
+    status_code: Optional[int] = None
+    headers: Optional[List[Tuple[bytes, bytes]]] = None
+    body: bytes = b""
+
+    @classmethod
+    def from_row(cls, row) -> "StoredResponse":
+        headers = None
+        if row.response_headers is not None:
+            headers = [(name.encode("latin-1"), value.encode("latin-1"))
+                       for name, value in json.loads(row.response_headers)]
+        return cls(row.fingerprint, row.status_code, headers, row.response_body or b"")
+
+
+# Fingerprint of a claim whose request body is still being read
+PENDING_FINGERPRINT = ""
+
+
+def fingerprint_digest(method: str, path: str, query_string: bytes):
+    """
+    SHA-256 of everything that makes two requests the same request, fed
+    the body afterwards with update()
+    """
+    digest = hashlib.sha256(f"{method} {path}?".encode())
+    digest.update(query_string)
+    digest.update(b"\n")
+    return digest
+
+
+class HashingReceive:
+    """
+    ASGI receive callable that feeds the request body into a fingerprint
+    as it passes through, so the body is never held in memory
+    """
+
+    def __init__(self, receive, digest):
+        self.receive = receive
+        self.digest = digest
+        self.complete = False
+        self.disconnected = False
+
+    async def __call__(self):
+        message = await self.receive()
+        if message["type"] == "http.disconnect":
+            self.disconnected = True
+        elif message["type"] == "http.request" and not self.complete:
+            self.digest.update(message.get("body", b""))
+            self.complete = not message.get("more_body", False)
+        return message
+
+    async def drain(self) -> bool:
+        """Hash whatever body is left unread; False if the client went away first"""
+        while not self.complete and not self.disconnected:
+            await self()
+        return self.complete
+
+    def fingerprint(self) -> str:
+        return self.digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Idempotency records in the idempotency_keys table, with completed
+    responses also kept in an LRU cache
+
+    Every statement runs on its own short connection, outside the
+    request's session, so a claim is visible to other workers before the
+    handler starts and survives the handler rolling back.
+    """
+
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL_SECONDS, cache_size: int = IDEMPOTENCY_CACHE_SIZE):
+        self.ttl = ttl
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl)
+
+    def cached(self, key: str) -> Optional[StoredResponse]:
+        return self.cache.get(key)
+
+    async def claim(self, key: str) -> Tuple[str, Optional[StoredResponse]]:
+        """
+        Claim a key for a new request
+
+        Returns (CLAIMED, None) when the caller should run the request,
+        (COMPLETED, response) when it already ran, and (IN_PROGRESS,
+        record) while another attempt holds the key. The claim's
+        fingerprint is only known once the body has been read, so it is
+        stored by complete().
+        """
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl)
+        async with write_transaction():
+            async with async_engine.begin() as conn:
+                inserted = await conn.execute(
+                    UPSERT_INSERTS[conn.dialect.name](_records)
+                    .values(key=key, fingerprint=PENDING_FINGERPRINT, created_at=now, expires_at=expires_at)
+                    .on_conflict_do_nothing(index_elements=[_records.c.key])
+                )
+                if inserted.rowcount == 1:
+                    return CLAIMED, None
+
+                # Expired keys and claims abandoned by a crashed worker start over
+                taken = await conn.execute(
+                    update(_records)
+                    .where(
+                        _records.c.key == key,
+                        or_(
+                            _records.c.expires_at <= now,
+                            and_(
+                                _records.c.status_code.is_(None),
+                                _records.c.created_at <= now - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS),
+                            ),
+                        ),
+                    )
+                    .values(
+                        fingerprint=PENDING_FINGERPRINT, status_code=None, response_headers=None,
+                        response_body=None, created_at=now, expires_at=expires_at,
+                    )
+                )
+                if taken.rowcount == 1:
+                    return CLAIMED, None
+
+                row = (await conn.execute(select(_records).where(_records.c.key == key))).first()
+
+        if row is None:
+            # Released between the insert and the select; claim it again
+            return await self.claim(key)
+        record = StoredResponse.from_row(row)
+        if record.status_code is None:
+            return IN_PROGRESS, record
+        self.cache.set(key, record, ttl=(row.expires_at - now).total_seconds())
+        return COMPLETED, record
+
+    async def complete(self, key: str, response: StoredResponse):
+        """Store the response and request fingerprint of a claimed key"""
+        headers = json.dumps([[name.decode("latin-1"), value.decode("latin-1")]
+                              for name, value in response.headers])
+        async with write_transaction():
+            async with async_engine.begin() as conn:
+                await conn.execute(
+                    update(_records)
+                    .where(_records.c.key == key, _records.c.status_code.is_(None))
+                    .values(fingerprint=response.fingerprint, status_code=response.status_code,
+                            response_headers=headers, response_body=response.body)
+                )
+        self.cache.set(key, response)
+
+    async def release(self, key: str):
+        """Give up a claim without storing a response"""
+        async with write_transaction():
+            async with async_engine.begin() as conn:
+                await conn.execute(
+                    delete(_records).where(_records.c.key == key, _records.c.status_code.is_(None))
+                )
+
+    async def purge_expired(self, now: Optional[datetime] = None) -> int:
+        """Delete expired records and return how many were deleted"""
+        now = now or datetime.utcnow()
+        async with write_transaction():
+            async with async_engine.begin() as conn:
+                result = await conn.execute(delete(_records).where(_records.c.expires_at <= now))
+        return result.rowcount
+
+
+idempotency_store = IdempotencyStore()
+
+
+async def idempotency_purge_loop():
+    """Delete expired idempotency keys every IDEMPOTENCY_PURGE_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(IDEMPOTENCY_PURGE_INTERVAL)
+        try:
+            purged = await idempotency_store.purge_expired()
+            if purged:
+                logger.info("Purged %s expired idempotency keys", purged)
+        except Exception as e:
+            logger.error("Error purging expired idempotency keys: %s", e)
+
+
+class IdempotencyMiddleware:
+    """
+    Run requests carrying an Idempotency-Key at most once
+
+    Pure ASGI middleware for the given methods; requests without the
+    header pass straight through. If the store cannot be reached the
+    request runs without idempotency rather than failing.
+    """
+
+    def __init__(self, app, methods=("POST",), store: IdempotencyStore = idempotency_store,
+                 wait_seconds: float = IDEMPOTENCY_WAIT_SECONDS):
+        self.app = app
+        self.methods = set(methods)
+        self.store = store
+        self.wait_seconds = wait_seconds
+        # Keys of requests running in this worker -> future set when they finish
+        self._in_flight = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+        raw_key = next((value for name, value in scope["headers"] if name == _KEY_HEADER), None)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = raw_key.decode("latin-1").strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters"},
+                status_code=400,
+            )(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_seconds
+
+        # Duplicates within this worker queue behind the running attempt
+        while (running := self._in_flight.get(key)) is not None:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                await self._still_running(scope, receive, send)
+                return
+            await asyncio.wait([running], timeout=remaining)
+
+        done = loop.create_future()
+        self._in_flight[key] = done
+        try:
+            await self._handle(key, deadline, scope, receive, send)
+        finally:
+            del self._in_flight[key]
+            done.set_result(None)
+
+    async def _handle(self, key, deadline, scope, receive, send):
+        body = HashingReceive(
+            receive, fingerprint_digest(scope["method"], scope["path"], scope.get("query_string", b"")),
+        )
+        record = self.store.cached(key)
+        if record is None:
+            try:
+                outcome, record = await self.store.claim(key)
+                # Another worker is running the request: poll until it is done
+                delay = 0.02
+                loop = asyncio.get_running_loop()
+                while outcome == IN_PROGRESS:
+                    if loop.time() + delay > deadline:
+                        await self._still_running(scope, receive, send)
+                        return
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 0.5)
+                    outcome, record = await self.store.claim(key)
+            except Exception as e:
+                logger.warning("Idempotency store unavailable, running request without it: %s", e)
+                await self.app(scope, receive, send)
+                return
+
+            if outcome == CLAIMED:
+                await self._run(key, scope, body, send)
+                return
+
+        # A retry: hash its body to tell it apart from a different request
+        if not await body.drain():
+            return
+        if record.fingerprint != body.fingerprint():
+            await JSONResponse(
+                {"detail": f"{IDEMPOTENCY_HEADER} was already used for a different request"},
+                status_code=422,
+            )(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": record.status_code,
+            "headers": [*record.headers, (REPLAYED_HEADER.lower().encode(), b"true")],
+        })
+        await send({"type": "http.response.body", "body": record.body})
+
+    async def _run(self, key, scope, body: HashingReceive, send):
+        """Run the request for a claimed key and store its response"""
+        response = StoredResponse(PENDING_FINGERPRINT)
+        storable = True
+
+        async def capture(message):
+            nonlocal storable
+            if message["type"] == "http.response.start":
+                response.status_code = message["status"]
+                response.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body" and storable:
+                response.body += message.get("body", b"")
+                storable = len(response.body) <= IDEMPOTENCY_MAX_BODY_BYTES
+            await send(message)
+
+        try:
+            await self.app(scope, body, capture)
+            # The handler may answer without reading the whole body
+            complete = await body.drain()
+        except BaseException:
+            await self._release(key)
+            raise
+
+        if not complete or response.status_code is None or response.status_code >= 500 or not storable:
+            await self._release(key)
+            return
+        response.fingerprint = body.fingerprint()
+        try:
+            await self.store.complete(key, response)
+        except Exception as e:
+            logger.warning("Failed to store response for idempotency key %s: %s", key, e)
+            await self._release(key)
+
+    async def _release(self, key):
+        try:
+            await self.store.release(key)
+        except Exception as e:
+            logger.warning("Failed to release idempotency key %s: %s", key, e)
+
+    async def _still_running(self, scope, receive, send):
+        await JSONResponse(
+            {"detail": f"A request with this {IDEMPOTENCY_HEADER} is still in progress"},
+            status_code=409,
+            headers={"Retry-After": "1"},
+        )(scope, receive, send)
@@ -0,0 +1,108 @@
+"""
+Related Resource Expansion
+
+`GET /events/{event_id}?include=venue,ticket_types,bookings` and
+`GET /venues/{venue_id}?include=events` return the resource together with
+its related records, so a client renders an event or venue page with one
+round trip instead of three or more.
+
+Every include costs at most one query no matter how many related rows
+there are: the venue is joined onto the event's own SELECT
+(joinedload), and each collection is a single bounded SELECT. The
+collections are paged like their list endpoints (bookings by id, events
+by date), up to INCLUDE_PAGE_LIMIT rows. When more exist, X-Next-Cursor
+holds a cursor that continues the listing at
+/events/{event_id}/bookings or /venues/{venue_id}/events.
+
+Ticket types are not tied to events; every ticket type can be booked for
+any event, so `ticket_types` lists all of them with their live
+availability.
+"""
+
+import os
+from typing import Optional, Set
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from .models import Booking, Event, TicketType, Venue
+from .pagination import fetch_page
+from .schemas import EventResponse, VenueResponse
+
+INCLUDE_PAGE_LIMIT = int(os.getenv("INCLUDE_PAGE_LIMIT", "100"))
+
+EVENT_INCLUDES = ("venue", "ticket_types", "bookings")
+VENUE_INCLUDES = ("events",)
+
+# Includes whose rows change with every booking; responses with them are not cached
+LIVE_INCLUDES = {"ticket_types", "bookings"}
+
+
+def parse_includes(include: Optional[str], allowed) -> Set[str]:
+    """Parse a comma-separated ?include= value, rejecting unknown names with a 400"""
+    names = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include {', '.join(sorted(unknown))}; expected any of: {', '.join(allowed)}"
+        )
+    return names
+
+
+async def load_event_details(
+    db: AsyncSession,
+    event_id: int,
+    includes: Set[str],
+    response: Response,
+    limit: int = INCLUDE_PAGE_LIMIT,
+) -> Optional[dict]:
+    """
+    Load an event with the requested includes as EventDetails content
+
+    Runs one query for the event (and its venue) plus one per included
+    collection. Returns None when the event does not exist.
+    """
+    query = select(Event).where(Event.id == event_id)
+    if "venue" in includes:
+        query = query.options(joinedload(Event.venue))
+    event = (await db.execute(query)).scalar_one_or_none()
+    if event is None:
+        return None
+
+    details = {name: getattr(event, name) for name in EventResponse.model_fields}
+    if "venue" in includes:
+        details["venue"] = event.venue
+    if "ticket_types" in includes:
+        details["ticket_types"] = (await db.scalars(select(TicketType).order_by(TicketType.id))).all()
+    if "bookings" in includes:
+        details["bookings"] = await fetch_page(
+            db, select(Booking).where(Booking.event_id == event_id), [Booking.id], response, limit=limit
+        )
+    return details
+
+
+async def load_venue_details(
+    db: AsyncSession,
+    venue_id: int,
+    includes: Set[str],
+    response: Response,
+    limit: int = INCLUDE_PAGE_LIMIT,
+) -> Optional[dict]:
+    """
+    Load a venue with the requested includes as VenueDetails content
+
+    Returns None when the venue does not exist.
+    """
+    venue = await db.get(Venue, venue_id)
+    if venue is None:
+        return None
+
+    details = {name: getattr(venue, name) for name in VenueResponse.model_fields}
+    if "events" in includes:
+        details["events"] = await fetch_page(
+            db, select(Event).where(Event.venue_id == venue_id), [Event.event_date, Event.id], response, limit=limit
+        )
+    return details
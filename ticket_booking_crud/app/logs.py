@@ -0,0 +1,204 @@
+"""
+Structured Logging
+
+setup_logging() routes every log record through a queue: the logging
+call only builds the record, merges its %-style arguments and puts it on
+an in-memory queue. A QueueListener thread formats the record (one JSON
+object per line by default, LOG_FORMAT=text for the classic
+"LEVEL:logger:message" lines) and writes it, so request handlers never
+wait on stderr or a log collector.
+
+Log calls pass their arguments separately, logger.info("Created %s", x),
+so records below the configured LOG_LEVEL are dropped before any string
+is built.
+
+AccessLogMiddleware writes one "app.access" record per request with the
+route template, status, latency and the SQL time and statement count
+measured by QueryStatsMiddleware. Hot routes are sampled
+(ACCESS_LOG_ROUTE_SAMPLE_RATES, e.g. "GET /health=0.01"); every record
+carries the sample_rate it was kept with, so counts can be scaled back
+up. Errors (status >= 400) and requests slower than ACCESS_LOG_SLOW_MS
+are always logged. Run uvicorn with --no-access-log to avoid logging
+each request twice.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1"))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "1000"))
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse "METHOD /route=rate,..." into {"METHOD /route": rate}"""
+    rates = {}
+    for entry in value.split(","):
+        if entry.strip():
+            route, _, rate = entry.rpartition("=")
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+# Routes polled by dashboards and clients far more often than the rest
+ACCESS_LOG_ROUTE_SAMPLE_RATES = parse_sample_rates(os.getenv(
+    "ACCESS_LOG_ROUTE_SAMPLE_RATES",
+    "GET /health=0.01,GET /events/{event_id}/available-tickets=0.1,GET /events/{event_id}=0.1",
+))
+
+access_logger = logging.getLogger("app.access")
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# json.dumps() builds a new encoder on every call made with `default`
+_json_encoder = json.JSONEncoder(default=str)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, with `extra` fields at the top level"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return _json_encoder.encode(entry)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The stock prepare() formats the whole record in the calling thread.
+    Here only the message is merged with its arguments (they may be
+    mutated after the call returns) and tracebacks are rendered, since
+    the traceback's frames do not outlive the except block.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT, stream=None) -> QueueListener:
+    """Send all logging through a queue to a background writer thread (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Write out every queued record and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class AccessLogMiddleware:
+    """
+    Log one structured record per HTTP request
+
+    Pure ASGI middleware; add it last so its latency covers the other
+    middleware too.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = ACCESS_LOG_SAMPLE_RATE,
+        route_sample_rates: Dict[str, float] = ACCESS_LOG_ROUTE_SAMPLE_RATES,
+        slow_ms: float = ACCESS_LOG_SLOW_MS,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.route_sample_rates = route_sample_rates
+        self.slow_ms = slow_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not access_logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._log(scope, status_code, (time.perf_counter() - started) * 1000)
+
+    def _log(self, scope, status_code: int, latency_ms: float):
+        method = scope["method"]
+        route = getattr(scope.get("route"), "path", None)
+        sample_rate = self.route_sample_rates.get(f"{method} {route}", self.sample_rate)
+        if status_code < 400 and latency_ms < self.slow_ms:
+            if sample_rate <= 0 or (sample_rate < 1 and random.random() >= sample_rate):
+                return
+        else:
+            sample_rate = 1.0
+
+        stats = scope.get("query_stats")
+        access_logger.info(
+            "%s %s %s %.1fms", method, scope["path"], status_code, latency_ms,
+            extra={
+                "method": method,
+                "path": scope["path"],
+                "route": route,
+                "status": status_code,
+                "latency_ms": round(latency_ms, 2),
+                "db_ms": round(stats.duration * 1000, 2) if stats else None,
+                "db_queries": stats.count if stats else None,
+                "sample_rate": sample_rate,
+            },
+        )
@@ -5,28 +5,68 @@ This file contains the FastAPI application instance and all route handlers.
 It serves as the entry point for the ticket booking system.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update
 from typing import List, Optional
 from datetime import datetime
+import asyncio
 import logging
 
+from app_metrics import load_instrument_app
+
+# Prometheus metrics, unless METRICS_ENABLED turns them off (see app_metrics/loader.py)
+instrument_app = load_instrument_app(__name__)
+
 # Import our models, schemas, and database dependencies
-from .database import get_db, create_tables
-from .models import Venue, Event, TicketType, Booking, BookingStatus
+from .database import async_engine, get_db, check_schema_async, create_tables_async
+from .availability import (
+    AVAILABILITY_STREAM_HEARTBEAT, AVAILABILITY_STREAM_MAX_CLIENTS,
+    availability_broker, availability_cache, invalidate_availability, load_availability,
+)
+from .bookings import reserve_booking
+from .bulk import bulk_insert, check_event_venues
+from .cache import stats_cache
+from .codes import normalize_code
+from .exports import EXPORT_FORMATS, stream_bookings
+from .holds import HOLD_SWEEP_INTERVAL, confirm_hold, hold_sweeper_loop
+from .idempotency import (
+    IDEMPOTENCY_PURGE_INTERVAL, REPLAYED_HEADER, IdempotencyMiddleware, idempotency_purge_loop, idempotency_store,
+)
+from .includes import (
+    EVENT_INCLUDES, INCLUDE_PAGE_LIMIT, LIVE_INCLUDES, VENUE_INCLUDES, load_event_details, load_venue_details,
+    parse_includes,
+)
+from .logs import AccessLogMiddleware, setup_logging
+from .migrations import MIGRATE_ON_STARTUP
+from .pagination import NEXT_CURSOR_HEADER, cursor_headers, fetch_page
+from .pool import pool_stats
+from .query_stats import QueryStatsMiddleware, instrument_engine, query_budget
+from .replicas import (
+    REPLICA_SQLITE_SYNC_INTERVAL, ReadYourWritesMiddleware, close_replica, get_read_db, read_sessionmaker,
+    replica_engine, replica_lag, sqlite_replica_sync_loop, sync_sqlite_replica,
+)
+from .response_cache import MemoryBackend, response_cache
+from .search import booking_filter_clauses, booking_sort_keys, invalidate_lookups, lookup_cache
+from .stats import REPORT_PERIODS, get_booking_stats, get_revenue_report, get_system_stats, invalidate_stats
+from .streams import sse_stream
+from .transitions import change_booking_status
+from .models import Venue, Event, TicketType, Booking, BookingStatus, EventBookingStats, VenueBookingStats
 from .schemas import (
-    VenueCreate, VenueUpdate, VenueResponse, VenueWithEvents,
-    EventCreate, EventUpdate, EventResponse, EventWithVenue,
+    VenueCreate, VenueUpdate, VenueResponse, VenueWithEvents, VenueDetails,
+    EventCreate, EventUpdate, EventResponse, EventWithVenue, EventDetails,
     TicketTypeCreate, TicketTypeUpdate, TicketTypeResponse,
     BookingCreate, BookingUpdate, BookingResponse, BookingWithDetails,
-    BookingStatusUpdate, BookingSearchFilters, SystemStats,
+    BookingStatusUpdate, BookingStatusBatchUpdate, BookingStatusBatchResult,
+    BookingSearchFilters, SystemStats, BookingStats, RevenueReport,
+    BulkImportResult,
     ErrorResponse
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging: JSON lines written from a background thread
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI application instance
@@ -38,6 +78,15 @@ app = FastAPI(
     redoc_url="/redoc"  # ReDoc UI
 )
 
+# SQL statement counts and DB time per request, in Server-Timing and logs
+instrument_engine(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine)
+app.add_middleware(QueryStatsMiddleware)
+
+# Retried POSTs with the same Idempotency-Key run once and replay the response
+app.add_middleware(IdempotencyMiddleware)
+
 # Add CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -45,14 +94,63 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", REPLAYED_HEADER, "Server-Timing"],
 )
 
-# Create tables on startup
+# Keep clients that just wrote on the primary while replicas catch up
+if replica_engine is not None:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# One structured access log record per request (outermost, so it times everything)
+app.add_middleware(AccessLogMiddleware)
+
+# Prometheus request, pool and cache metrics on /metrics
+if instrument_app is not None:
+    metric_engines = {"primary": async_engine}
+    if replica_engine is not None:
+        metric_engines["replica"] = replica_engine
+    metric_caches = {
+        "stats": stats_cache,
+        "lookups": lookup_cache,
+        "availability": availability_cache,
+        "idempotency": idempotency_store.cache,
+    }
+    # Shared backends count hits where they live (e.g. Redis INFO)
+    if isinstance(response_cache.backend, MemoryBackend):
+        metric_caches["responses"] = response_cache.backend.entries
+    instrument_app(app, "ticket_booking", engines=metric_engines, caches=metric_caches)
+
+# Check the schema on startup; migrations run out of band (alembic upgrade head)
 @app.on_event("startup")
 async def startup_event():
-    """Create database tables on application startup"""
-    create_tables()
-    logger.info("Database tables created successfully")
+    """Check the database schema revision and start background tasks"""
+    if MIGRATE_ON_STARTUP:
+        await create_tables_async()
+    revision = await check_schema_async()
+    logger.info("Database schema at revision %s", revision)
+
+    # A SQLite replica is a periodically refreshed copy of the primary
+    if REPLICA_SQLITE_SYNC_INTERVAL > 0:
+        app.state.replica_sync = asyncio.create_task(sqlite_replica_sync_loop())
+    elif replica_engine is not None and await sync_sqlite_replica():
+        logger.info("SQLite replica copied from primary")
+
+    # Expired seat holds give their tickets back in the background
+    if HOLD_SWEEP_INTERVAL > 0:
+        app.state.hold_sweeper = asyncio.create_task(hold_sweeper_loop())
+
+    if IDEMPOTENCY_PURGE_INTERVAL > 0:
+        app.state.idempotency_purge = asyncio.create_task(idempotency_purge_loop())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and close replica connections"""
+    for name in ("replica_sync", "hold_sweeper", "idempotency_purge"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    await close_replica()
 
 # Root endpoint
 @app.get("/")
@@ -76,6 +174,20 @@ async def health_check():
     """
     return {"status": "healthy", "service": "ticket-booking-api"}
 
+# Connection pool metrics endpoint
+@app.get("/metrics/db")
+async def database_pool_metrics():
+    """
+    Connection pool metrics for this worker
+
+    Reports checked-out connections, overflow in use and a histogram of
+    how long checkouts waited for a free connection.
+    """
+    metrics = {"primary": pool_stats(async_engine.pool)}
+    if replica_engine is not None:
+        metrics["replica"] = {**pool_stats(replica_engine.pool), "lag_seconds": await replica_lag()}
+    return metrics
+
 
 # =============================================================================
 # VENUES API ENDPOINTS
@@ -84,7 +196,7 @@ async def health_check():
 @app.post("/venues", response_model=VenueResponse, status_code=status.HTTP_201_CREATED)
 async def create_venue(
     venue: VenueCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new venue
@@ -98,67 +210,87 @@ async def create_venue(
         
         # Add to database
         db.add(db_venue)
-        db.commit()
-        db.refresh(db_venue)
+        await db.commit()
+        invalidate_lookups("venues")
+        await db.refresh(db_venue)
         
-        logger.info(f"Created new venue: {db_venue.name} (ID: {db_venue.id})")
+        logger.info("Created new venue: %s (ID: %s)", db_venue.name, db_venue.id)
         return db_venue
         
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error creating venue: {str(e)}")
+        await db.rollback()
+        logger.error("Error creating venue: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create venue: {str(e)}"
         )
 
 
-@app.get("/venues", response_model=List[VenueResponse])
+@app.get("/venues", response_model=List[VenueResponse], dependencies=[Depends(query_budget(2))])
 async def get_venues(
+    response: Response,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     city: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all venues
     
     Retrieves a list of all venues with optional filtering by city.
-    Supports pagination with skip and limit parameters.
+    Supports cursor pagination: pass the X-Next-Cursor response header back
+    as `cursor` to get the next page. `skip` is kept as an offset fallback.
     """
     try:
-        query = db.query(Venue)
+        query = select(Venue)
         
         # Apply city filter if provided
         if city:
-            query = query.filter(Venue.city.ilike(f"%{city}%"))
+            query = query.where(Venue.city.ilike(f"%{city}%"))
         
         # Apply pagination
-        venues = query.offset(skip).limit(limit).all()
+        venues = await fetch_page(db, query, [Venue.id], response, cursor, skip, limit)
         
-        logger.info(f"Retrieved {len(venues)} venues")
+        logger.debug("Retrieved %s venues", len(venues))
         return venues
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error retrieving venues: {str(e)}")
+        logger.error("Error retrieving venues: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve venues: {str(e)}"
         )
 
 
-@app.get("/venues/{venue_id}", response_model=VenueResponse)
+@app.get("/venues/{venue_id}", response_model=VenueDetails, dependencies=[Depends(query_budget(2))])
 async def get_venue(
     venue_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    include: Optional[str] = Query(None, description="Comma-separated: events"),
+    limit: int = Query(INCLUDE_PAGE_LIMIT, ge=1, le=1000, description="Most events included"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific venue by ID
     
-    Retrieves detailed information about a specific venue.
+    Retrieves detailed information about a specific venue, optionally
+    with its first `limit` events by date (X-Next-Cursor continues at
+    /venues/{venue_id}/events).
+    Responses are cached and carry an ETag for conditional requests.
     """
     try:
-        venue = db.query(Venue).filter(Venue.id == venue_id).first()
+        includes = parse_includes(include, VENUE_INCLUDES)
+        tags = [f"venue:{venue_id}"] + (["events"] if "events" in includes else [])
+        cache_key = await response_cache.key(request, *tags)
+        cached = await response_cache.lookup(request, cache_key)
+        if cached:
+            return cached
+        
+        venue = await load_venue_details(db, venue_id, includes, response, limit)
         
         if not venue:
             raise HTTPException(
@@ -166,34 +298,46 @@ async def get_venue(
                 detail=f"Venue with ID {venue_id} not found"
             )
         
-        logger.info(f"Retrieved venue: {venue.name} (ID: {venue.id})")
-        return venue
+        logger.debug("Retrieved venue: %s (ID: %s)", venue['name'], venue_id)
+        return await response_cache.store(
+            request, cache_key, VenueDetails, venue, cursor_headers(response), exclude_unset=True
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving venue {venue_id}: {str(e)}")
+        logger.error("Error retrieving venue %s: %s", venue_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve venue: {str(e)}"
         )
 
 
-@app.get("/venues/{venue_id}/events", response_model=List[EventResponse])
+@app.get("/venues/{venue_id}/events", response_model=List[EventResponse], dependencies=[Depends(query_budget(2))])
 async def get_venue_events(
     venue_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all events at a specific venue
     
-    Retrieves all events scheduled at the specified venue.
+    Retrieves all events scheduled at the specified venue, ordered by date.
+    Supports cursor pagination via the X-Next-Cursor response header.
+    Responses are cached and carry an ETag for conditional requests.
     """
     try:
+        cache_key = await response_cache.key(request, f"venue:{venue_id}", "events")
+        cached = await response_cache.lookup(request, cache_key)
+        if cached:
+            return cached
+        
         # Check if venue exists
-        venue = db.query(Venue).filter(Venue.id == venue_id).first()
+        venue = await db.get(Venue, venue_id)
         if not venue:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -201,27 +345,32 @@ async def get_venue_events(
             )
         
         # Get events for this venue
-        events = db.query(Event).filter(
-            Event.venue_id == venue_id
-        ).offset(skip).limit(limit).all()
+        events = await fetch_page(
+            db,
+            select(Event).where(Event.venue_id == venue_id),
+            [Event.event_date, Event.id],
+            response, cursor, skip, limit
+        )
         
-        logger.info(f"Retrieved {len(events)} events for venue {venue_id}")
-        return events
+        logger.debug("Retrieved %s events for venue %s", len(events), venue_id)
+        return await response_cache.store(
+            request, cache_key, List[EventResponse], events, cursor_headers(response)
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving events for venue {venue_id}: {str(e)}")
+        logger.error("Error retrieving events for venue %s: %s", venue_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve events: {str(e)}"
         )
 
 
-@app.get("/venues/{venue_id}/occupancy")
+@app.get("/venues/{venue_id}/occupancy", dependencies=[Depends(query_budget(2))])
 async def get_venue_occupancy(
     venue_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get venue occupancy statistics
@@ -230,18 +379,16 @@ async def get_venue_occupancy(
     """
     try:
         # Check if venue exists
-        venue = db.query(Venue).filter(Venue.id == venue_id).first()
+        venue = await db.get(Venue, venue_id)
         if not venue:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Venue with ID {venue_id} not found"
             )
         
-        # Calculate occupancy statistics
-        total_bookings = db.query(func.sum(Booking.quantity)).filter(
-            Booking.venue_id == venue_id,
-            Booking.status == BookingStatus.CONFIRMED
-        ).scalar() or 0
+        # Confirmed tickets are aggregated per venue as bookings change
+        stats = await db.get(VenueBookingStats, venue_id)
+        total_bookings = stats.confirmed_tickets if stats else 0
         
         occupancy_rate = (total_bookings / venue.capacity) * 100 if venue.capacity > 0 else 0
         
@@ -254,13 +401,13 @@ async def get_venue_occupancy(
             "available_capacity": venue.capacity - total_bookings
         }
         
-        logger.info(f"Retrieved occupancy stats for venue {venue_id}")
+        logger.debug("Retrieved occupancy stats for venue %s", venue_id)
         return occupancy_stats
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving occupancy for venue {venue_id}: {str(e)}")
+        logger.error("Error retrieving occupancy for venue %s: %s", venue_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve occupancy: {str(e)}"
@@ -271,7 +418,7 @@ async def get_venue_occupancy(
 async def update_venue(
     venue_id: int,
     venue_update: VenueUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update a venue
@@ -280,7 +427,7 @@ async def update_venue(
     """
     try:
         # Get existing venue
-        venue = db.query(Venue).filter(Venue.id == venue_id).first()
+        venue = await db.get(Venue, venue_id)
         if not venue:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -293,17 +440,19 @@ async def update_venue(
             setattr(venue, field, value)
         
         # Commit changes
-        db.commit()
-        db.refresh(venue)
+        await db.commit()
+        invalidate_lookups("venues")
+        await response_cache.invalidate(f"venue:{venue_id}", "venues")
+        await db.refresh(venue)
         
-        logger.info(f"Updated venue: {venue.name} (ID: {venue.id})")
+        logger.info("Updated venue: %s (ID: %s)", venue.name, venue.id)
         return venue
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error updating venue {venue_id}: {str(e)}")
+        await db.rollback()
+        logger.error("Error updating venue %s: %s", venue_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update venue: {str(e)}"
@@ -313,7 +462,7 @@ async def update_venue(
 @app.delete("/venues/{venue_id}")
 async def delete_venue(
     venue_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete a venue
@@ -322,7 +471,7 @@ async def delete_venue(
     """
     try:
         # Get existing venue
-        venue = db.query(Venue).filter(Venue.id == venue_id).first()
+        venue = await db.get(Venue, venue_id)
         if not venue:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -330,7 +479,9 @@ async def delete_venue(
             )
         
         # Check if venue has events
-        event_count = db.query(Event).filter(Event.venue_id == venue_id).count()
+        event_count = await db.scalar(
+            select(func.count(Event.id)).where(Event.venue_id == venue_id)
+        )
         if event_count > 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -338,17 +489,19 @@ async def delete_venue(
             )
         
         # Delete venue
-        db.delete(venue)
-        db.commit()
+        await db.delete(venue)
+        await db.commit()
+        invalidate_lookups("venues")
+        await response_cache.invalidate(f"venue:{venue_id}", "venues")
         
-        logger.info(f"Deleted venue: {venue.name} (ID: {venue.id})")
+        logger.info("Deleted venue: %s (ID: %s)", venue.name, venue.id)
         return {"message": f"Venue {venue_id} deleted successfully"}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error deleting venue {venue_id}: {str(e)}")
+        await db.rollback()
+        logger.error("Error deleting venue %s: %s", venue_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete venue: {str(e)}"
@@ -362,7 +515,7 @@ async def delete_venue(
 @app.post("/events", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
 async def create_event(
     event: EventCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Create a new event
@@ -372,7 +525,7 @@ async def create_event(
     """
     try:
         # Verify venue exists
-        venue = db.query(Venue).filter(Venue.id == event.venue_id).first()
+        venue = await db.get(Venue, event.venue_id)
         if not venue:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -391,77 +544,108 @@ async def create_event(
         
         # Add to database
         db.add(db_event)
-        db.commit()
-        db.refresh(db_event)
+        await db.commit()
+        await response_cache.invalidate("events")
+        await db.refresh(db_event)
         
-        logger.info(f"Created new event: {db_event.name} (ID: {db_event.id})")
+        logger.info("Created new event: %s (ID: %s)", db_event.name, db_event.id)
         return db_event
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error creating event: {str(e)}")
+        await db.rollback()
+        logger.error("Error creating event: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create event: {str(e)}"
         )
 
 
-@app.get("/events", response_model=List[EventResponse])
+@app.get("/events", response_model=List[EventResponse], dependencies=[Depends(query_budget(2))])
 async def get_events(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
     venue_id: Optional[int] = None,
     status_filter: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all events
     
     Retrieves a list of all events with optional filtering by venue and status.
-    Supports pagination with skip and limit parameters.
+    Supports cursor pagination: pass the X-Next-Cursor response header back
+    as `cursor` to get the next page. `skip` is kept as an offset fallback.
+    Responses are cached and carry an ETag for conditional requests.
     """
     try:
-        query = db.query(Event)
+        cache_key = await response_cache.key(request, "events")
+        cached = await response_cache.lookup(request, cache_key)
+        if cached:
+            return cached
+        
+        query = select(Event)
         
         # Apply venue filter if provided
         if venue_id:
-            query = query.filter(Event.venue_id == venue_id)
+            query = query.where(Event.venue_id == venue_id)
         
         # Apply status filter if provided
         if status_filter:
-            query = query.filter(Event.status == status_filter)
-        
-        # Order by event date
-        query = query.order_by(Event.event_date)
+            query = query.where(Event.status == status_filter)
         
-        # Apply pagination
-        events = query.offset(skip).limit(limit).all()
+        # Order by event date (id breaks ties) and apply pagination
+        events = await fetch_page(
+            db, query, [Event.event_date, Event.id], response, cursor, skip, limit
+        )
         
-        logger.info(f"Retrieved {len(events)} events")
-        return events
+        logger.debug("Retrieved %s events", len(events))
+        return await response_cache.store(
+            request, cache_key, List[EventResponse], events, cursor_headers(response)
+        )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error retrieving events: {str(e)}")
+        logger.error("Error retrieving events: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve events: {str(e)}"
         )
 
 
-@app.get("/events/{event_id}", response_model=EventResponse)
+@app.get("/events/{event_id}", response_model=EventDetails, dependencies=[Depends(query_budget(3))])
 async def get_event(
     event_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    include: Optional[str] = Query(None, description="Comma-separated: venue, ticket_types, bookings"),
+    limit: int = Query(INCLUDE_PAGE_LIMIT, ge=1, le=1000, description="Most bookings included"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific event by ID
     
-    Retrieves detailed information about a specific event.
+    Retrieves detailed information about a specific event, optionally
+    with its venue, the ticket types and its first `limit` bookings
+    (X-Next-Cursor continues at /events/{event_id}/bookings).
+    Responses without live inventory (ticket types, bookings) are cached
+    and carry an ETag for conditional requests.
     """
     try:
-        event = db.query(Event).filter(Event.id == event_id).first()
+        includes = parse_includes(include, EVENT_INCLUDES)
+        cache_key = None
+        if not includes & LIVE_INCLUDES:
+            tags = [f"event:{event_id}"] + (["venues"] if "venue" in includes else [])
+            cache_key = await response_cache.key(request, *tags)
+            cached = await response_cache.lookup(request, cache_key)
+            if cached:
+                return cached
+        
+        event = await load_event_details(db, event_id, includes, response, limit)
         
         if not event:
             raise HTTPException(
@@ -469,34 +653,39 @@ async def get_event(
                 detail=f"Event with ID {event_id} not found"
             )
         
-        logger.info(f"Retrieved event: {event.name} (ID: {event.id})")
-        return event
+        logger.debug("Retrieved event: %s (ID: %s)", event['name'], event_id)
+        return await response_cache.store(
+            request, cache_key, EventDetails, event, cursor_headers(response), exclude_unset=True
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving event {event_id}: {str(e)}")
+        logger.error("Error retrieving event %s: %s", event_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve event: {str(e)}"
         )
 
 
-@app.get("/events/{event_id}/bookings", response_model=List[BookingResponse])
+@app.get("/events/{event_id}/bookings", response_model=List[BookingResponse], dependencies=[Depends(query_budget(2))])
 async def get_event_bookings(
     event_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all bookings for a specific event
     
     Retrieves all bookings made for the specified event.
+    Supports cursor pagination via the X-Next-Cursor response header.
     """
     try:
         # Check if event exists
-        event = db.query(Event).filter(Event.id == event_id).first()
+        event = await db.get(Event, event_id)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -504,78 +693,145 @@ async def get_event_bookings(
             )
         
         # Get bookings for this event
-        bookings = db.query(Booking).filter(
-            Booking.event_id == event_id
-        ).offset(skip).limit(limit).all()
+        bookings = await fetch_page(
+            db,
+            select(Booking).where(Booking.event_id == event_id),
+            [Booking.id],
+            response, cursor, skip, limit
+        )
         
-        logger.info(f"Retrieved {len(bookings)} bookings for event {event_id}")
+        logger.debug("Retrieved %s bookings for event %s", len(bookings), event_id)
         return bookings
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving bookings for event {event_id}: {str(e)}")
+        logger.error("Error retrieving bookings for event %s: %s", event_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve bookings: {str(e)}"
         )
 
 
-@app.get("/events/{event_id}/available-tickets")
-async def get_event_available_tickets(
+@app.get("/events/{event_id}/bookings/export")
+async def export_event_bookings(
     event_id: int,
-    db: Session = Depends(get_db)
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    filters: BookingSearchFilters = Depends(),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Get available tickets for an event
-    
-    Calculates and returns the number of available tickets for the specified event.
+    Export all bookings for a specific event
+
+    Streams every matching booking as NDJSON (one object per line) or CSV
+    in a single response with constant server memory. Accepts the booking
+    search filters (status, customer_email, start_date, ...).
     """
     try:
         # Check if event exists
-        event = db.query(Event).filter(Event.id == event_id).first()
+        event = await db.get(Event, event_id)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Event with ID {event_id} not found"
             )
+
+        clauses = [Booking.event_id == event_id, *await booking_filter_clauses(db, filters)]
+
+        logger.info("Exporting bookings for event %s as %s", event_id, format)
+        return StreamingResponse(
+            stream_bookings(db.bind, clauses, format),
+            media_type=EXPORT_FORMATS[format],
+            headers={"Content-Disposition": f'attachment; filename="event-{event_id}-bookings.{format}"'}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error exporting bookings for event %s: %s", event_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export bookings: {str(e)}"
+        )
+
+
+@app.get("/events/{event_id}/available-tickets", dependencies=[Depends(query_budget(1))])
+async def get_event_available_tickets(
+    event_id: int,
+    request: Request
+):
+    """
+    Get available tickets for an event
+    
+    Calculates and returns the number of available tickets for the specified event.
+    Served from a short-lived per-event cache; see app/availability.py for
+    the staleness bound.
+    """
+    try:
+        session_factory = await read_sessionmaker(request)
+        availability_info = await availability_cache.get(
+            event_id, lambda: load_availability(session_factory, event_id)
+        )
         
-        # Calculate total booked tickets
-        total_booked = db.query(func.sum(Booking.quantity)).filter(
-            Booking.event_id == event_id,
-            Booking.status == BookingStatus.CONFIRMED
-        ).scalar() or 0
-        
-        # Calculate available tickets
-        available_tickets = event.max_capacity - total_booked
-        
-        availability_info = {
-            "event_id": event_id,
-            "event_name": event.name,
-            "max_capacity": event.max_capacity,
-            "booked_tickets": total_booked,
-            "available_tickets": max(0, available_tickets),
-            "is_sold_out": available_tickets <= 0,
-            "occupancy_rate": round((total_booked / event.max_capacity) * 100, 2) if event.max_capacity > 0 else 0
-        }
-        
-        logger.info(f"Retrieved ticket availability for event {event_id}")
+        logger.debug("Retrieved ticket availability for event %s", event_id)
         return availability_info
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving ticket availability for event {event_id}: {str(e)}")
+        logger.error("Error retrieving ticket availability for event %s: %s", event_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve ticket availability: {str(e)}"
         )
 
 
-@app.get("/events/{event_id}/revenue")
+@app.get("/events/{event_id}/availability/stream")
+async def stream_event_availability(
+    event_id: int,
+    request: Request
+):
+    """
+    Stream live ticket availability for an event
+
+    Server-Sent Events: an "availability" message with the same fields as
+    GET /events/{event_id}/available-tickets on connect and whenever
+    bookings change it (at most AVAILABILITY_STREAM_MAX_RATE per second),
+    a keepalive comment during silence, and a "gone" message if the event
+    is deleted.
+    """
+    try:
+        if availability_broker.subscribers >= AVAILABILITY_STREAM_MAX_CLIENTS:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many availability streams open, retry later"
+            )
+
+        # Raises 404 for unknown events before the stream starts
+        session_factory = await read_sessionmaker(request)
+        await availability_cache.get(event_id, lambda: load_availability(session_factory, event_id))
+
+        logger.info("Streaming ticket availability for event %s", event_id)
+        return StreamingResponse(
+            sse_stream(availability_broker, event_id, "availability", AVAILABILITY_STREAM_HEARTBEAT),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error streaming ticket availability for event %s: %s", event_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to stream ticket availability: {str(e)}"
+        )
+
+
+@app.get("/events/{event_id}/revenue", dependencies=[Depends(query_budget(2))])
 async def get_event_revenue(
     event_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Calculate total revenue for a specific event
@@ -584,26 +840,19 @@ async def get_event_revenue(
     """
     try:
         # Check if event exists
-        event = db.query(Event).filter(Event.id == event_id).first()
+        event = await db.get(Event, event_id)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Event with ID {event_id} not found"
             )
         
-        # Calculate revenue statistics
-        revenue_data = db.query(
-            func.sum(Booking.total_amount).label('total_revenue'),
-            func.count(Booking.id).label('total_bookings'),
-            func.sum(Booking.quantity).label('total_tickets')
-        ).filter(
-            Booking.event_id == event_id,
-            Booking.status == BookingStatus.CONFIRMED
-        ).first()
+        # Revenue statistics are aggregated per event as bookings change
+        stats = await db.get(EventBookingStats, event_id)
         
-        total_revenue = revenue_data.total_revenue or 0
-        total_bookings = revenue_data.total_bookings or 0
-        total_tickets = revenue_data.total_tickets or 0
+        total_revenue = stats.confirmed_revenue if stats else 0
+        total_bookings = stats.confirmed_bookings if stats else 0
+        total_tickets = stats.confirmed_tickets if stats else 0
         
         # Calculate average booking value
         avg_booking_value = (total_revenue / total_bookings) if total_bookings > 0 else 0
@@ -620,13 +869,13 @@ async def get_event_revenue(
             "max_potential_revenue": event.max_capacity * avg_ticket_price if avg_ticket_price > 0 else 0
         }
         
-        logger.info(f"Retrieved revenue report for event {event_id}")
+        logger.debug("Retrieved revenue report for event %s", event_id)
         return revenue_report
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving revenue for event {event_id}: {str(e)}")
+        logger.error("Error retrieving revenue for event %s: %s", event_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve revenue: {str(e)}"
@@ -637,7 +886,7 @@ async def get_event_revenue(
 async def update_event(
     event_id: int,
     event_update: EventUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Update an event
@@ -646,7 +895,7 @@ async def update_event(
     """
     try:
         # Get existing event
-        event = db.query(Event).filter(Event.id == event_id).first()
+        event = await db.get(Event, event_id)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -657,16 +906,22 @@ async def update_event(
         update_data = event_update.model_dump(exclude_unset=True)
         
         if 'max_capacity' in update_data:
-            # Calculate current bookings
-            current_bookings = db.query(func.sum(Booking.quantity)).filter(
-                Booking.event_id == event_id,
-                Booking.status == BookingStatus.CONFIRMED
-            ).scalar() or 0
+            # Resize with a conditional UPDATE so a concurrent booking
+            # cannot slip in between the check and the write
+            new_capacity = update_data.pop('max_capacity')
+            resized = await db.execute(
+                update(Event)
+                .where(Event.id == event_id, Event.booked_count <= new_capacity)
+                .values(max_capacity=new_capacity)
+                .execution_options(synchronize_session=False)
+            )
             
-            if update_data['max_capacity'] < current_bookings:
+            if resized.rowcount != 1:
+                await db.rollback()
+                await db.refresh(event)
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Cannot reduce capacity below current bookings ({current_bookings})"
+                    detail=f"Cannot reduce capacity below current bookings ({event.booked_count})"
                 )
         
         # Update event fields
@@ -674,17 +929,19 @@ async def update_event(
             setattr(event, field, value)
         
         # Commit changes
-        db.commit()
-        db.refresh(event)
+        await db.commit()
+        await response_cache.invalidate(f"event:{event_id}", "events")
+        invalidate_availability(event_id)
+        await db.refresh(event)
         
-        logger.info(f"Updated event: {event.name} (ID: {event.id})")
+        logger.info("Updated event: %s (ID: %s)", event.name, event.id)
         return event
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error updating event {event_id}: {str(e)}")
+        await db.rollback()
+        logger.error("Error updating event %s: %s", event_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update event: {str(e)}"
@@ -694,7 +951,7 @@ async def update_event(
 @app.delete("/events/{event_id}")
 async def delete_event(
     event_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Delete an event
@@ -703,7 +960,7 @@ async def delete_event(
     """
     try:
         # Get existing event
-        event = db.query(Event).filter(Event.id == event_id).first()
+        event = await db.get(Event, event_id)
         if not event:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -711,10 +968,8 @@ async def delete_event(
             )
         
         # Check if event has confirmed bookings
-        confirmed_bookings = db.query(Booking).filter(
-            Booking.event_id == event_id,
-            Booking.status == BookingStatus.CONFIRMED
-        ).count()
+        stats = await db.get(EventBookingStats, event_id)
+        confirmed_bookings = stats.confirmed_bookings if stats else 0
         
         if confirmed_bookings > 0:
             raise HTTPException(
@@ -723,18 +978,380 @@ async def delete_event(
             )
         
         # Delete event (this will cascade to delete associated bookings)
-        db.delete(event)
-        db.commit()
-        
-        logger.info(f"Deleted event: {event.name} (ID: {event.id})")
+        if stats:
+            await db.delete(stats)
+        await db.delete(event)
+        await db.commit()
+        invalidate_stats()
+        await response_cache.invalidate(f"event:{event_id}", "events")
+        invalidate_availability(event_id)
+        
+        logger.info("Deleted event: %s (ID: %s)", event.name, event.id)
         return {"message": f"Event {event_id} deleted successfully"}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Error deleting event {event_id}: {str(e)}")
+        await db.rollback()
+        logger.error("Error deleting event %s: %s", event_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete event: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+# =============================================================================
+# BOOKINGS API ENDPOINTS
+# =============================================================================
+
+@app.post("/bookings", response_model=BookingResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(query_budget(8))])
+async def create_booking(
+    booking: BookingCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create a new booking
+    
+    Reserves the requested number of tickets for an event. Seats are claimed
+    atomically on the event and the ticket type, so concurrent bookings can
+    never oversell either one. Returns 409 when not enough tickets are left.
+    With "hold": true the booking is a pending hold that must be confirmed
+    before its expires_at, otherwise its tickets are released.
+    """
+    try:
+        db_booking = await reserve_booking(db, booking)
+        
+        logger.info("Created new booking: %s (ID: %s)", db_booking.confirmation_code, db_booking.id)
+        return db_booking
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error creating booking: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create booking: {str(e)}"
+        )
+
+
+
+@app.post("/bookings/{booking_id}/confirm", response_model=BookingResponse)
+async def confirm_booking(
+    booking_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Confirm a pending hold
+
+    Turns a held booking into a confirmed one. Returns 409 when the booking
+    is not a pending hold or its hold has already expired.
+    """
+    try:
+        db_booking = await confirm_hold(db, booking_id)
+        
+        logger.info("Confirmed held booking: %s (ID: %s)", db_booking.confirmation_code, db_booking.id)
+        return db_booking
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error confirming booking %s: %s", booking_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to confirm booking: {str(e)}"
+        )
+
+
+@app.patch("/bookings/status", response_model=BookingStatusBatchResult)
+async def update_booking_statuses(
+    batch: BookingStatusBatchUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Change the status of many bookings at once
+
+    Selects bookings by `booking_ids` or by `event_id` (optionally only
+    those in `current_status`, e.g. every pending booking of an event).
+    Cancelling returns the tickets to inventory; confirming or cancelling
+    updates the confirmed aggregates in the same transaction. Bookings
+    that cannot make the transition are left as they are and counted.
+    Each chunk of BOOKING_STATUS_CHUNK_SIZE bookings commits on its own.
+    """
+    try:
+        target = BookingStatus[batch.status.name]
+        current_status = BookingStatus[batch.current_status.name] if batch.current_status else None
+        change = await change_booking_status(
+            db,
+            target,
+            booking_ids=batch.booking_ids,
+            event_id=batch.event_id,
+            current_status=current_status,
+        )
+        if change.updated:
+            invalidate_stats()
+        for event_id in change.event_ids:
+            invalidate_availability(event_id)
+
+        requested = len(set(batch.booking_ids)) if batch.booking_ids is not None else None
+        logger.info("Changed %s bookings to %s", change.updated, target.value)
+        return BookingStatusBatchResult(
+            status=batch.status,
+            requested=requested,
+            updated=change.updated,
+            updated_from=change.updated_from,
+            unchanged=requested - change.updated if requested is not None else None,
+            tickets_released=change.tickets_released,
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error changing booking statuses: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to change booking statuses: {str(e)}"
+        )
+
+
+@app.get("/bookings/by-code/{code}", response_model=BookingResponse, dependencies=[Depends(query_budget(1))])
+async def get_booking_by_code(
+    code: str,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a booking by its confirmation code
+
+    Case, hyphens and spaces are ignored. Codes with a wrong check digit
+    are rejected without a database query; valid ones are a single probe
+    of the unique confirmation_code index.
+    """
+    try:
+        normalized = normalize_code(code)
+        booking = None
+        if normalized is not None:
+            booking = await db.scalar(select(Booking).where(Booking.confirmation_code == normalized))
+        if booking is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Booking with confirmation code {code} not found"
+            )
+        
+        logger.debug("Retrieved booking by code: %s (ID: %s)", booking.confirmation_code, booking.id)
+        return booking
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error retrieving booking by code %s: %s", code, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve booking: {str(e)}"
+        )
+
+
+@app.get("/bookings/search", response_model=List[BookingResponse], dependencies=[Depends(query_budget(2))])
+async def search_bookings(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    filters: BookingSearchFilters = Depends(),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Search bookings
+
+    Filters by event name, venue name, ticket type name, status, customer
+    email and booking date range. Date-range results are ordered by
+    booking date, everything else by booking ID. Supports cursor
+    pagination via the X-Next-Cursor response header.
+    """
+    try:
+        bookings = await fetch_page(
+            db,
+            select(Booking).where(*await booking_filter_clauses(db, filters)),
+            booking_sort_keys(filters),
+            response, cursor, limit=limit
+        )
+        
+        logger.debug("Found %s bookings", len(bookings))
+        return bookings
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error searching bookings: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search bookings: {str(e)}"
+        )
+
+# =============================================================================
+# STATISTICS AND REPORTS API ENDPOINTS
+# =============================================================================
+
+@app.get("/stats/system", response_model=SystemStats, dependencies=[Depends(query_budget(2))])
+async def get_system_statistics(db: AsyncSession = Depends(get_read_db)):
+    """
+    Get system-wide statistics
+
+    Counts venues, events, ticket types and bookings along with confirmed
+    revenue. Cached for a few seconds and refreshed after booking writes.
+    """
+    try:
+        return await get_system_stats(db)
+        
+    except Exception as e:
+        logger.error("Error computing system statistics: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute system statistics: {str(e)}"
+        )
+
+
+@app.get("/stats/bookings", response_model=BookingStats, dependencies=[Depends(query_budget(2))])
+async def get_booking_statistics(db: AsyncSession = Depends(get_read_db)):
+    """
+    Get booking statistics
+
+    Booking counts per status and confirmed revenue, computed in a single
+    pass over bookings.
+    """
+    try:
+        return await get_booking_stats(db)
+        
+    except Exception as e:
+        logger.error("Error computing booking statistics: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute booking statistics: {str(e)}"
+        )
+
+
+@app.get("/reports/revenue", response_model=RevenueReport, dependencies=[Depends(query_budget(2))])
+async def get_revenue_report_endpoint(
+    period: str = Query("month", pattern=f"^({'|'.join(REPORT_PERIODS)})$"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a revenue report
+
+    Confirmed revenue, booking count, average booking value and the top
+    events for the last day, week, month or year, or for all time.
+    """
+    try:
+        return await get_revenue_report(db, period)
+        
+    except Exception as e:
+        logger.error("Error computing revenue report for %s: %s", period, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compute revenue report: {str(e)}"
+        )
+
+# =============================================================================
+# BULK IMPORT API ENDPOINTS
+# =============================================================================
+
+# Documents the request body, which the handlers read from the raw request
+def _bulk_body(schema) -> dict:
+    item = schema.model_json_schema()
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": item}},
+                "application/x-ndjson": {"schema": item},
+            },
+        }
+    }
+
+
+@app.post("/venues/bulk", response_model=BulkImportResult, openapi_extra=_bulk_body(VenueCreate))
+async def bulk_create_venues(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create venues in bulk
+    
+    Accepts a JSON array or an NDJSON stream of venues. Rows are validated
+    one by one and inserted in chunks; invalid rows are reported by index
+    without aborting the rest of the import.
+    """
+    try:
+        result = await bulk_insert(db, request, VenueCreate, Venue)
+        invalidate_lookups("venues")
+        
+        logger.info("Bulk imported venues: %s inserted, %s failed", result.inserted, result.failed)
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error bulk importing venues: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import venues: {str(e)}"
+        )
+
+
+@app.post("/events/bulk", response_model=BulkImportResult, openapi_extra=_bulk_body(EventCreate))
+async def bulk_create_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create events in bulk
+    
+    Accepts a JSON array or an NDJSON stream of events. Besides schema
+    validation, each row's venue must exist and be large enough for the
+    event's max_capacity.
+    """
+    try:
+        result = await bulk_insert(db, request, EventCreate, Event, check_chunk=check_event_venues)
+        await response_cache.invalidate("events")
+        
+        logger.info("Bulk imported events: %s inserted, %s failed", result.inserted, result.failed)
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error bulk importing events: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import events: {str(e)}"
+        )
+
+
+@app.post("/ticket-types/bulk", response_model=BulkImportResult, openapi_extra=_bulk_body(TicketTypeCreate))
+async def bulk_create_ticket_types(
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create ticket types in bulk
+    
+    Accepts a JSON array or an NDJSON stream of ticket types.
+    """
+    try:
+        result = await bulk_insert(db, request, TicketTypeCreate, TicketType)
+        invalidate_lookups("ticket_types")
+        
+        logger.info("Bulk imported ticket types: %s inserted, %s failed", result.inserted, result.failed)
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error("Error bulk importing ticket types: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import ticket types: {str(e)}"
+        )
@@ -0,0 +1,57 @@
+"""
+Schema Migrations
+
+The ticket booking schema's changes are alembic revisions
+(alembic/versions). They run once per deploy, out of band, before the new
+code starts, from the ticket_booking_crud directory with the repository
+root on PYTHONPATH (for the shared schema_migrations glue):
+
+    PYTHONPATH=.. alembic upgrade head          # apply pending revisions
+    PYTHONPATH=.. alembic upgrade head --sql    # print their SQL instead
+    PYTHONPATH=.. alembic history               # list revisions
+
+App startup only compares the alembic_version row with the head revision
+and refuses to start on a database that is behind. Set
+MIGRATE_ON_STARTUP=true to migrate on startup instead (single-process
+development setups only).
+
+Index-only revisions build their indexes in an autocommit block with
+CREATE INDEX CONCURRENTLY on PostgreSQL, so bookings keep being written
+while a large table is indexed.
+"""
+
+import os
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import Connection
+
+from schema_migrations import check_schema
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "false").lower() in ("1", "true", "yes", "on")
+
+
+def alembic_config(conn: Connection = None) -> Config:
+    """Alembic configuration of this app, running on `conn` when given"""
+    config = Config(str(ALEMBIC_INI))
+    if conn is not None:
+        config.attributes["connection"] = conn
+    return config
+
+
+def upgrade(conn: Connection):
+    """
+    Create missing tables and apply pending revisions
+
+    Expects a connection without an open transaction; `alembic upgrade
+    head` does the same from the command line.
+    """
+    command.upgrade(alembic_config(conn), "head")
+
+
+def check_schema_version(conn: Connection) -> str:
+    """Return the database's revision, failing if it is behind the head"""
+    return check_schema(conn, str(ALEMBIC_INI))
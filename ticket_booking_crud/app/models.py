@@ -6,9 +6,12 @@ This file contains all the database models for the ticket booking system:
 - Event: Scheduled events with date/time and venue relationships
 - TicketType: Different ticket categories (VIP, Standard, Economy) with pricing
 - Booking: Customer bookings linking events, venues, and ticket types
+- EventBookingStats / VenueBookingStats: Materialized confirmed-booking aggregates
+- CodeSequence: Counters that confirmation code blocks are reserved from
+- IdempotencyRecord: Stored responses of POSTs sent with an Idempotency-Key
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Float, ForeignKey, Boolean, Enum, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -78,6 +81,7 @@ class Event(Base):
         duration_minutes: Duration of event in minutes
         venue_id: Foreign key to Venue
         max_capacity: Maximum tickets available (may be less than venue capacity)
+        booked_count: Tickets currently reserved (pending + confirmed bookings)
         status: Event status (active, cancelled, completed)
         created_at: Timestamp when event was created
         updated_at: Timestamp when event was last updated
@@ -95,10 +99,19 @@ class Event(Base):
     duration_minutes = Column(Integer, nullable=False, default=120)
     venue_id = Column(Integer, ForeignKey("venues.id"), nullable=False)
     max_capacity = Column(Integer, nullable=False)
+    booked_count = Column(Integer, nullable=False, default=0, server_default="0")  # Denormalized
     status = Column(String(20), nullable=False, default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Composite indexes for listings filtered by venue or status, ordered by date;
+    # lower(name) serves case-insensitive exact and prefix name searches
+    __table_args__ = (
+        Index("ix_events_venue_id_event_date", "venue_id", "event_date"),
+        Index("ix_events_status_event_date", "status", "event_date"),
+        Index("ix_events_name_lower", func.lower(name)),
+    )
+    
     # Relationships
     venue = relationship("Venue", back_populates="events")
     bookings = relationship("Booking", back_populates="event", cascade="all, delete-orphan")
@@ -117,7 +130,7 @@ class TicketType(Base):
         description: Description of what's included
         price: Base price for this ticket type
         benefits: JSON string of benefits/perks
-        availability_count: Number of tickets available of this type
+        availability_count: Number of tickets still available of this type
         created_at: Timestamp when ticket type was created
         updated_at: Timestamp when ticket type was last updated
         
@@ -161,6 +174,7 @@ class Booking(Base):
         status: Booking status (pending, confirmed, cancelled)
         confirmation_code: Unique booking confirmation code
         booking_date: When the booking was made
+        expires_at: When a pending hold is released unless confirmed (UTC)
         created_at: Timestamp when booking was created
         updated_at: Timestamp when booking was last updated
         
@@ -183,13 +197,136 @@ class Booking(Base):
     status = Column(Enum(BookingStatus), nullable=False, default=BookingStatus.PENDING)
     confirmation_code = Column(String(20), nullable=False, unique=True, index=True)
     booking_date = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=True)  # Set on pending holds only
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Composite indexes for per-event/per-venue lookups by status and reports by date.
+    # ix_bookings_event_id serves per-event listings ordered by id, which the
+    # (event_id, status) index can only return after a sort. The single-column
+    # booking_date and status indexes serve searches paged by date and by id.
+    # (status, expires_at) lets the hold sweeper find expired holds oldest first.
+    __table_args__ = (
+        Index("ix_bookings_event_id", "event_id"),
+        Index("ix_bookings_event_id_status", "event_id", "status"),
+        Index("ix_bookings_venue_id_status", "venue_id", "status"),
+        Index("ix_bookings_ticket_type_id", "ticket_type_id"),
+        Index("ix_bookings_status_booking_date", "status", "booking_date"),
+        Index("ix_bookings_booking_date", "booking_date"),
+        Index("ix_bookings_status", "status"),
+        Index("ix_bookings_status_expires_at", "status", "expires_at"),
+    )
+    
     # Relationships
     event = relationship("Event", back_populates="bookings")
     venue = relationship("Venue")  # No back_populates since it's denormalized
     ticket_type = relationship("TicketType", back_populates="bookings")
     
     def __repr__(self):
-        return f"<Booking(id={self.id}, code='{self.confirmation_code}', status='{self.status.value}')>" 
\ No newline at end of file
+        return f"<Booking(id={self.id}, code='{self.confirmation_code}', status='{self.status.value}')>" 
+
+
+class EventBookingStats(Base):
+    """
+    EventBookingStats Model - Confirmed booking aggregates for one event
+    
+    Maintained incrementally in the same transaction as every booking status
+    change (see app/aggregates.py), so reports read one row instead of
+    summing the bookings table. Rebuild with `python -m app.aggregates`.
+    
+    Attributes:
+        event_id: Primary key, foreign key to Event
+        venue_id: Foreign key to Venue the event is held at
+        confirmed_tickets: Tickets on confirmed bookings
+        confirmed_revenue: Total amount of confirmed bookings
+        confirmed_bookings: Number of confirmed bookings
+        updated_at: Timestamp when the aggregates last changed
+    """
+    __tablename__ = "event_booking_stats"
+    
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    venue_id = Column(Integer, ForeignKey("venues.id"), nullable=False)
+    confirmed_tickets = Column(Integer, nullable=False, default=0, server_default="0")
+    confirmed_revenue = Column(Float, nullable=False, default=0.0, server_default="0")
+    confirmed_bookings = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<EventBookingStats(event_id={self.event_id}, tickets={self.confirmed_tickets})>"
+
+
+class VenueBookingStats(Base):
+    """
+    VenueBookingStats Model - Confirmed booking aggregates for one venue
+    
+    Same counters as EventBookingStats, summed over all events at the venue.
+    
+    Attributes:
+        venue_id: Primary key, foreign key to Venue
+        confirmed_tickets: Tickets on confirmed bookings
+        confirmed_revenue: Total amount of confirmed bookings
+        confirmed_bookings: Number of confirmed bookings
+        updated_at: Timestamp when the aggregates last changed
+    """
+    __tablename__ = "venue_booking_stats"
+    
+    venue_id = Column(Integer, ForeignKey("venues.id"), primary_key=True)
+    confirmed_tickets = Column(Integer, nullable=False, default=0, server_default="0")
+    confirmed_revenue = Column(Float, nullable=False, default=0.0, server_default="0")
+    confirmed_bookings = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<VenueBookingStats(venue_id={self.venue_id}, tickets={self.confirmed_tickets})>"
+
+
+class CodeSequence(Base):
+    """
+    CodeSequence Model - Named counter handed out in blocks
+    
+    Each worker reserves a block of numbers at a time (see app/codes.py)
+    and issues confirmation codes from it without touching the database.
+    
+    Attributes:
+        name: Primary key, what the numbers are used for
+        next_value: First number not reserved by any worker yet
+    """
+    __tablename__ = "code_sequences"
+    
+    name = Column(String(50), primary_key=True)
+    next_value = Column(BigInteger, nullable=False, default=0, server_default="0")
+    
+    def __repr__(self):
+        return f"<CodeSequence(name='{self.name}', next_value={self.next_value})>"
+
+
+class IdempotencyRecord(Base):
+    """
+    IdempotencyRecord Model - Outcome of a request sent with an Idempotency-Key
+    
+    Inserted when the first request with a key starts (status_code NULL
+    while it runs) and completed with its response, which retries with
+    the same key get back instead of running the request again
+    (see app/idempotency.py).
+    
+    Attributes:
+        key: Primary key, the client's Idempotency-Key header
+        fingerprint: SHA-256 of the method, path, query and body
+        status_code: Response status, NULL while the request is in progress
+        response_headers: JSON list of response header pairs
+        response_body: Response body bytes
+        created_at: When the request started (UTC)
+        expires_at: When the record may be purged (UTC)
+    """
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_headers = Column(Text, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyRecord(key='{self.key}', status_code={self.status_code})>"
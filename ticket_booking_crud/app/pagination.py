@@ -0,0 +1,97 @@
+"""
+Keyset (Cursor) Pagination
+
+OFFSET makes the database walk and discard every skipped row, so deep
+pages get slower the further a client scrolls. Listing endpoints instead
+hand out an opaque cursor holding the sort key of the last row returned;
+the next page starts with `WHERE (sort key) > (cursor)`, which is a
+single index seek no matter how deep the page is.
+
+The cursor is returned in the X-Next-Cursor response header (absent on
+the last page). `skip` still works as a fallback when no cursor is sent.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Date, DateTime, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort key values as an opaque URL-safe cursor"""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """
+    Decode a cursor back into sort key values for the given key columns
+
+    Raises a 400 HTTPException for anything that was not produced by
+    encode_cursor() for the same keys.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match sort key")
+        decoded = []
+        for key, value in zip(keys, values):
+            if isinstance(key.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(key.type, Date):
+                value = date.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> list:
+    """
+    Fetch one page of ORM objects ordered by `keys`
+
+    `keys` must end with a unique column (the primary key) so the order is
+    total. Uses the cursor when given, otherwise falls back to OFFSET
+    `skip`. Sets the X-Next-Cursor header when another page exists.
+    """
+    query = query.order_by(*keys)
+    if cursor:
+        query = query.where(tuple_(*keys) > tuple_(*decode_cursor(cursor, keys)))
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells us whether a next page exists
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.scalars().all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, key.key) for key in keys])
+    return rows
+
+
+def cursor_headers(response: Response) -> dict:
+    """The pagination headers set on `response`, for responses built by hand"""
+    if NEXT_CURSOR_HEADER in response.headers:
+        return {NEXT_CURSOR_HEADER: response.headers[NEXT_CURSOR_HEADER]}
+    return {}
@@ -0,0 +1,107 @@
+"""
+Connection Pool Metrics
+
+Queue pools that record how long each checkout waited for a connection.
+Together with the pool's own counters (checked out, overflow) this shows
+whether the pool is too small for the number of concurrent requests a
+worker serves: waits near zero mean the pool keeps up, waits that grow
+with load mean requests are queueing for connections.
+"""
+
+import time
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CheckoutWaitHistogram:
+    """Cumulative histogram of checkout wait times"""
+
+    def __init__(self, buckets: Sequence[float] = WAIT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.timeouts = 0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty or +Inf)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return None
+
+    def snapshot(self) -> Dict:
+        cumulative = {}
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            cumulative[str(bound)] = seen
+        cumulative["+Inf"] = self.count
+        return {
+            "buckets": cumulative,
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "timeouts": self.timeouts,
+            "p95_upper_bound": self.quantile(0.95),
+        }
+
+
+class _CheckoutTimingMixin:
+    """Times Pool._do_get(), which blocks while the pool is exhausted"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = CheckoutWaitHistogram()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_wait.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool (sync engine) with checkout wait metrics"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool (async engine) with checkout wait metrics"""
+
+
+def pool_stats(pool: Pool) -> Dict:
+    """Current counters of a pool; queue pools also report size and waits"""
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    if isinstance(pool, _CheckoutTimingMixin):
+        stats["checkout_wait_seconds"] = pool.checkout_wait.snapshot()
+    return stats
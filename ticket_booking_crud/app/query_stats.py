@@ -0,0 +1,211 @@
+"""
+Per-Request Query Statistics
+
+QueryStatsMiddleware counts the SQL statements each request executes and
+the time spent in them, using cursor execution events on the engines.
+The totals are added to the response as a Server-Timing header, e.g.
+
+    Server-Timing: db;dur=4.21;desc="3 queries", app;dur=9.87
+
+and logged at DEBUG level. The same statement executed
+QUERY_N_PLUS_ONE_THRESHOLD or more times in one request (the signature
+of a relationship lazy-loaded once per row) is logged as a warning.
+
+Routes can declare how many statements they may run:
+
+    @app.get("/events/{event_id}", dependencies=[Depends(query_budget(3))])
+
+Requests over budget are logged as warnings. With QUERY_BUDGET_ENFORCE
+set (test and CI runs) they fail with a 500 instead, so a change that
+introduces an N+1 breaks the build rather than production. Enforcement
+happens at the latest possible point before anything is persisted: a
+commit issued by a request that is already over budget raises
+QueryBudgetExceeded, so the transaction is rolled back, and a response
+is replaced by the 500 before it starts. Statements executed after a
+request's last commit (e.g. refreshing the saved row) can only fail the
+response; what was committed stays committed.
+
+The statistics of a request live in a context variable. SQLAlchemy runs
+the engine events in a greenlet that shares the calling task's context,
+so statements executed through AsyncSession are attributed to the
+request that awaited them; statements from background tasks are not
+counted.
+"""
+
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "false").lower() in ("1", "true", "yes", "on")
+QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "10"))
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while handling one request"""
+    count: int = 0
+    duration: float = 0.0
+    budget: Optional[int] = None
+    enforce: bool = False
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def repeated_statements(self, threshold: int = QUERY_N_PLUS_ONE_THRESHOLD):
+        """Statements executed at least `threshold` times, most repeated first"""
+        return [(statement, count) for statement, count in self.statements.most_common()
+                if count >= threshold]
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised on commit when an enforced query budget is exceeded"""
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Statistics of the request being handled, or None outside a request"""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None and conn.info.get("query_started"):
+        stats.record(statement, time.perf_counter() - conn.info["query_started"].pop())
+
+
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _before_commit(conn):
+    stats = _current_stats.get()
+    if stats is not None and stats.enforce and stats.over_budget:
+        # Raised before the DBAPI commit, so the transaction is rolled back
+        raise QueryBudgetExceeded(
+            f"Query budget exceeded: executed {stats.count} queries, budget {stats.budget}"
+        )
+
+
+def instrument_engine(engine: Engine):
+    """
+    Count the statements of `engine` (the sync_engine of an async engine)
+    and refuse commits of requests over an enforced budget
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+        event.listen(engine, "commit", _before_commit)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Dependency declaring the most SQL statements a route may execute
+
+    The budget covers the whole request, including dependencies and
+    statements run after this one.
+    """
+    async def declare_budget():
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+    declare_budget.max_queries = max_queries
+    return declare_budget
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+class QueryStatsMiddleware:
+    """
+    Attach per-request SQL statement counts and timings to responses
+
+    Pure ASGI middleware. The Server-Timing header covers the statements
+    executed before the response started; statements run while a
+    streaming body is produced are included in the log line only.
+    Without an explicit `enforce_budget`, QUERY_BUDGET_ENFORCE is read
+    per request, so tests can switch enforcement on. Engines must be
+    passed to instrument_engine() for their commits to be checked.
+    """
+
+    def __init__(self, app, enforce_budget: Optional[bool] = None):
+        self.app = app
+        self.enforce_budget = enforce_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        enforce = QUERY_BUDGET_ENFORCE if self.enforce_budget is None else self.enforce_budget
+        stats = QueryStats(enforce=enforce)
+        # Outer middleware (the access log) reads the totals from the scope
+        scope["query_stats"] = stats
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        rejected = False
+
+        async def send_with_timing(message):
+            nonlocal rejected
+            if message["type"] == "http.response.start":
+                if stats.over_budget and stats.enforce:
+                    rejected = True
+                    await JSONResponse(
+                        {"detail": f"Query budget exceeded: {_route_label(scope)} executed "
+                                   f"{stats.count} queries, budget {stats.budget}"},
+                        status_code=500,
+                    )(scope, None, send)
+                    return
+                timing = (
+                    f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.2f}"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode())]}
+            elif rejected:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats, time.perf_counter() - started)
+
+    @staticmethod
+    def _report(scope, stats: QueryStats, elapsed: float):
+        route = _route_label(scope)
+        logger.debug("%s: %s queries in %.2fms (%.2fms total)",
+                     route, stats.count, stats.duration * 1000, elapsed * 1000)
+        for statement, count in stats.repeated_statements():
+            logger.warning("Possible N+1 in %s: statement executed %s times: %.200s",
+                           route, count, " ".join(statement.split()))
+        if stats.over_budget:
+            logger.warning("%s executed %s queries, over its budget of %s", route, stats.count, stats.budget)
@@ -0,0 +1,223 @@
+"""
+Read-Replica Routing
+
+Read-only handlers take their session from `get_read_db`, which binds it
+to the replica engine (DATABASE_REPLICA_URL) so listing traffic does not
+compete with booking writes on the primary. A read goes to the primary
+instead when:
+
+- no replica is configured,
+- the client wrote recently: after a successful write the
+  ReadYourWritesMiddleware sets a short-lived cookie, and while it is
+  present the client keeps reading from the primary so it sees its own
+  changes,
+- the replica lags the primary by more than REPLICA_MAX_LAG_SECONDS or
+  its lag cannot be determined.
+
+For local development and tests a SQLite replica can be a copy of the
+SQLite primary made with the SQLite backup API (`sync_sqlite_replica`),
+refreshed every REPLICA_SQLITE_SYNC_INTERVAL seconds.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .database import (
+    AsyncSessionLocal, DATABASE_URL, create_async_db_engine, get_async_url,
+)
+
+logger = logging.getLogger(__name__)
+
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+# Seconds a client keeps reading from the primary after it wrote
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "1"))
+REPLICA_SQLITE_SYNC_INTERVAL = float(os.getenv("REPLICA_SQLITE_SYNC_INTERVAL", "0"))
+
+STICKY_COOKIE = "db_primary_until"
+
+replica_engine = create_async_db_engine(get_async_url(DATABASE_REPLICA_URL)) if DATABASE_REPLICA_URL else None
+
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+) if replica_engine else None
+
+# (checked_at, lag in seconds or None when unknown)
+_lag_check = (0.0, None)
+
+# Primary's last-modified time when the SQLite replica copy was last taken
+_sqlite_copied_from: Optional[float] = None
+
+
+def _sqlite_path(url: str) -> Optional[str]:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    return parsed.database
+
+
+def _last_modified(path: str) -> float:
+    """Latest mtime of a SQLite database and its WAL file"""
+    times = [os.path.getmtime(p) for p in (path, f"{path}-wal") if os.path.exists(p)]
+    return max(times) if times else 0.0
+
+
+async def _measure_lag() -> Optional[float]:
+    """How far the replica is behind the primary, in seconds"""
+    primary_path = _sqlite_path(DATABASE_URL)
+    replica_path = _sqlite_path(DATABASE_REPLICA_URL)
+    if primary_path and replica_path:
+        # A copy is as fresh as the primary was when it was taken
+        if _sqlite_copied_from is None:
+            return None
+        return max(0.0, _last_modified(primary_path) - _sqlite_copied_from)
+
+    if replica_engine.dialect.name == "postgresql":
+        # The last replayed transaction ages while the primary is idle, so
+        # a standby that has replayed everything it received is not behind
+        async with replica_engine.connect() as conn:
+            return await conn.scalar(text(
+                "SELECT CASE "
+                "WHEN NOT pg_is_in_recovery() THEN 0 "
+                "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                "END"
+            ))
+
+    # No way to measure lag for this backend; trust the replica
+    return 0.0
+
+
+async def replica_lag() -> Optional[float]:
+    """Replica lag in seconds, re-measured at most every REPLICA_LAG_CHECK_INTERVAL"""
+    global _lag_check
+    checked_at, lag = _lag_check
+    now = time.monotonic()
+    if now - checked_at >= REPLICA_LAG_CHECK_INTERVAL:
+        try:
+            lag = await _measure_lag()
+        except Exception as e:
+            logger.warning("Replica lag check failed: %s", e)
+            lag = None
+        _lag_check = (now, lag)
+    return lag
+
+
+def _is_sticky(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+async def read_sessionmaker(request: Request) -> async_sessionmaker:
+    """Pick the sessionmaker a read-only request should use"""
+    if ReplicaSessionLocal is None or _is_sticky(request):
+        return AsyncSessionLocal
+    lag = await replica_lag()
+    if lag is None or lag > REPLICA_MAX_LAG_SECONDS:
+        return AsyncSessionLocal
+    return ReplicaSessionLocal
+
+
+async def get_read_db(request: Request):
+    """
+    Database session dependency for read-only handlers
+
+    Yields a replica session when the replica is usable for this client,
+    otherwise a primary session.
+    """
+    session_factory = await read_sessionmaker(request)
+    async with session_factory() as db:
+        yield db
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client to the primary for a few seconds after it writes
+
+    Pure ASGI middleware: adds the stickiness cookie to the response of
+    every successful non-GET request.
+    """
+
+    SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(self, app, sticky_seconds: int = REPLICA_STICKY_SECONDS):
+        self.app = app
+        self.sticky_seconds = sticky_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.sticky_seconds
+                cookie = (
+                    f"{STICKY_COOKIE}={until:.0f}; Max-Age={self.sticky_seconds}; "
+                    f"Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def copy_sqlite_database(source_path: str, target_path: str):
+    """Copy a live SQLite database consistently with the backup API"""
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+async def sync_sqlite_replica() -> bool:
+    """
+    Refresh a SQLite replica from a SQLite primary
+
+    Only copies made by this process count towards its lag check; a
+    replica that was never copied here is treated as unknown (primary).
+    Returns False when the primary or the replica is not a SQLite file.
+    """
+    primary_path = _sqlite_path(DATABASE_URL)
+    replica_path = _sqlite_path(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
+    if not (primary_path and replica_path):
+        return False
+    global _sqlite_copied_from
+    modified = _last_modified(primary_path)
+    await asyncio.to_thread(copy_sqlite_database, primary_path, replica_path)
+    _sqlite_copied_from = modified
+    return True
+
+
+async def sqlite_replica_sync_loop():
+    """Keep a SQLite replica copy fresh every REPLICA_SQLITE_SYNC_INTERVAL seconds"""
+    while True:
+        try:
+            await sync_sqlite_replica()
+        except Exception as e:
+            logger.error("Error refreshing SQLite replica: %s", e)
+        await asyncio.sleep(REPLICA_SQLITE_SYNC_INTERVAL)
+
+
+async def close_replica():
+    if replica_engine is not None:
+        await replica_engine.dispose()
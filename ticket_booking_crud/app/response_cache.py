@@ -0,0 +1,206 @@
+"""
+Response Cache
+
+Caches the serialized JSON body of read endpoints whose data changes far
+less often than it is requested (event and venue details, event lists).
+
+- Keys are the request path plus its sorted query parameters plus the
+  current version of each tag the response depends on (e.g.
+  "event:42", "events"). Writes bump the versions of the tags they touch,
+  so every stale entry is skipped at once without having to find or
+  delete it; old entries simply age out.
+- Entries hold the already-serialized body and its ETag. A hit is sent
+  as stored bytes, and a request whose If-None-Match matches gets a 304
+  with no body at all.
+
+Backends: "memory" (per-process LRU with TTL, the default), "redis"
+(shared between workers; needs the `redis` package and REDIS_URL) or
+"none" (no caching, ETags still sent). With the memory backend a write
+only invalidates the worker that handled it; other workers can serve
+the old entry until RESPONSE_CACHE_TTL expires.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+
+@dataclass
+class CachedResponse:
+    """A serialized response body with its ETag and extra headers"""
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class MemoryBackend:
+    """Per-process LRU of responses plus a dict of tag versions"""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.versions: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, entry: CachedResponse):
+        self.entries.set(key, entry)
+
+    async def get_versions(self, tags: List[str]) -> List[int]:
+        return [self.versions.get(tag, 0) for tag in tags]
+
+    async def bump(self, tags: Iterable[str]):
+        for tag in tags:
+            self.versions[tag] = self.versions.get(tag, 0) + 1
+
+
+class RedisBackend:
+    """Responses and tag versions in Redis, shared by every worker"""
+
+    def __init__(self, url: str, ttl: int, prefix: str = "ticket-booking:"):
+        import redis.asyncio as redis  # optional dependency
+
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CachedResponse(body=data["body"].encode(), etag=data["etag"], headers=data["headers"])
+
+    async def set(self, key: str, entry: CachedResponse):
+        raw = json.dumps({"body": entry.body.decode(), "etag": entry.etag, "headers": entry.headers})
+        await self.client.setex(self.prefix + key, self.ttl, raw)
+
+    async def get_versions(self, tags: List[str]) -> List[int]:
+        values = await self.client.mget([f"{self.prefix}version:{tag}" for tag in tags])
+        return [int(value) if value else 0 for value in values]
+
+    async def bump(self, tags: Iterable[str]):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(f"{self.prefix}version:{tag}")
+            await pipe.execute()
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """Lookup, store and invalidate serialized responses"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._adapters: Dict[Any, TypeAdapter] = {}
+
+    async def key(self, request: Request, *tags: str) -> Optional[str]:
+        """
+        Cache key for this request given the tags its response depends on
+
+        None (serve uncached) when caching is off or the tag versions
+        cannot be read.
+        """
+        if self.backend is None:
+            return None
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        try:
+            versions = await self.backend.get_versions(list(tags))
+        except Exception as e:
+            logger.warning("Response cache version lookup failed: %s", e)
+            return None
+        stamp = ",".join(f"{tag}@{version}" for tag, version in zip(tags, versions))
+        return f"{request.url.path}?{query}#{stamp}"
+
+    async def lookup(self, request: Request, key: Optional[str]) -> Optional[Response]:
+        """Return the cached response (or a 304) for `key`, None on a miss"""
+        if key is None:
+            return None
+        try:
+            entry = await self.backend.get(key)
+        except Exception as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            return None
+        if entry is None:
+            return None
+        return self._respond(request, entry, "HIT")
+
+    async def store(
+        self,
+        request: Request,
+        key: Optional[str],
+        response_type: Any,
+        content: Any,
+        headers: Optional[Dict[str, str]] = None,
+        exclude_unset: bool = False,
+    ) -> Response:
+        """
+        Serialize `content` as `response_type`, cache it and build the response
+
+        With `exclude_unset`, fields missing from `content` are left out
+        instead of being serialized with their defaults.
+        """
+        adapter = self._adapters.get(response_type)
+        if adapter is None:
+            adapter = self._adapters[response_type] = TypeAdapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), exclude_unset=exclude_unset)
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            headers=dict(headers or {}),
+        )
+        if key is not None:
+            try:
+                await self.backend.set(key, entry)
+            except Exception as e:
+                logger.warning("Response cache store failed: %s", e)
+        return self._respond(request, entry, "MISS")
+
+    async def invalidate(self, *tags: str):
+        """Make every cached response that depends on `tags` stale"""
+        if self.backend is None or not tags:
+            return
+        try:
+            await self.backend.bump(tags)
+        except Exception as e:
+            logger.warning("Response cache invalidation failed: %s", e)
+
+    def _respond(self, request: Request, entry: CachedResponse, cache_status: str) -> Response:
+        headers = {**entry.headers, "ETag": entry.etag, CACHE_STATUS_HEADER: cache_status}
+        if _matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _create_backend():
+    if RESPONSE_CACHE_BACKEND == "none":
+        return None
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(REDIS_URL, RESPONSE_CACHE_TTL)
+    return MemoryBackend(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL)
+
+
+response_cache = ResponseCache(_create_backend())
@@ -8,7 +8,7 @@ This file contains all the Pydantic schemas for data validation and serializatio
 - Response schemas: For serializing outgoing data (GET responses)
 """
 
-from pydantic import BaseModel, EmailStr, validator, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, validator, model_validator, Field, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -83,6 +83,15 @@ class VenueWithEvents(VenueResponse):
     events: List['EventResponse'] = []
 
 
+class VenueDetails(VenueResponse):
+    """
+    Venue response with the relationships requested through ?include=
+
+    Relationships that were not requested are left out of the response.
+    """
+    events: Optional[List['EventResponse']] = None
+
+
 # =============================================================================
 # EVENT SCHEMAS
 # =============================================================================
@@ -97,12 +106,6 @@ class EventBase(BaseModel):
     max_capacity: int = Field(..., ge=1, description="Maximum tickets available")
     status: str = Field(default="active", description="Event status")
 
-    @validator('event_date')
-    def validate_event_date(cls, v):
-        if v <= datetime.now():
-            raise ValueError('Event date must be in the future')
-        return v
-
     @validator('duration_minutes')
     def validate_duration(cls, v):
         if v < 1:
@@ -119,9 +122,24 @@ class EventBase(BaseModel):
         return v
 
 
+def _check_future_event_date(v: Optional[datetime]) -> Optional[datetime]:
+    """
+    Reject event dates that have passed (naive UTC, like bookings' checks)
+
+    Only applied to writes: stored events keep being served after their
+    date has passed.
+    """
+    if v is not None and v <= datetime.utcnow():
+        raise ValueError('Event date must be in the future')
+    return v
+
+
 class EventCreate(EventBase):
     """Schema for creating a new event"""
-    pass
+
+    @validator('event_date')
+    def validate_event_date(cls, v):
+        return _check_future_event_date(v)
 
 
 class EventUpdate(BaseModel):
@@ -133,6 +151,10 @@ class EventUpdate(BaseModel):
     max_capacity: Optional[int] = Field(None, ge=1)
     status: Optional[str] = None
 
+    @validator('event_date')
+    def validate_event_date(cls, v):
+        return _check_future_event_date(v)
+
 
 class EventResponse(EventBase):
     """Schema for event responses"""
@@ -153,6 +175,17 @@ class EventWithBookings(EventResponse):
     bookings: List['BookingResponse'] = []
 
 
+class EventDetails(EventResponse):
+    """
+    Event response with the relationships requested through ?include=
+
+    Relationships that were not requested are left out of the response.
+    """
+    venue: Optional[VenueResponse] = None
+    ticket_types: Optional[List['TicketTypeResponse']] = None
+    bookings: Optional[List['BookingResponse']] = None
+
+
 # =============================================================================
 # TICKET TYPE SCHEMAS
 # =============================================================================
@@ -240,7 +273,10 @@ class BookingBase(BaseModel):
 
 class BookingCreate(BookingBase):
     """Schema for creating a new booking"""
-    pass
+    hold: bool = Field(
+        default=False,
+        description="Reserve the seats as a pending hold that is released unless confirmed before it expires"
+    )
 
 
 class BookingUpdate(BaseModel):
@@ -256,6 +292,35 @@ class BookingStatusUpdate(BaseModel):
     status: BookingStatusEnum = Field(..., description="New booking status")
 
 
+class BookingStatusBatchUpdate(BookingStatusUpdate):
+    """Schema for changing the status of many bookings at once"""
+    booking_ids: Optional[List[int]] = Field(
+        None, min_length=1, max_length=50000, description="Bookings to update"
+    )
+    event_id: Optional[int] = Field(None, ge=1, description="Update the bookings of this event instead")
+    current_status: Optional[BookingStatusEnum] = Field(
+        None, description="Only update bookings currently in this status"
+    )
+
+    @model_validator(mode="after")
+    def validate_selection(self):
+        if (self.booking_ids is None) == (self.event_id is None):
+            raise ValueError('Provide either booking_ids or event_id')
+        return self
+
+
+class BookingStatusBatchResult(BaseModel):
+    """Schema for batch booking status change results"""
+    status: BookingStatusEnum = Field(..., description="Status the bookings were moved to")
+    requested: Optional[int] = Field(None, description="Distinct booking ids requested")
+    updated: int = Field(..., description="Bookings whose status changed")
+    updated_from: Dict[str, int] = Field(..., description="Bookings changed, by previous status")
+    unchanged: Optional[int] = Field(
+        None, description="Requested bookings not changed (already in the status, not allowed, or not found)"
+    )
+    tickets_released: int = Field(..., description="Tickets returned to inventory by cancellations")
+
+
 class BookingResponse(BookingBase):
     """Schema for booking responses"""
     id: int
@@ -263,6 +328,7 @@ class BookingResponse(BookingBase):
     status: BookingStatusEnum
     confirmation_code: str
     booking_date: datetime
+    expires_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -282,7 +348,7 @@ class BookingWithDetails(BookingResponse):
 
 class BookingSearchFilters(BaseModel):
     """Schema for booking search filters"""
-    event: Optional[str] = Field(None, description="Event name filter")
+    event: Optional[str] = Field(None, description="Event name filter (exact name, else name prefix)")
     venue: Optional[str] = Field(None, description="Venue name filter")
     ticket_type: Optional[str] = Field(None, description="Ticket type filter")
     status: Optional[BookingStatusEnum] = Field(None, description="Booking status filter")
@@ -333,6 +399,24 @@ class OccupancyReport(BaseModel):
     available_capacity: int = Field(..., description="Available capacity")
 
 
+# =============================================================================
+# BULK IMPORT SCHEMAS
+# =============================================================================
+
+class BulkRowError(BaseModel):
+    """Schema for a rejected row of a bulk import"""
+    index: int = Field(..., description="Zero-based position of the row in the request")
+    errors: List[Dict[str, Any]] = Field(..., description="Why the row was rejected")
+
+
+class BulkImportResult(BaseModel):
+    """Schema for bulk import results"""
+    received: int = Field(..., description="Rows received")
+    inserted: int = Field(..., description="Rows inserted")
+    failed: int = Field(..., description="Rows rejected")
+    errors: List[BulkRowError] = Field(default=[], description="Rejected rows (capped)")
+
+
 # =============================================================================
 # ERROR RESPONSE SCHEMAS
 # =============================================================================
@@ -352,6 +436,8 @@ class ValidationErrorResponse(BaseModel):
 
 # Forward references for circular imports
 VenueWithEvents.model_rebuild()
+VenueDetails.model_rebuild()
 EventWithBookings.model_rebuild()
+EventDetails.model_rebuild()
 TicketTypeWithBookings.model_rebuild()
 BookingWithDetails.model_rebuild() 
\ No newline at end of file
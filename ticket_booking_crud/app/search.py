@@ -0,0 +1,139 @@
+"""
+Booking Search Filters
+
+Turns BookingSearchFilters into WHERE clauses on the bookings table alone.
+Event, venue and ticket type name filters are resolved to ids up front,
+so the booking query never joins and can use the indexes on bookings'
+own id columns. Venues and ticket types are few, so their names come
+from small cached (id, name) lookup maps that are dropped whenever they
+are written. Events grow by the season and are resolved in SQL through
+the lower(name) index instead.
+"""
+
+import os
+from typing import List, Tuple
+
+from sqlalchemy import false, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from .models import Booking, BookingStatus, Event, TicketType, Venue
+from .schemas import BookingSearchFilters
+
+LOOKUP_MODELS = {
+    "venues": Venue,
+    "ticket_types": TicketType,
+}
+
+# Workers only see their own invalidations; the TTL bounds staleness across workers
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", "60"))
+lookup_cache = TTLCache(maxsize=len(LOOKUP_MODELS), ttl=LOOKUP_CACHE_TTL)
+
+# Beyond this many matches the ids are filtered with a subquery instead of IN (...)
+MAX_RESOLVED_IDS = 500
+
+
+def invalidate_lookups(*kinds: str):
+    """Drop cached name maps after venues or ticket types change"""
+    for kind in kinds:
+        lookup_cache.delete(kind)
+
+
+async def _lookup_map(db: AsyncSession, kind: str) -> List[Tuple[int, str]]:
+    """(id, lower-cased name) pairs for every row of the lookup table"""
+    entries = lookup_cache.get(kind)
+    if entries is None:
+        model = LOOKUP_MODELS[kind]
+        # Lower-cased by the database, like the subquery in _name_clause
+        result = await db.execute(select(model.id, func.lower(model.name)))
+        entries = [tuple(row) for row in result.all()]
+        lookup_cache.set(kind, entries)
+    return entries
+
+
+def _ids_clause(column, ids: List[int]):
+    if not ids:
+        return false()
+    if len(ids) == 1:
+        return column == ids[0]
+    return column.in_(ids)
+
+
+async def _name_clause(db: AsyncSession, kind: str, column, name: str):
+    """
+    Match `column` against the ids named `name` (case-insensitive)
+
+    An exact name match wins; otherwise every name containing `name`
+    matches. Past MAX_RESOLVED_IDS matches the same predicate is sent as
+    a subquery instead of an id list.
+    """
+    needle = name.lower()
+    entries = await _lookup_map(db, kind)
+    ids = [row_id for row_id, entry in entries if entry == needle]
+    exact = bool(ids)
+    if not exact:
+        ids = [row_id for row_id, entry in entries if needle in entry]
+    if len(ids) > MAX_RESOLVED_IDS:
+        model = LOOKUP_MODELS[kind]
+        lowered = func.lower(model.name)
+        matches = lowered == needle if exact else lowered.contains(needle, autoescape=True)
+        return column.in_(select(model.id).where(matches))
+    return _ids_clause(column, ids)
+
+
+async def _event_name_clause(db: AsyncSession, name: str):
+    """
+    Match bookings of the events named `name` (case-insensitive)
+
+    An exact name match wins; otherwise every event whose name starts
+    with `name` matches. Both are one range scan of ix_events_name_lower,
+    in which exact matches sort first.
+    """
+    needle = name.lower()
+    lowered = func.lower(Event.name)
+    # Every string with the prefix sorts at or after it and before prefix + U+FFFF
+    prefixed = (lowered >= needle) & (lowered < needle + "\uffff")
+    result = await db.execute(
+        select(Event.id, lowered).where(prefixed).order_by(lowered).limit(MAX_RESOLVED_IDS + 1)
+    )
+    rows = result.all()
+    ids = [row_id for row_id, entry in rows if entry == needle]
+    if len(ids) > MAX_RESOLVED_IDS:
+        return Booking.event_id.in_(select(Event.id).where(lowered == needle))
+    if not ids:
+        if len(rows) > MAX_RESOLVED_IDS:
+            return Booking.event_id.in_(select(Event.id).where(prefixed))
+        ids = [row_id for row_id, _entry in rows]
+    return _ids_clause(Booking.event_id, ids)
+
+
+async def booking_filter_clauses(db: AsyncSession, filters: BookingSearchFilters) -> List:
+    """Build the WHERE clauses for the filters that are set"""
+    clauses = []
+    if filters.event:
+        clauses.append(await _event_name_clause(db, filters.event))
+    if filters.venue:
+        clauses.append(await _name_clause(db, "venues", Booking.venue_id, filters.venue))
+    if filters.ticket_type:
+        clauses.append(await _name_clause(db, "ticket_types", Booking.ticket_type_id, filters.ticket_type))
+    if filters.status:
+        clauses.append(Booking.status == BookingStatus(filters.status.value))
+    if filters.customer_email:
+        clauses.append(Booking.customer_email == filters.customer_email)
+    if filters.start_date:
+        clauses.append(Booking.booking_date >= filters.start_date)
+    if filters.end_date:
+        clauses.append(Booking.booking_date <= filters.end_date)
+    return clauses
+
+
+def booking_sort_keys(filters: BookingSearchFilters) -> list:
+    """
+    Keyset for paging search results
+
+    Date-range searches page in booking_date order so the booking_date
+    indexes return rows already sorted; everything else pages by id.
+    """
+    if filters.start_date or filters.end_date:
+        return [Booking.booking_date, Booking.id]
+    return [Booking.id]
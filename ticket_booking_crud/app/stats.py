@@ -0,0 +1,158 @@
+"""
+Dashboard Statistics and Revenue Reports
+
+Each report is one aggregate statement: booking totals use conditional
+aggregation (SUM(CASE WHEN status = ...)) so every status is counted in
+a single pass over bookings, and revenue reports group by event once and
+derive totals and the top events from the grouped rows.
+
+Results are kept in `stats_cache` for a few seconds and the cache is
+cleared whenever bookings are written, so dashboards polling these
+endpoints do not rescan the bookings table on every request.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import stats_cache
+from .models import Booking, BookingStatus, Event, EventBookingStats, TicketType, Venue
+from .schemas import BookingStats, RevenueReport, SystemStats
+
+# Report period -> window length; "all" reads the maintained aggregates
+REPORT_PERIODS: Dict[str, Optional[timedelta]] = {
+    "day": timedelta(days=1),
+    "week": timedelta(days=7),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+    "all": None,
+}
+
+TOP_EVENTS = 5
+
+
+def invalidate_stats():
+    """Drop cached statistics after bookings change"""
+    stats_cache.clear()
+
+
+def _count_status(booking_status: BookingStatus):
+    return func.coalesce(func.sum(case((Booking.status == booking_status, 1), else_=0)), 0)
+
+
+async def get_booking_stats(db: AsyncSession) -> BookingStats:
+    """Booking counts per status and confirmed revenue in one pass"""
+    cached = stats_cache.get("bookings")
+    if cached is not None:
+        return cached
+
+    row = (await db.execute(
+        select(
+            func.count(Booking.id),
+            func.coalesce(func.sum(
+                case((Booking.status == BookingStatus.CONFIRMED, Booking.total_amount), else_=0)
+            ), 0),
+            _count_status(BookingStatus.PENDING),
+            _count_status(BookingStatus.CONFIRMED),
+            _count_status(BookingStatus.CANCELLED),
+        )
+    )).one()
+
+    stats = BookingStats(
+        total_bookings=row[0],
+        total_revenue=round(row[1], 2),
+        pending_bookings=row[2],
+        confirmed_bookings=row[3],
+        cancelled_bookings=row[4],
+    )
+    stats_cache.set("bookings", stats)
+    return stats
+
+
+async def get_system_stats(db: AsyncSession) -> SystemStats:
+    """Entity counts in one statement plus the (cached) booking totals"""
+    cached = stats_cache.get("system")
+    if cached is not None:
+        return cached
+
+    events = select(
+        func.count(Event.id).label("total"),
+        func.coalesce(func.sum(case((Event.status == "active", 1), else_=0)), 0).label("active"),
+    ).subquery()
+    row = (await db.execute(
+        select(
+            select(func.count(Venue.id)).scalar_subquery(),
+            select(func.count(TicketType.id)).scalar_subquery(),
+            events.c.total,
+            events.c.active,
+        )
+    )).one()
+    bookings = await get_booking_stats(db)
+
+    stats = SystemStats(
+        total_venues=row[0],
+        total_ticket_types=row[1],
+        total_events=row[2],
+        active_events=row[3],
+        total_bookings=bookings.total_bookings,
+        total_revenue=bookings.total_revenue,
+    )
+    stats_cache.set("system", stats)
+    return stats
+
+
+async def get_revenue_report(db: AsyncSession, period: str) -> RevenueReport:
+    """
+    Confirmed revenue for the period with the top events by revenue
+
+    Windowed periods group confirmed bookings by event in one range scan
+    of (status, booking_date); "all" reads event_booking_stats instead of
+    scanning every booking.
+    """
+    cached = stats_cache.get(("revenue", period))
+    if cached is not None:
+        return cached
+
+    window = REPORT_PERIODS[period]
+    if window is None:
+        query = select(
+            EventBookingStats.event_id,
+            EventBookingStats.confirmed_revenue,
+            EventBookingStats.confirmed_bookings,
+        )
+    else:
+        query = (
+            select(Booking.event_id, func.sum(Booking.total_amount), func.count(Booking.id))
+            .where(
+                Booking.status == BookingStatus.CONFIRMED,
+                Booking.booking_date >= datetime.utcnow() - window,
+            )
+            .group_by(Booking.event_id)
+        )
+    rows = (await db.execute(query)).all()
+
+    total_revenue = sum(row[1] for row in rows)
+    booking_count = sum(row[2] for row in rows)
+    top = heapq.nlargest(TOP_EVENTS, (row for row in rows if row[2]), key=lambda row: row[1])
+
+    names = {}
+    if top:
+        result = await db.execute(select(Event.id, Event.name).where(Event.id.in_([row[0] for row in top])))
+        names = dict(result.all())
+
+    report = RevenueReport(
+        period=period,
+        total_revenue=round(total_revenue, 2),
+        booking_count=booking_count,
+        average_booking_value=round(total_revenue / booking_count, 2) if booking_count else 0.0,
+        top_events=[
+            {"event_id": event_id, "event_name": names.get(event_id),
+             "revenue": round(revenue, 2), "bookings": count}
+            for event_id, revenue, count in top
+        ],
+    )
+    stats_cache.set(("revenue", period), report)
+    return report
@@ -0,0 +1,192 @@
+"""
+Live Update Streams
+
+In-process publish/subscribe for Server-Sent Events. Subscribers only
+ever need the latest value of a topic (e.g. one event's availability),
+so nothing is queued per connection:
+
+- Each topic with at least one subscriber has a single publisher task.
+  It loads the current value, hands it to every subscriber and then
+  waits until it is notified of a change (or `poll_interval` passes, so
+  writes made by other workers are picked up too).
+- Notifications are coalesced: however many writes arrive, a topic is
+  reloaded at most `max_rate` times per second, and each load is shared
+  by all of its subscribers.
+- A subscriber holds the latest value it has not sent yet plus a flag;
+  a slow client simply skips intermediate values.
+
+An idle connection therefore costs one Subscription object and the
+tasks of its streaming response, which keeps tens of thousands of
+connections per worker cheap.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """Latest undelivered value of one topic for one connection"""
+
+    __slots__ = ("data", "version", "_changed")
+
+    def __init__(self):
+        # JSON of the latest value, None once the topic is gone
+        self.data: Optional[str] = None
+        self.version = 0
+        self._changed = asyncio.Event()
+
+    def deliver(self, data: Optional[str], version: int):
+        self.data = data
+        self.version = version
+        self._changed.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a new value; False if `timeout` passed without one"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+
+class _Topic:
+    __slots__ = ("subscribers", "changed", "task", "value", "data", "version")
+
+    def __init__(self):
+        self.subscribers: Set[Subscription] = set()
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.value: Any = None
+        self.data: Optional[str] = None
+        self.version = 0
+
+
+class LatestValueBroker:
+    """
+    Fan the latest value of each topic out to its subscribers
+
+    `load(key)` returns the topic's current value, or None once the topic
+    no longer exists (subscribers are then told it is gone).
+    """
+
+    def __init__(
+        self,
+        load: Callable[[Hashable], Awaitable[Any]],
+        max_rate: float,
+        poll_interval: float,
+    ):
+        self.load = load
+        self.min_interval = 1 / max_rate if max_rate > 0 else 0.0
+        self.poll_interval = poll_interval
+        self._topics: Dict[Hashable, _Topic] = {}
+        self.subscribers = 0
+        self.loads = 0
+
+    def subscribe(self, key: Hashable) -> Subscription:
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = _Topic()
+        subscription = Subscription()
+        topic.subscribers.add(subscription)
+        self.subscribers += 1
+        if topic.version:
+            subscription.deliver(topic.data, topic.version)
+        if topic.task is None:
+            topic.task = asyncio.create_task(self._publish(key, topic))
+        return subscription
+
+    def unsubscribe(self, key: Hashable, subscription: Subscription):
+        topic = self._topics.get(key)
+        if topic is None or subscription not in topic.subscribers:
+            return
+        topic.subscribers.discard(subscription)
+        self.subscribers -= 1
+        if not topic.subscribers:
+            del self._topics[key]
+            if topic.task is not None:
+                topic.task.cancel()
+
+    def notify(self, key: Hashable):
+        """Mark a topic as changed; a no-op when nobody is subscribed"""
+        topic = self._topics.get(key)
+        if topic is not None:
+            topic.changed.set()
+
+    async def _publish(self, key: Hashable, topic: _Topic):
+        while True:
+            # Cleared before loading so a change made during the load
+            # triggers another round
+            topic.changed.clear()
+            started = time.monotonic()
+            try:
+                self.loads += 1
+                value = await self.load(key)
+            except Exception as e:
+                logger.warning("Loading stream topic %r failed: %s", key, e)
+            else:
+                if topic.version == 0 or value != topic.value:
+                    # Encoded once here rather than once per connection
+                    topic.version += 1
+                    topic.value = value
+                    topic.data = None if value is None else json.dumps(value, separators=(",", ":"), default=str)
+                    for subscription in topic.subscribers:
+                        subscription.deliver(topic.data, topic.version)
+                if value is None:
+                    return
+
+            try:
+                await asyncio.wait_for(topic.changed.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            # Coalesce bursts of notifications into at most max_rate loads/sec
+            await asyncio.sleep(max(0.0, started + self.min_interval - time.monotonic()))
+
+
+def format_sse(data: Optional[str] = None, event: Optional[str] = None, id: Optional[int] = None, retry_ms: Optional[int] = None) -> str:
+    """Encode one Server-Sent Events message; `data` is single-line JSON"""
+    lines = []
+    if retry_ms is not None:
+        lines.append(f"retry: {retry_ms}")
+    if id is not None:
+        lines.append(f"id: {id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    if data is not None:
+        lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def sse_stream(
+    broker: LatestValueBroker,
+    key: Hashable,
+    event: str,
+    heartbeat: float,
+    retry_ms: int = 3000,
+) -> AsyncIterator[str]:
+    """
+    Stream a topic as Server-Sent Events
+
+    Sends `event` messages whenever the value changes, a comment every
+    `heartbeat` seconds of silence so proxies keep the connection open,
+    and a final "gone" message once the topic no longer exists. The
+    subscription is dropped when the client disconnects.
+    """
+    subscription = broker.subscribe(key)
+    try:
+        yield format_sse(retry_ms=retry_ms)
+        while True:
+            if not await subscription.wait(heartbeat):
+                yield ": keepalive\n\n"
+                continue
+            if subscription.data is None:
+                yield format_sse(json.dumps({"id": key}, separators=(",", ":")), event="gone", id=subscription.version)
+                return
+            yield format_sse(subscription.data, event=event, id=subscription.version)
+    finally:
+        broker.unsubscribe(key, subscription)
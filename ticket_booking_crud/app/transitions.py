@@ -0,0 +1,211 @@
+"""
+Booking Status Transitions
+
+Changes the status of many bookings at once with set-based statements
+instead of one ORM round trip per booking. Bookings are processed in
+chunks of BOOKING_STATUS_CHUNK_SIZE; each chunk is one transaction that
+
+1. moves the chunk's bookings out of each allowed source status with a
+   single UPDATE ... RETURNING (the status is part of the WHERE clause,
+   so concurrent changes are never applied twice),
+2. gives the seats of cancelled bookings back to events.booked_count and
+   ticket_types.availability_count, and
+3. adds or removes the confirmed aggregates of bookings that entered or
+   left the confirmed state.
+
+Allowed transitions:
+    pending   -> confirmed (unexpired holds only), cancelled
+    confirmed -> cancelled
+Cancelled bookings have released their seats and cannot be reopened.
+"""
+
+import os
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .aggregates import apply_booking_delta
+from .database import write_transaction
+from .models import Booking, BookingStatus, Event, TicketType
+
+BOOKING_STATUS_CHUNK_SIZE = int(os.getenv("BOOKING_STATUS_CHUNK_SIZE", "1000"))
+
+# Target status -> statuses a booking may be moved out of
+ALLOWED_TRANSITIONS = {
+    BookingStatus.PENDING: (),
+    BookingStatus.CONFIRMED: (BookingStatus.PENDING,),
+    BookingStatus.CANCELLED: (BookingStatus.PENDING, BookingStatus.CONFIRMED),
+}
+
+_RETURNED = (Booking.event_id, Booking.venue_id, Booking.ticket_type_id, Booking.quantity, Booking.total_amount)
+
+
+async def release_seats(db: AsyncSession, rows: Iterable) -> Set[int]:
+    """
+    Give the seats of cancelled bookings back to the inventory counters
+
+    `rows` need event_id, ticket_type_id and quantity. Adds the seats back
+    with one executemany per table and returns the affected event ids.
+    Does not commit.
+    """
+    seats_by_event = Counter()
+    seats_by_ticket_type = Counter()
+    for row in rows:
+        seats_by_event[row.event_id] += row.quantity
+        seats_by_ticket_type[row.ticket_type_id] += row.quantity
+    if not seats_by_event:
+        return set()
+
+    events = Event.__table__
+    ticket_types = TicketType.__table__
+    await db.execute(
+        update(events)
+        .where(events.c.id == bindparam("event_id"))
+        .values(booked_count=events.c.booked_count - bindparam("seats")),
+        [{"event_id": event_id, "seats": seats} for event_id, seats in seats_by_event.items()],
+    )
+    await db.execute(
+        update(ticket_types)
+        .where(ticket_types.c.id == bindparam("ticket_type_id"))
+        .values(availability_count=ticket_types.c.availability_count + bindparam("seats")),
+        [{"ticket_type_id": ticket_type_id, "seats": seats}
+         for ticket_type_id, seats in seats_by_ticket_type.items()],
+    )
+    return set(seats_by_event)
+
+
+async def _apply_confirmed_deltas(db: AsyncSession, rows: List, sign: int):
+    """Add (sign=1) or remove (sign=-1) bookings from the confirmed aggregates"""
+    totals = defaultdict(lambda: [0, 0.0, 0])
+    for row in rows:
+        total = totals[(row.event_id, row.venue_id)]
+        total[0] += row.quantity
+        total[1] += row.total_amount
+        total[2] += 1
+    for (event_id, venue_id), (tickets, revenue, bookings) in totals.items():
+        await apply_booking_delta(
+            db,
+            event_id=event_id,
+            venue_id=venue_id,
+            tickets=sign * tickets,
+            revenue=round(sign * revenue, 2),
+            bookings=sign * bookings,
+        )
+
+
+def _source_conditions(source: BookingStatus, target: BookingStatus, now: datetime) -> list:
+    conditions = [Booking.status == source]
+    if source == BookingStatus.PENDING and target == BookingStatus.CONFIRMED:
+        # Expired holds are left to the sweeper
+        conditions.append(or_(Booking.expires_at.is_(None), Booking.expires_at > now))
+    return conditions
+
+
+@dataclass
+class StatusChange:
+    """Counts collected while changing booking statuses"""
+    target: BookingStatus
+    updated_from: Dict[str, int]
+    tickets_released: int = 0
+    event_ids: Set[int] = field(default_factory=set)
+
+    @property
+    def updated(self) -> int:
+        return sum(self.updated_from.values())
+
+
+async def _transition_chunk(
+    db: AsyncSession,
+    change: StatusChange,
+    sources: List[BookingStatus],
+    selection,
+    now: datetime,
+) -> int:
+    """Move the selected bookings from `sources` to the target status in one transaction"""
+    target = change.target
+    # A confirmed booking no longer expires; cancelled ones keep the record
+    values = {"status": target, **({"expires_at": None} if target == BookingStatus.CONFIRMED else {})}
+    changed = 0
+    async with write_transaction():
+        for source in sources:
+            result = await db.execute(
+                update(Booking)
+                .where(selection, *_source_conditions(source, target, now))
+                .values(**values)
+                .returning(*_RETURNED)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            if not rows:
+                continue
+
+            if target == BookingStatus.CANCELLED:
+                change.event_ids |= await release_seats(db, rows)
+                change.tickets_released += sum(row.quantity for row in rows)
+            if target == BookingStatus.CONFIRMED:
+                await _apply_confirmed_deltas(db, rows, 1)
+            elif source == BookingStatus.CONFIRMED:
+                await _apply_confirmed_deltas(db, rows, -1)
+            change.updated_from[source.value] += len(rows)
+            changed += len(rows)
+
+        if changed:
+            await db.commit()
+        else:
+            await db.rollback()
+    return changed
+
+
+async def change_booking_status(
+    db: AsyncSession,
+    target: BookingStatus,
+    booking_ids: Optional[List[int]] = None,
+    event_id: Optional[int] = None,
+    current_status: Optional[BookingStatus] = None,
+    chunk_size: int = BOOKING_STATUS_CHUNK_SIZE,
+) -> StatusChange:
+    """
+    Move bookings selected by id or by event to the `target` status
+
+    Bookings already in the target status, or in a status they cannot
+    leave for it, are left alone. Raises 400 when no booking could ever
+    make the requested transition.
+    """
+    sources = [
+        source for source in ALLOWED_TRANSITIONS[target]
+        if current_status is None or source == current_status
+    ]
+    if not sources:
+        source_label = current_status.value if current_status else "any status"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bookings cannot be changed from {source_label} to {target.value}"
+        )
+
+    change = StatusChange(target, {source.value: 0 for source in sources})
+    now = datetime.utcnow()
+
+    if booking_ids is not None:
+        ids = sorted(set(booking_ids))
+        for offset in range(0, len(ids), chunk_size):
+            await _transition_chunk(db, change, sources, Booking.id.in_(ids[offset:offset + chunk_size]), now)
+        return change
+
+    for source in sources:
+        while True:
+            # Each chunk re-selects, since the previous ones left the source status
+            chunk = (
+                select(Booking.id)
+                .where(Booking.event_id == event_id, *_source_conditions(source, target, now))
+                .order_by(Booking.id)
+                .limit(chunk_size)
+                .scalar_subquery()
+            )
+            if await _transition_chunk(db, change, [source], Booking.id.in_(chunk), now) < chunk_size:
+                break
+    return change
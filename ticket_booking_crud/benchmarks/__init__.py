@@ -0,0 +1,9 @@
+"""
+Benchmarks for the Ticket Booking System API
+
+Each module in this package is a standalone script, run from the
+ticket_booking_crud directory with the repository root on PYTHONPATH
+(the app imports the shared schema_migrations package from there), e.g.:
+
+    PYTHONPATH=.. python -m benchmarks.async_db_latency
+"""
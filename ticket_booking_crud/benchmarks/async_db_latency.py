@@ -0,0 +1,159 @@
+"""
+Load benchmark: blocking Session vs AsyncSession in async handlers
+
+Compares request latency under concurrent load for:
+- sync:  the previous pattern, `async def` handlers calling a sync Session,
+         which blocks the event loop for the duration of every query
+- async: the current handlers from app.main using AsyncSession
+
+Both variants are driven in-process over ASGI with the same client mix
+(event listings and venue lookups). SQLite answers these queries in
+microseconds, so every statement is delayed by --latency-ms inside the
+driver to stand in for the network round-trip of a real database server.
+
+Usage:
+    python -m benchmarks.async_db_latency --clients 200 --requests 20
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import httpx
+
+from .common import print_table, quiet_logs, run_clients, summarize, use_temp_database
+
+
+def seed(venues: int, events_per_venue: int):
+    """Insert venues and events with bulk Core inserts"""
+    from sqlalchemy import insert
+    from app.database import SessionLocal, create_tables
+    from app.models import Event, Venue
+
+    create_tables()
+    start = datetime.now() + timedelta(days=1)
+    with SessionLocal() as db:
+        db.execute(insert(Venue), [
+            {"name": f"Venue {v}", "address": f"{v} Main St", "city": "Springfield",
+             "country": "USA", "capacity": 50000}
+            for v in range(1, venues + 1)
+        ])
+        db.execute(insert(Event), [
+            {"name": f"Event {v}-{e}", "event_date": start + timedelta(hours=e),
+             "duration_minutes": 120, "venue_id": v, "max_capacity": 40000, "status": "active"}
+            for v in range(1, venues + 1)
+            for e in range(events_per_venue)
+        ])
+        db.commit()
+
+
+def slow_connection_factory(latency: float):
+    """sqlite3 connection class whose cursors sleep before every statement"""
+
+    class SlowCursor(sqlite3.Cursor):
+        def execute(self, *args, **kwargs):
+            time.sleep(latency)
+            return super().execute(*args, **kwargs)
+
+    class SlowConnection(sqlite3.Connection):
+        def cursor(self, factory=SlowCursor):
+            return super().cursor(factory)
+
+    return SlowConnection
+
+
+def add_latency(engine, latency: float):
+    """Make every connection the engine opens from now on use slow cursors"""
+    from sqlalchemy import event
+
+    factory = slow_connection_factory(latency)
+
+    @event.listens_for(engine, "do_connect")
+    def use_slow_connection(dialect, conn_rec, cargs, cparams):
+        cparams["factory"] = factory
+
+
+def build_sync_app(clients: int, latency: float):
+    """
+    The previous handler pattern: async routes over a blocking Session
+
+    The pool is sized to the number of clients: with the default pool a
+    handler blocked on checkout also blocks the event loop that would run
+    the dependency teardown returning connections, so requests stall until
+    the pool timeout. That starvation is real, but here we want to measure
+    the cost of blocking queries alone.
+    """
+    from fastapi import Depends, FastAPI, HTTPException
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session, sessionmaker
+    from app.database import SYNC_DATABASE_URL, connect_args
+
+    engine = create_engine(SYNC_DATABASE_URL, connect_args=connect_args, pool_size=clients)
+    add_latency(engine, latency)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    from app.models import Event, Venue
+    from app.schemas import EventResponse, VenueResponse
+
+    sync_app = FastAPI()
+
+    def get_sync_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @sync_app.get("/events", response_model=List[EventResponse])
+    async def get_events(limit: int = 100, db: Session = Depends(get_sync_db)):
+        return db.query(Event).order_by(Event.event_date).limit(limit).all()
+
+    @sync_app.get("/venues/{venue_id}", response_model=VenueResponse)
+    async def get_venue(venue_id: int, db: Session = Depends(get_sync_db)):
+        venue = db.query(Venue).filter(Venue.id == venue_id).first()
+        if not venue:
+            raise HTTPException(status_code=404)
+        return venue
+
+    return sync_app
+
+
+async def measure(app, paths, clients: int, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up connections and caches before timing
+        await run_clients(client, paths, min(clients, 10), 2)
+        return summarize(await run_clients(client, paths, clients, requests))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Simulated per-statement latency")
+    parser.add_argument("--venues", type=int, default=50)
+    parser.add_argument("--events-per-venue", type=int, default=200)
+    args = parser.parse_args()
+
+    use_temp_database("async_db_latency")
+    seed(args.venues, args.events_per_venue)
+
+    from app.database import async_engine
+    from app.main import app
+    quiet_logs()
+
+    latency = args.latency_ms / 1000
+    add_latency(async_engine.sync_engine, latency)
+
+    paths = ["/events?limit=100"] + [f"/venues/{v}" for v in range(1, min(args.venues, 9) + 1)]
+    results = {
+        "sync": await measure(build_sync_app(args.clients, latency), paths, args.clients, args.requests),
+        "async": await measure(app, paths, args.clients, args.requests),
+    }
+    print_table(f"{args.clients} concurrent clients x {args.requests} requests", results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+On-sale spike benchmark: GET /events/{id}/available-tickets on one event
+
+Paces --clients concurrent pollers to an aggregate --rate requests/sec on
+a single event while bookings for it arrive at --booking-rate per second.
+Reports the achieved rate, latency, and how many times availability was
+actually loaded from the database. With the cache, loads stay near one
+per TTL (plus one per booking, which invalidates the entry) no matter
+how many clients poll; with --no-cache every request loads.
+
+Clients and app share one process and event loop, so on a single core
+the achieved rate tops out below --rate; loads per request is the number
+to compare.
+
+Usage:
+    python -m benchmarks.availability_spike --rate 5000 --duration 10
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from .common import quiet_logs, summarize, use_temp_database
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=int, default=5000, help="Target availability requests/sec")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--booking-rate", type=float, default=20.0, help="Bookings/sec on the same event")
+    parser.add_argument("--no-cache", action="store_true", help="Load on every request")
+    args = parser.parse_args()
+
+    use_temp_database("availability_spike")
+
+    from app.availability import availability_cache
+    from app.database import create_tables_async
+    from app.main import app
+    quiet_logs()
+    await create_tables_async()
+    if args.no_cache:
+        async def load_every_time(key, load):
+            availability_cache.loads += 1
+            return await load()
+        availability_cache.get = load_every_time
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None, limits=limits) as client:
+        (await client.post("/venues", json={"name": "Stadium", "address": "1 Main St", "city": "Springfield",
+                                            "country": "USA", "capacity": 1000000})).raise_for_status()
+        (await client.post("/events", json={"name": "Final", "event_date": "2030-06-01T20:00:00",
+                                            "venue_id": 1, "max_capacity": 1000000})).raise_for_status()
+        (await client.post("/ticket-types/bulk", json=[{"name": "Standard", "price": 50,
+                                                        "availability_count": 1000000}])).raise_for_status()
+
+        latencies = []
+        bookings = 0
+        deadline = time.perf_counter() + args.duration
+        interval = args.clients / args.rate
+
+        async def poller(offset: float):
+            await asyncio.sleep(offset)
+            next_at = time.perf_counter()
+            while next_at < deadline:
+                started = time.perf_counter()
+                response = await client.get("/events/1/available-tickets")
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+                next_at += interval
+                await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+
+        async def booker():
+            nonlocal bookings
+            while time.perf_counter() < deadline and args.booking_rate > 0:
+                response = await client.post("/bookings", json={
+                    "event_id": 1, "venue_id": 1, "ticket_type_id": 1, "customer_name": "Fan",
+                    "customer_email": f"fan{bookings}@example.com", "quantity": 1,
+                })
+                response.raise_for_status()
+                bookings += 1
+                await asyncio.sleep(1 / args.booking_rate)
+
+        loads_before = availability_cache.loads
+        started = time.perf_counter()
+        await asyncio.gather(booker(), *(poller(i * interval / args.clients) for i in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies)
+    loads = availability_cache.loads - loads_before
+    print(f"\ntarget {args.rate} req/s, achieved {len(latencies) / elapsed:.0f} req/s over {elapsed:.1f}s")
+    print(f"bookings: {bookings}, database loads: {loads} ({loads / len(latencies):.4f} per request)")
+    print(f"latency: p50 {summary['p50_ms']}ms, p95 {summary['p95_ms']}ms, p99 {summary['p99_ms']}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
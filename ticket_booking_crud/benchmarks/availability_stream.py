@@ -0,0 +1,157 @@
+"""
+Availability stream benchmark: SSE fan-out to many idle connections
+
+Opens --connections availability streams on one event, then books
+--bookings tickets on it within --burst seconds. Reports memory per
+connection, how many updates each connection received (coalescing keeps
+it near AVAILABILITY_STREAM_MAX_RATE per second however many bookings
+arrive), how many times availability was loaded, and how long after the
+last booking every connection had the final count.
+
+Connections are driven straight through the ASGI interface, as
+httpx's ASGI transport buffers whole response bodies. Clients, bookings
+and fan-out share one event loop, so with many connections the burst
+itself takes longer than --burst.
+
+Usage:
+    python -m benchmarks.availability_stream --connections 20000 --bookings 200
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import time
+
+import httpx
+
+from .common import percentile, quiet_logs, use_temp_database
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StreamClient:
+    """One SSE connection driven over raw ASGI"""
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self.updates = 0
+        self.available = None
+        self.updated_at = 0.0
+        self.connected = asyncio.Event()
+        self._disconnect = asyncio.Event()
+        self._buffer = ""
+        self._requested = False
+        self.task = None
+
+    def start(self):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": self.path, "raw_path": self.path.encode(), "root_path": "",
+            "query_string": b"", "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+        }
+        self.task = asyncio.create_task(self.app(scope, self._receive, self._send))
+
+    async def close(self):
+        self._disconnect.set()
+        await self.task
+
+    async def _receive(self):
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] != "http.response.body":
+            return
+        self._buffer += message.get("body", b"").decode()
+        while "\n\n" in self._buffer:
+            raw, self._buffer = self._buffer.split("\n\n", 1)
+            fields = dict(line.split(": ", 1) for line in raw.splitlines() if ": " in line and not line.startswith(":"))
+            if fields.get("event") == "availability":
+                self.updates += 1
+                self.available = json.loads(fields["data"])["available_tickets"]
+                self.updated_at = time.perf_counter()
+                self.connected.set()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=20000)
+    parser.add_argument("--bookings", type=int, default=200, help="Bookings made during the burst")
+    parser.add_argument("--burst", type=float, default=2.0, help="Seconds the bookings are spread over")
+    args = parser.parse_args()
+
+    use_temp_database("availability_stream")
+
+    from app.availability import AVAILABILITY_STREAM_MAX_RATE, availability_broker
+    from app.database import create_tables_async
+    from app.main import app
+    quiet_logs()
+    await create_tables_async()
+
+    capacity = 1000000
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        (await client.post("/venues", json={"name": "Stadium", "address": "1 Main St", "city": "Springfield",
+                                            "country": "USA", "capacity": capacity})).raise_for_status()
+        (await client.post("/events", json={"name": "Final", "event_date": "2030-06-01T20:00:00",
+                                            "venue_id": 1, "max_capacity": capacity})).raise_for_status()
+        (await client.post("/ticket-types/bulk", json=[{"name": "Standard", "price": 50,
+                                                        "availability_count": capacity}])).raise_for_status()
+
+        rss_before = rss_mb()
+        started = time.perf_counter()
+        streams = [StreamClient(app, "/events/1/availability/stream") for _ in range(args.connections)]
+        for stream in streams:
+            stream.start()
+        await asyncio.gather(*(stream.connected.wait() for stream in streams))
+        connect_seconds = time.perf_counter() - started
+        rss_connected = rss_mb()
+        print(f"\n{args.connections} streams open in {connect_seconds:.1f}s, "
+              f"{(rss_connected - rss_before) * 1024 / args.connections:.1f} KB each "
+              f"(RSS {rss_before:.0f} -> {rss_connected:.0f} MB)")
+
+        for stream in streams:
+            stream.updates = 0
+        loads_before = availability_broker.loads
+        burst_started = time.perf_counter()
+        for i in range(args.bookings):
+            (await client.post("/bookings", json={
+                "event_id": 1, "venue_id": 1, "ticket_type_id": 1, "customer_name": "Fan",
+                "customer_email": f"fan{i}@example.com", "quantity": 1,
+            })).raise_for_status()
+            await asyncio.sleep(max(0.0, burst_started + (i + 1) * args.burst / args.bookings - time.perf_counter()))
+        last_booking = time.perf_counter()
+
+        final = capacity - args.bookings
+        deadline = last_booking + 10
+        while time.perf_counter() < deadline and any(stream.available != final for stream in streams):
+            await asyncio.sleep(0.05)
+        lags = sorted(stream.updated_at - last_booking for stream in streams if stream.available == final)
+        burst_seconds = last_booking - burst_started
+
+        updates = [stream.updates for stream in streams]
+        print(f"{args.bookings} bookings in {burst_seconds:.1f}s at max {AVAILABILITY_STREAM_MAX_RATE:g} updates/s: "
+              f"{availability_broker.loads - loads_before} availability loads, "
+              f"updates per connection min {min(updates)} max {max(updates)}")
+        print(f"final count reached {len(lags)}/{len(streams)} connections; after last booking "
+              f"p50 {percentile(lags, 50) * 1000:.0f}ms, p99 {percentile(lags, 99) * 1000:.0f}ms")
+
+        await asyncio.gather(*(stream.close() for stream in streams))
+        print(f"subscribers after disconnect: {availability_broker.subscribers}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
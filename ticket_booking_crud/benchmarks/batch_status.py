@@ -0,0 +1,109 @@
+"""
+Batch booking status benchmark: PATCH /bookings/status vs per-booking updates
+
+Seeds --bookings pending holds and --bookings confirmed bookings over
+--events events, then times:
+
+- per-booking: --naive confirmed bookings cancelled one ORM round trip
+  (and commit) at a time, the way a client without the batch endpoint
+  has to do it,
+- by ids: --ids confirmed bookings cancelled with one PATCH request,
+- by filter: every pending booking of one event confirmed, then every
+  booking of another event cancelled.
+
+Finishes by checking seat counters and confirmed aggregates against the
+bookings table (exit status 1 on any mismatch).
+
+Usage:
+    python -m benchmarks.batch_status --bookings 100000 --ids 20000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+import httpx
+
+from .common import inventory_mismatches, quiet_logs, seed_bookings, use_temp_database
+
+
+async def cancel_one_by_one(booking_ids):
+    """Cancel bookings with a load-modify-commit round trip each"""
+    from app.aggregates import apply_booking_delta
+    from app.database import AsyncSessionLocal
+    from app.models import Booking, BookingStatus, Event, TicketType
+
+    async with AsyncSessionLocal() as db:
+        for booking_id in booking_ids:
+            booking = await db.get(Booking, booking_id)
+            event = await db.get(Event, booking.event_id)
+            ticket_type = await db.get(TicketType, booking.ticket_type_id)
+            booking.status = BookingStatus.CANCELLED
+            event.booked_count -= booking.quantity
+            ticket_type.availability_count += booking.quantity
+            await apply_booking_delta(
+                db,
+                event_id=booking.event_id,
+                venue_id=booking.venue_id,
+                tickets=-booking.quantity,
+                revenue=-booking.total_amount,
+                bookings=-1,
+            )
+            await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=100_000, help="Pending and confirmed bookings each")
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--ids", type=int, default=20_000, help="Bookings cancelled by id in one request")
+    parser.add_argument("--naive", type=int, default=2_000, help="Bookings cancelled one at a time")
+    args = parser.parse_args()
+
+    use_temp_database("batch_status")
+    started = time.perf_counter()
+    seed_bookings(0, args.bookings, args.bookings, args.events)
+    print(f"\nSeeded {args.bookings} pending and {args.bookings} confirmed bookings "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    from app.main import app
+    quiet_logs()
+
+    # Confirmed bookings follow the pending ones in seed order
+    confirmed_ids = list(range(args.bookings + 1, 2 * args.bookings + 1))
+    random.Random(3).shuffle(confirmed_ids)
+    naive_ids = confirmed_ids[:args.naive]
+    batch_ids = confirmed_ids[args.naive:args.naive + args.ids]
+
+    started = time.perf_counter()
+    await cancel_one_by_one(naive_ids)
+    naive_rate = len(naive_ids) / (time.perf_counter() - started)
+    print(f"{'per-booking':<14}{len(naive_ids):>8} cancelled  {naive_rate:>9.0f} bookings/s")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        runs = [
+            ("by ids", {"status": "cancelled", "booking_ids": batch_ids}),
+            ("by filter", {"status": "confirmed", "event_id": 1, "current_status": "pending"}),
+            ("by filter", {"status": "cancelled", "event_id": 2}),
+        ]
+        for label, body in runs:
+            started = time.perf_counter()
+            response = await client.patch("/bookings/status", json=body)
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            result = response.json()
+            print(f"{label:<14}{result['updated']:>8} {result['status']:<10} {result['updated'] / elapsed:>9.0f} bookings/s"
+                  f"  ({result['updated_from']}, {result['tickets_released']} tickets released)")
+
+    mismatches = inventory_mismatches()
+    if mismatches:
+        print(f"FAIL: {mismatches} counters disagree with the bookings table")
+        sys.exit(1)
+    print("inventory and confirmed aggregates match the bookings table")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
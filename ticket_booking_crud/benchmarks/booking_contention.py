@@ -0,0 +1,137 @@
+"""
+Contention benchmark: many concurrent bookings against one hot event
+
+Fires --requests POST /bookings at a single event from --clients
+concurrent clients, with more demand than the event has seats, then
+checks the inventory invariants:
+
+- events.booked_count never exceeds max_capacity
+- events.booked_count equals the tickets on the stored bookings
+- every ticket taken from ticket_types.availability_count is accounted for
+
+Exits with status 1 if the event was oversold or a counter drifted.
+
+Usage:
+    python -m benchmarks.booking_contention --capacity 5000 --requests 4000 --clients 200
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import httpx
+
+from .common import quiet_logs, summarize, use_temp_database
+
+
+def seed(capacity: int, ticket_supply: int):
+    """Create one venue, one hot event and a ticket type, returning their ids"""
+    from app.database import SessionLocal, create_tables
+    from app.models import Event, TicketType, Venue
+
+    create_tables()
+    with SessionLocal() as db:
+        venue = Venue(name="Stadium", address="1 Arena Way", city="Springfield", capacity=capacity)
+        ticket_type = TicketType(name="Standard", price=50.0, availability_count=ticket_supply)
+        db.add_all([venue, ticket_type])
+        db.flush()
+        event = Event(
+            name="Hot Event",
+            event_date=datetime.now() + timedelta(days=30),
+            venue_id=venue.id,
+            max_capacity=capacity,
+        )
+        db.add(event)
+        db.commit()
+        return event.id, venue.id, ticket_type.id
+
+
+def check_invariants(event_id: int, ticket_type_id: int, ticket_supply: int) -> list:
+    """Return a list of violated inventory invariants (empty when consistent)"""
+    from sqlalchemy import func, select
+    from app.database import SessionLocal
+    from app.models import Booking, Event, TicketType
+
+    problems = []
+    with SessionLocal() as db:
+        event = db.get(Event, event_id)
+        ticket_type = db.get(TicketType, ticket_type_id)
+        booked = db.scalar(
+            select(func.coalesce(func.sum(Booking.quantity), 0)).where(Booking.event_id == event_id)
+        )
+        if event.booked_count > event.max_capacity:
+            problems.append(f"oversold: {event.booked_count} booked for {event.max_capacity} seats")
+        if event.booked_count != booked:
+            problems.append(f"events.booked_count={event.booked_count} but bookings hold {booked}")
+        if ticket_supply - ticket_type.availability_count != booked:
+            problems.append(
+                f"ticket type gave out {ticket_supply - ticket_type.availability_count} tickets "
+                f"but bookings hold {booked}"
+            )
+        print(f"booked {event.booked_count}/{event.max_capacity} seats")
+    return problems
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capacity", type=int, default=5000, help="Seats on the hot event")
+    parser.add_argument("--requests", type=int, default=4000, help="Booking attempts")
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent clients")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    use_temp_database("booking_contention")
+    ticket_supply = args.requests * 10  # the event, not the ticket type, is the bottleneck
+    event_id, venue_id, ticket_type_id = seed(args.capacity, ticket_supply)
+
+    from app.main import app
+    quiet_logs()
+
+    rng = random.Random(args.seed)
+    payloads = [
+        {
+            "event_id": event_id,
+            "venue_id": venue_id,
+            "ticket_type_id": ticket_type_id,
+            "customer_name": f"Fan {n}",
+            "customer_email": f"fan{n}@example.com",
+            "quantity": rng.randint(1, 4),
+        }
+        for n in range(args.requests)
+    ]
+    statuses = Counter()
+    latencies = []
+    queue = iter(payloads)
+
+    async def client_loop(client: httpx.AsyncClient):
+        for payload in queue:
+            start = time.perf_counter()
+            response = await client.post("/bookings", json=payload)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(args.clients)))
+        elapsed = time.perf_counter() - started
+
+    print(f"\n{args.requests} booking attempts, {args.clients} clients, {elapsed:.2f}s "
+          f"({args.requests / elapsed:.0f} req/s)")
+    print("responses:", dict(sorted(statuses.items())))
+    print("latency:", summarize(latencies))
+
+    problems = check_invariants(event_id, ticket_type_id, ticket_supply)
+    for problem in problems:
+        print("FAIL:", problem)
+    if problems:
+        sys.exit(1)
+    print("OK: no oversell, counters consistent")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
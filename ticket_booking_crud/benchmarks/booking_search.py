@@ -0,0 +1,85 @@
+"""
+Booking search benchmark: GET /bookings/search latency on a large table
+
+Seeds --bookings bookings (5M by default) and issues a mix of searches -
+by event, venue and ticket type name, status, customer email, date range
+and combinations - reporting latency per filter. Exits with status 1 when
+any p95 exceeds --budget-ms.
+
+Usage:
+    python -m benchmarks.booking_search --bookings 5000000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from .common import print_table, quiet_logs, summarize, use_temp_database
+from .query_plans import seed
+
+
+def scenarios() -> dict:
+    """label -> list of query strings"""
+    now = datetime.now()
+
+    def window(days_ago: int, days: int) -> str:
+        start = now - timedelta(days=days_ago)
+        return f"start_date={start.isoformat()}&end_date={(start + timedelta(days=days)).isoformat()}"
+
+    return {
+        "event": [f"event=Event%20{n}" for n in range(1, 200, 7)],
+        "venue": [f"venue=Venue%20{n}" for n in range(1, 200, 7)],
+        "ticket_type": ["ticket_type=VIP", "ticket_type=Economy", "ticket_type=standard"],
+        "status": ["status=cancelled", "status=pending", "status=confirmed"],
+        "email": [f"customer_email=customer{n}@example.com" for n in range(0, 200000, 7919)],
+        "date_range": [window(d, 1) for d in range(1, 60, 3)],
+        "venue+status": [f"venue=Venue%20{n}&status=confirmed" for n in range(1, 200, 7)],
+        "event+date": [f"event=Event%20{n}&{window(30, 30)}" for n in range(1, 200, 7)],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=5_000_000)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--venues", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per filter")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Maximum acceptable p95")
+    args = parser.parse_args()
+
+    use_temp_database("booking_search")
+    started = time.perf_counter()
+    seed(args.bookings, args.events, args.venues)
+    print(f"Seeded {args.bookings} bookings in {time.perf_counter() - started:.1f}s")
+
+    from app.main import app
+    quiet_logs()
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm the name lookup maps
+        (await client.get("/bookings/search?event=Event%201&venue=Venue%201&ticket_type=VIP&limit=1")).raise_for_status()
+        for label, queries in scenarios().items():
+            latencies = []
+            for i in range(args.requests):
+                url = f"/bookings/search?{queries[i % len(queries)]}&limit=50"
+                request_started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - request_started)
+                response.raise_for_status()
+            results[label] = summarize(latencies)
+
+    print_table(f"GET /bookings/search ({args.bookings} bookings)", results)
+    slow = [label for label, summary in results.items() if summary["p95_ms"] > args.budget_ms]
+    if slow:
+        print(f"\np95 over {args.budget_ms}ms: {', '.join(slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""
+Bulk import benchmark: per-row POST /events vs POST /events/bulk
+
+Creates one venue, then imports --rows events through each path and
+reports rows/sec. The bulk import is sent as an NDJSON stream (and, with
+--json-array, also as a JSON array).
+
+Usage:
+    python -m benchmarks.bulk_import --rows 10000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from .common import quiet_logs, use_temp_database
+
+
+def event_rows(count: int, venue_id: int, start: int = 0):
+    """Build `count` valid EventCreate payloads"""
+    base = datetime.now() + timedelta(days=30)
+    return [
+        {"name": f"Event {n}", "event_date": (base + timedelta(minutes=n)).isoformat(),
+         "duration_minutes": 120, "venue_id": venue_id, "max_capacity": 1000}
+        for n in range(start, start + count)
+    ]
+
+
+async def per_row(client: httpx.AsyncClient, rows: list) -> float:
+    started = time.perf_counter()
+    for row in rows:
+        response = await client.post("/events", json=row)
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def bulk(client: httpx.AsyncClient, rows: list, ndjson: bool) -> float:
+    if ndjson:
+        content = "\n".join(json.dumps(row) for row in rows).encode()
+        headers = {"Content-Type": "application/x-ndjson"}
+    else:
+        content = json.dumps(rows).encode()
+        headers = {"Content-Type": "application/json"}
+
+    started = time.perf_counter()
+    response = await client.post("/events/bulk", content=content, headers=headers, timeout=None)
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    result = response.json()
+    if result["inserted"] != len(rows):
+        raise SystemExit(f"bulk import rejected rows: {result['errors'][:5]}")
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Events imported per method")
+    parser.add_argument("--per-row-rows", type=int, default=None,
+                        help="Events for the per-row baseline (default: --rows)")
+    parser.add_argument("--json-array", action="store_true", help="Also time a JSON array body")
+    args = parser.parse_args()
+
+    use_temp_database("bulk_import")
+
+    from app.database import create_tables_async
+    from app.main import app
+    quiet_logs()
+    await create_tables_async()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/venues", json={
+            "name": "Bench Arena", "address": "1 Main St", "city": "Springfield",
+            "country": "USA", "capacity": 50000,
+        })
+        response.raise_for_status()
+        venue_id = response.json()["id"]
+
+        baseline_rows = args.per_row_rows or args.rows
+        results = {"per-row POST": (baseline_rows, await per_row(client, event_rows(baseline_rows, venue_id)))}
+        results["bulk NDJSON"] = (args.rows, await bulk(client, event_rows(args.rows, venue_id, 10 ** 6), True))
+        if args.json_array:
+            results["bulk JSON"] = (args.rows, await bulk(client, event_rows(args.rows, venue_id, 2 * 10 ** 6), False))
+
+    print(f"\n{'method':<16}{'rows':>10}{'seconds':>10}{'rows/sec':>12}")
+    for method, (rows, seconds) in results.items():
+        print(f"{method:<16}{rows:>10}{seconds:>10.2f}{rows / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""
+Shared helpers for the benchmark scripts
+
+Benchmarks run against a throwaway SQLite database, so the database URL
+must be configured before any `app` module is imported.
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+# Initial availability_count of every ticket type created by seed_bookings()
+TICKET_STOCK = 10 ** 7
+
+
+def use_temp_database(name: str) -> str:
+    """
+    Point DATABASE_URL at a fresh SQLite file and return its path
+
+    Must be called before importing anything from the `app` package.
+    """
+    path = os.path.join(tempfile.mkdtemp(prefix="ticket-bench-"), f"{name}.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """Summarize request latencies (seconds) as milliseconds"""
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+async def run_clients(
+    client: httpx.AsyncClient,
+    paths: Sequence[str],
+    concurrency: int,
+    requests_per_client: int,
+) -> List[float]:
+    """
+    Run `concurrency` clients, each issuing `requests_per_client` GETs
+
+    Clients cycle through `paths` starting at different offsets so the mix
+    of routes in flight stays even. Returns per-request latencies in seconds.
+    """
+    latencies: List[float] = []
+
+    async def client_loop(offset: int):
+        for i in range(requests_per_client):
+            path = paths[(offset + i) % len(paths)]
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    await asyncio.gather(*(client_loop(n) for n in range(concurrency)))
+    return latencies
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]):
+    """Print benchmark summaries as an aligned table"""
+    columns = ["requests", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    print(f"\n{title}")
+    print(f"{'':<12}" + "".join(f"{c:>12}" for c in columns))
+    for label, summary in rows.items():
+        print(f"{label:<12}" + "".join(f"{summary[c]:>12}" for c in columns))
+
+
+def seed_bookings(
+    expired: int,
+    live: int,
+    confirmed: int,
+    events: int,
+    seed_value: int = 11,
+    code: Optional[Callable[[int], str]] = None,
+):
+    """
+    Insert events, ticket types and bookings with matching counters
+
+    Bookings are `expired` pending holds, `live` pending holds expiring in
+    an hour and `confirmed` bookings, spread randomly over `events`
+    events (event e is held at venue e % 10 + 1). `code(n)` gives the
+    confirmation code of the n-th booking (default "HOLD" + n).
+    """
+    from sqlalchemy import insert, update
+    from app.aggregates import rebuild_booking_aggregates
+    from app.database import create_tables, engine
+    from app.models import Booking, BookingStatus, Event, TicketType, Venue
+
+    create_tables()
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Venue), [
+            {"name": f"Venue {v}", "address": f"{v} Main St", "city": "Springfield",
+             "country": "USA", "capacity": 10 ** 6}
+            for v in range(1, 11)
+        ])
+        conn.execute(insert(TicketType), [
+            {"name": name, "price": price, "availability_count": TICKET_STOCK}
+            for name, price in [("VIP", 300.0), ("Standard", 100.0), ("Economy", 50.0)]
+        ])
+        conn.execute(insert(Event), [
+            {"name": f"Event {e}", "event_date": now + timedelta(days=30), "duration_minutes": 120,
+             "venue_id": e % 10 + 1, "max_capacity": 10 ** 6}
+            for e in range(1, events + 1)
+        ])
+
+        kinds = [("expired", expired), ("live", live), ("confirmed", confirmed)]
+        rows = []
+        for kind, count in kinds:
+            for _ in range(count):
+                n = len(rows)
+                event_id = rng.randint(1, events)
+                quantity = rng.randint(1, 4)
+                rows.append({
+                    "event_id": event_id,
+                    "venue_id": event_id % 10 + 1,
+                    "ticket_type_id": rng.randint(1, 3),
+                    "customer_name": f"Customer {n}",
+                    "customer_email": f"customer{n}@example.com",
+                    "quantity": quantity,
+                    "total_amount": quantity * 100.0,
+                    "status": BookingStatus.CONFIRMED if kind == "confirmed" else BookingStatus.PENDING,
+                    "confirmation_code": code(n) if code else f"HOLD{n:012d}",
+                    "booking_date": now - timedelta(minutes=30),
+                    "expires_at": {
+                        "expired": now - timedelta(seconds=rng.randint(1, 1800)),
+                        "live": now + timedelta(hours=1),
+                        "confirmed": None,
+                    }[kind],
+                })
+        for offset in range(0, len(rows), 50000):
+            conn.execute(insert(Booking), rows[offset:offset + 50000])
+
+        # Seats held by every pending/confirmed booking are claimed on both counters
+        rebuild_booking_aggregates(conn)
+        held = Counter()
+        for row in rows:
+            held[row["ticket_type_id"]] += row["quantity"]
+        for ticket_type_id, seats in held.items():
+            conn.execute(update(TicketType).where(TicketType.id == ticket_type_id)
+                         .values(availability_count=TICKET_STOCK - seats))
+
+
+def inventory_mismatches() -> int:
+    """Compare seat counters and confirmed aggregates with the bookings table"""
+    from sqlalchemy import func, select
+    from app.database import engine
+    from app.models import Booking, BookingStatus, Event, EventBookingStats, TicketType
+
+    reserved = Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
+    confirmed = Booking.status == BookingStatus.CONFIRMED
+    with engine.connect() as conn:
+        held_by_event = dict(conn.execute(
+            select(Booking.event_id, func.sum(Booking.quantity)).where(reserved).group_by(Booking.event_id)).all())
+        held_by_type = dict(conn.execute(
+            select(Booking.ticket_type_id, func.sum(Booking.quantity)).where(reserved)
+            .group_by(Booking.ticket_type_id)).all())
+        confirmed_by_event = {row[0]: tuple(row[1:]) for row in conn.execute(
+            select(Booking.event_id, func.sum(Booking.quantity), func.count(Booking.id))
+            .where(confirmed).group_by(Booking.event_id))}
+
+        mismatches = 0
+        for event_id, booked_count in conn.execute(select(Event.id, Event.booked_count)):
+            mismatches += booked_count != held_by_event.get(event_id, 0)
+        for ticket_type_id, available in conn.execute(select(TicketType.id, TicketType.availability_count)):
+            mismatches += available != TICKET_STOCK - held_by_type.get(ticket_type_id, 0)
+        for event_id, *counters in conn.execute(select(
+                EventBookingStats.event_id, EventBookingStats.confirmed_tickets, EventBookingStats.confirmed_bookings)):
+            mismatches += tuple(counters) != confirmed_by_event.get(event_id, (0, 0))
+    return mismatches
+
+
+def quiet_logs():
+    """Silence per-request INFO logging so it does not dominate timings"""
+    import logging
+    for name in ("app", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
@@ -0,0 +1,118 @@
+"""
+Confirmation code benchmark: issuance rate and lookup by code
+
+1. Issuance: --workers generators (one per simulated worker process)
+   issue --codes codes concurrently from blocks reserved in the shared
+   code_sequences row. Reports codes/sec, how many blocks (database
+   round trips) were needed, and checks every code is unique and
+   passes its check digit.
+2. Baseline: random codes checked for collisions with one SELECT each,
+   the retry-on-collision approach the generator replaces.
+3. Lookup: GET /bookings/by-code/{code} over --bookings seeded bookings,
+   for existing codes and for codes with a mistyped digit (rejected by
+   the check digit without a query).
+
+Usage:
+    python -m benchmarks.confirmation_codes --codes 200000 --workers 4
+"""
+
+import argparse
+import asyncio
+import random
+import secrets
+import time
+
+import httpx
+
+from .common import quiet_logs, seed_bookings, summarize, use_temp_database
+
+
+async def issue(workers: int, codes: int, block_size: int) -> None:
+    from app.codes import ConfirmationCodeGenerator, normalize_code, reserve_code_block
+
+    generators = [ConfirmationCodeGenerator(reserve_code_block, block_size) for _ in range(workers)]
+    issued = []
+
+    async def worker(generator):
+        for _ in range(codes // workers):
+            issued.append(await generator.next_code())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(generator) for generator in generators))
+    elapsed = time.perf_counter() - started
+
+    blocks = sum(generator.blocks for generator in generators)
+    invalid = sum(normalize_code(code) != code for code in issued)
+    print(f"issued {len(issued)} codes in {elapsed:.2f}s ({len(issued) / elapsed:,.0f} codes/s) "
+          f"from {blocks} blocks of {block_size}; {len(issued) - len(set(issued))} duplicates, "
+          f"{invalid} failing their check digit")
+
+
+async def issue_with_collision_checks(count: int) -> None:
+    from sqlalchemy import select
+    from app.database import AsyncSessionLocal
+    from app.models import Booking
+
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for _ in range(count):
+            while True:
+                code = "BK" + secrets.token_hex(5).upper()
+                if await db.scalar(select(Booking.id).where(Booking.confirmation_code == code)) is None:
+                    break
+    elapsed = time.perf_counter() - started
+    print(f"random + SELECT per code: {count} codes in {elapsed:.2f}s ({count / elapsed:,.0f} codes/s)")
+
+
+async def lookups(app, codes, count: int) -> None:
+    from app.codes import CROCKFORD_ALPHABET
+
+    rng = random.Random(5)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for label, mistype in (("existing codes", False), ("mistyped codes", True)):
+            latencies = []
+            for _ in range(count):
+                code = rng.choice(codes)
+                if mistype:
+                    position = rng.randrange(2, len(code))
+                    replacement = rng.choice(CROCKFORD_ALPHABET.replace(code[position], ""))
+                    code = code[:position] + replacement + code[position + 1:]
+                started = time.perf_counter()
+                response = await client.get(f"/bookings/by-code/{code}")
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == (404 if mistype else 200), response.text
+            summary = summarize(latencies)
+            print(f"lookup {label:<15} p50 {summary['p50_ms']}ms  p95 {summary['p95_ms']}ms  p99 {summary['p99_ms']}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--codes", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--block-size", type=int, default=1000)
+    parser.add_argument("--baseline", type=int, default=5_000, help="Codes issued with a collision check each")
+    parser.add_argument("--bookings", type=int, default=200_000, help="Bookings seeded for lookups")
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    use_temp_database("confirmation_codes")
+    from app.codes import encode_code
+
+    # Seeded bookings use the sequence numbers from the top of the range
+    # so they never collide with the codes issued below
+    top = (1 << 40) - 1
+    started = time.perf_counter()
+    seed_bookings(0, 0, args.bookings, 50, code=lambda n: encode_code(top - n))
+    print(f"\nSeeded {args.bookings} bookings in {time.perf_counter() - started:.1f}s")
+
+    from app.main import app
+    quiet_logs()
+
+    await issue(args.workers, args.codes, args.block_size)
+    await issue_with_collision_checks(args.baseline)
+    await lookups(app, [encode_code(top - n) for n in range(args.bookings)], args.lookups)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+Synthetic data generator for benchmarks
+
+Creates a SQLite database with the app's schema and fills it with the
+ticket_booking dataset of the repository's seeding package: venues,
+ticket types, events and bookings shaped like a real box office, from a
+few thousand rows up to tens of millions of bookings (see
+seeding/ticket_booking.py for the shape of the data). Given the same
+spec the same seed always produces the same rows, so results from
+different commits can be compared.
+
+A <database>.json file next to the database records the spec it was
+generated from.
+
+The seeding package lives at the repository root, next to this app, so
+run from the app directory with the root on PYTHONPATH:
+
+    PYTHONPATH=.. python -m benchmarks.datagen --database /tmp/bench.db --bookings 10000000
+"""
+
+import argparse
+import json
+import os
+import time
+from dataclasses import asdict
+from typing import Callable, Optional
+
+from seeding import LoadStats, seed
+from seeding.ticket_booking import Spec as DatasetSpec
+
+
+def spec_path(database: str) -> str:
+    return f"{database}.json"
+
+
+def read_spec(database: str) -> Optional[DatasetSpec]:
+    """Spec a database was generated from, if it was generated by this module"""
+    try:
+        with open(spec_path(database)) as f:
+            return DatasetSpec(**json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def generate(spec: DatasetSpec, progress: Optional[Callable[[LoadStats], None]] = None) -> LoadStats:
+    """Create the schema in the configured (empty) database and seed it"""
+    from app.database import create_tables, engine
+
+    create_tables()
+    return seed(engine, "ticket_booking", spec, progress=progress)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", required=True, help="SQLite file to create")
+    defaults = DatasetSpec()
+    for field, value in asdict(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, default=value)
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        parser.error(f"{args.database} already exists")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.database)}"
+    spec = DatasetSpec(**{field: getattr(args, field) for field in asdict(defaults)})
+
+    started = time.perf_counter()
+
+    def progress(stats: LoadStats):
+        print(f"\r{stats.total_rows:>12,} rows  {stats.total_rows / stats.insert_seconds:>10,.0f}/s",
+              end="", flush=True)
+
+    generate(spec, progress)
+    with open(spec_path(args.database), "w") as f:
+        json.dump(asdict(spec), f, indent=2)
+    print(f"\nGenerated {args.database} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
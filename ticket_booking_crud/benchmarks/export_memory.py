@@ -0,0 +1,94 @@
+"""
+Export benchmark: streaming export vs one big paginated call
+
+Seeds one event with --bookings bookings and fetches them all, first via
+GET /events/{id}/bookings?limit=N (ORM objects + response model) and then
+via the streaming NDJSON and CSV exports. Reports wall time and the peak
+Python heap (tracemalloc) during each request.
+
+httpx's ASGITransport buffers the whole response body, so every peak
+includes roughly one copy of the output (MiB_out); the export's own
+working set is what remains and does not grow with --bookings.
+
+Usage:
+    python -m benchmarks.export_memory --bookings 200000
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import httpx
+
+from .common import quiet_logs, use_temp_database
+
+
+def seed(bookings: int):
+    """Insert one venue, ticket type and event with `bookings` bookings"""
+    from sqlalchemy import insert
+    from app.database import create_tables, engine
+    from app.models import Booking, BookingStatus, Event, TicketType, Venue
+
+    create_tables()
+    start = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(Venue), [{"name": "Stadium", "address": "1 Main St", "city": "Springfield",
+                                      "country": "USA", "capacity": 10 ** 6}])
+        conn.execute(insert(TicketType), [{"name": "Standard", "price": 50.0, "availability_count": 10 ** 9}])
+        conn.execute(insert(Event), [{"name": "Final", "event_date": start + timedelta(days=30),
+                                      "duration_minutes": 120, "venue_id": 1, "max_capacity": 10 ** 6,
+                                      "booked_count": bookings * 2}])
+        batch = 50000
+        for offset in range(0, bookings, batch):
+            conn.execute(insert(Booking), [
+                {"event_id": 1, "venue_id": 1, "ticket_type_id": 1,
+                 "customer_name": f"Customer {n}", "customer_email": f"customer{n}@example.com",
+                 "quantity": 2, "total_amount": 100.0, "status": BookingStatus.CONFIRMED,
+                 "confirmation_code": f"SEED{n:012d}", "booking_date": start - timedelta(seconds=n)}
+                for n in range(offset, min(offset + batch, bookings))
+            ])
+
+
+async def measure(client: httpx.AsyncClient, url: str):
+    """Return (seconds, peak MiB, bytes received) for streaming `url`"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    received = 0
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, received
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=200_000)
+    args = parser.parse_args()
+
+    use_temp_database("export_memory")
+    seed(args.bookings)
+
+    from app.main import app
+    quiet_logs()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        urls = {
+            "list limit=N": f"/events/1/bookings?limit={args.bookings}",
+            "export ndjson": "/events/1/bookings/export",
+            "export csv": "/events/1/bookings/export?format=csv",
+        }
+        print(f"\n{'method':<16}{'seconds':>10}{'peak_MiB':>10}{'MiB_out':>10}")
+        for label, url in urls.items():
+            seconds, peak, received = await measure(client, url)
+            print(f"{label:<16}{seconds:>10.2f}{peak:>10.1f}{received / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,357 @@
+"""
+Load-test harness: scripted scenarios with JSON results
+
+Runs each scenario for --duration seconds, with --concurrency clients
+issuing requests back to back. The first --warmup seconds are not
+measured. Reports throughput, latency percentiles (overall and per
+operation) and status codes. Results are written as JSON together with
+the git commit and the dataset, so runs can be compared commit to
+commit (--compare).
+
+Scenarios:
+    browse          event lists, event and venue details, availability
+    on_sale_burst   every client books seats for the same few events
+                    as they go on sale (409 sold out counts as handled)
+    revenue_report  revenue reports for every period, booking stats and
+                    per-event revenue
+
+Drivers:
+    asgi    calls the app in this process (no network or server
+            overhead; startup and shutdown handlers run as in a server)
+    http    sends requests to --base-url, e.g. uvicorn or gunicorn
+            with several workers
+
+The asgi driver serves --database, which is generated first if it does
+not exist yet (see benchmarks.datagen). Without --database it generates
+a throwaway dataset from the size options. The http driver uses whatever
+database the server was started with. It assumes that database was made
+by benchmarks.datagen, with ids 1..N and the last --on-sale-events events
+still on sale. on_sale_burst adds bookings, so rerunning it on the same
+database sells those events further out.
+
+Usage (from the app directory; the repository root on PYTHONPATH makes
+the shared seeding package importable):
+    export PYTHONPATH=..
+
+    # In process, on a throwaway dataset of 1M bookings
+    python -m benchmarks.harness --output results.json
+
+    # Against a server, on a generated dataset
+    python -m benchmarks.datagen --database /tmp/bench.db --bookings 10000000
+    DATABASE_URL=sqlite:////tmp/bench.db uvicorn app.main:app --workers 4
+    python -m benchmarks.harness --driver http --base-url http://127.0.0.1:8000 --output after.json
+
+    # Compare with an earlier run (exits 1 on a regression above --threshold %)
+    python -m benchmarks.harness --database /tmp/bench.db --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from .common import quiet_logs, summarize, use_temp_database
+from .datagen import DatasetSpec, generate, read_spec, spec_path
+
+# Periods of /reports/revenue (app.stats.REPORT_PERIODS; the http driver does not import the app)
+REPORT_PERIODS = ["day", "week", "month", "year", "all"]
+
+
+@dataclass
+class Dataset:
+    """What the scenarios need to know about the database being served"""
+    venues: int
+    events: int
+    ticket_types: int
+    on_sale_events: int
+
+    def popular_event(self, rng: random.Random) -> int:
+        # Same skew as the generator: low ids get most of the traffic
+        regular = self.events - self.on_sale_events
+        return int(regular * rng.random() ** 3) + 1
+
+
+@dataclass
+class Call:
+    """One request of a scenario; `operation` groups latencies in the results"""
+    operation: str
+    method: str
+    url: str
+    json: Optional[dict] = None
+
+
+@dataclass
+class Scenario(ABC):
+    """A weighted mix of calls, run by `concurrency` clients"""
+    name: str
+    concurrency: int
+    handled: frozenset = field(default_factory=frozenset)
+
+    async def setup(self, client: httpx.AsyncClient, dataset: Dataset):
+        pass
+
+    @abstractmethod
+    def next_call(self, rng: random.Random, dataset: Dataset) -> Call:
+        """The next call one client makes"""
+
+
+class Browse(Scenario):
+    def next_call(self, rng: random.Random, dataset: Dataset) -> Call:
+        event_id = dataset.popular_event(rng)
+        venue_id = rng.randint(1, dataset.venues)
+        roll = rng.random()
+        if roll < 0.2:
+            return Call("list events", "GET", f"/events?status_filter=active&limit={rng.choice([20, 50])}")
+        if roll < 0.3:
+            return Call("list venue events", "GET", f"/venues/{venue_id}/events?limit=20")
+        if roll < 0.5:
+            return Call("event", "GET", f"/events/{event_id}")
+        if roll < 0.6:
+            return Call("event with venue", "GET", f"/events/{event_id}?include=venue")
+        if roll < 0.9:
+            return Call("available tickets", "GET", f"/events/{event_id}/available-tickets")
+        return Call("venue", "GET", f"/venues/{venue_id}")
+
+
+class OnSaleBurst(Scenario):
+    venues: Dict[int, int]
+
+    async def setup(self, client: httpx.AsyncClient, dataset: Dataset):
+        self.venues = {}
+        for event_id in range(dataset.events - dataset.on_sale_events + 1, dataset.events + 1):
+            response = await client.get(f"/events/{event_id}")
+            response.raise_for_status()
+            self.venues[event_id] = response.json()["venue_id"]
+
+    def next_call(self, rng: random.Random, dataset: Dataset) -> Call:
+        event_id = rng.choice(list(self.venues))
+        customer = rng.randrange(10 ** 9)
+        hold = rng.random() < 0.5
+        return Call("hold" if hold else "book", "POST", "/bookings", {
+            "event_id": event_id,
+            "venue_id": self.venues[event_id],
+            "ticket_type_id": rng.randint(1, dataset.ticket_types),
+            "customer_name": f"Fan {customer}",
+            "customer_email": f"fan{customer}@example.com",
+            "quantity": rng.choice([1, 2, 2, 4]),
+            "hold": hold,
+        })
+
+
+class RevenueReport(Scenario):
+    def next_call(self, rng: random.Random, dataset: Dataset) -> Call:
+        roll = rng.random()
+        if roll < 0.5:
+            period = rng.choice(REPORT_PERIODS)
+            return Call(f"revenue {period}", "GET", f"/reports/revenue?period={period}")
+        if roll < 0.7:
+            return Call("booking stats", "GET", "/stats/bookings")
+        return Call("event revenue", "GET", f"/events/{dataset.popular_event(rng)}/revenue")
+
+
+SCENARIOS = {
+    "browse": Browse("browse", concurrency=32),
+    "on_sale_burst": OnSaleBurst("on_sale_burst", concurrency=64, handled=frozenset({409})),
+    "revenue_report": RevenueReport("revenue_report", concurrency=8),
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    dataset: Dataset,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int,
+) -> dict:
+    """Run a scenario for warmup + duration seconds and summarize the measured part"""
+    await scenario.setup(client, dataset)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    errors: Counter = Counter()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def client_loop(n: int):
+        rng = random.Random(seed * 1000 + n)
+        while True:
+            call = scenario.next_call(rng, dataset)
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                return
+            try:
+                response = await client.request(call.method, call.url, json=call.json)
+            except httpx.HTTPError as e:
+                if sent >= measure_from:
+                    errors[type(e).__name__] += 1
+                continue
+            if sent < measure_from:
+                continue
+            latencies[call.operation].append(time.perf_counter() - sent)
+            statuses[response.status_code] += 1
+            if response.status_code >= 400 and response.status_code not in scenario.handled:
+                errors[f"HTTP {response.status_code}"] += 1
+
+    await asyncio.gather(*(client_loop(n) for n in range(concurrency)))
+    every = [latency for values in latencies.values() for latency in values]
+    return {
+        "concurrency": concurrency,
+        "duration_s": duration,
+        "throughput_rps": round(len(every) / duration, 1),
+        "errors": sum(errors.values()),
+        "error_kinds": dict(errors),
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        "latency": summarize(every),
+        "operations": {operation: summarize(values) for operation, values in sorted(latencies.items())},
+    }
+
+
+async def discover_dataset(client: httpx.AsyncClient, on_sale_events: int) -> Dataset:
+    response = await client.get("/stats/system")
+    response.raise_for_status()
+    stats = response.json()
+    if not stats["total_events"] > on_sale_events:
+        raise SystemExit("The database has no events to benchmark; generate one with benchmarks.datagen")
+    return Dataset(stats["total_venues"], stats["total_events"], stats["total_ticket_types"], on_sale_events)
+
+
+def git_revision() -> dict:
+    def git(*args) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Print changes against a baseline run; True if any scenario regressed beyond threshold %"""
+    regressed = False
+    print(f"\nCompared with {baseline['meta']['git'].get('commit') or 'baseline'}")
+    print(f"{'scenario':<18}{'rps':>12}{'change':>10}{'p95_ms':>12}{'change':>10}")
+    for name, current in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        rps_change = (current["throughput_rps"] / before["throughput_rps"] - 1) * 100 if before["throughput_rps"] else 0.0
+        p95_change = (current["latency"]["p95_ms"] / before["latency"]["p95_ms"] - 1) * 100 if before["latency"]["p95_ms"] else 0.0
+        flag = rps_change < -threshold or p95_change > threshold
+        regressed |= flag
+        print(f"{name:<18}{current['throughput_rps']:>12}{rps_change:>+9.1f}%"
+              f"{current['latency']['p95_ms']:>12}{p95_change:>+9.1f}%{'  REGRESSION' if flag else ''}")
+    return regressed
+
+
+def print_results(results: dict):
+    for name, result in results["scenarios"].items():
+        latency = result["latency"]
+        print(f"\n{name}: {result['throughput_rps']} req/s at concurrency {result['concurrency']}, "
+              f"{result['errors']} errors, statuses {result['statuses']}")
+        print(f"{'operation':<22}" + "".join(f"{c:>10}" for c in latency))
+        for operation, summary in [("all", latency), *result["operations"].items()]:
+            print(f"{operation:<22}" + "".join(f"{summary[c]:>10}" for c in summary))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--driver", choices=["asgi", "http"], default="asgi")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server of the http driver")
+    parser.add_argument("--database", help="SQLite database for the asgi driver (generated if missing)")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Repeatable; default all")
+    parser.add_argument("--concurrency", type=int, help="Clients per scenario (default per scenario)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Results JSON of an earlier run")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    defaults = DatasetSpec()
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=value, help="Dataset to generate")
+    args = parser.parse_args()
+
+    spec = DatasetSpec(**{name: getattr(args, name) for name in asdict(defaults)})
+    if args.driver == "asgi":
+        if args.database:
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.database)}"
+        else:
+            args.database = use_temp_database("harness")
+        existing = read_spec(args.database)
+        if existing is not None:
+            spec = existing
+        elif os.path.exists(args.database):
+            parser.error(f"{args.database} was not made by benchmarks.datagen")
+        else:
+            started = time.perf_counter()
+            generate(spec)
+            with open(spec_path(args.database), "w") as f:
+                json.dump(asdict(spec), f, indent=2)
+            print(f"Generated {spec.bookings} bookings in {time.perf_counter() - started:.1f}s")
+
+        from app.main import app
+        # The access log would measure log I/O rather than the API
+        quiet_logs()
+        await app.router.startup()
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+    else:
+        app = None
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits)
+
+    try:
+        dataset = await discover_dataset(client, spec.on_sale_events)
+        results = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "git": git_revision(),
+                "driver": args.driver,
+                "base_url": args.base_url if args.driver == "http" else None,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "dataset": asdict(dataset),
+                "spec": asdict(spec) if args.driver == "asgi" else None,
+                "duration_s": args.duration,
+                "warmup_s": args.warmup,
+            },
+            "scenarios": {},
+        }
+        for name in args.scenario or SCENARIOS:
+            scenario = SCENARIOS[name]
+            print(f"Running {name}...", flush=True)
+            results["scenarios"][name] = await run_scenario(
+                client, scenario, dataset, args.concurrency or scenario.concurrency,
+                args.duration, args.warmup, spec.seed,
+            )
+    finally:
+        await client.aclose()
+        if app is not None:
+            await app.router.shutdown()
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""
+Seat hold expiry benchmark and consistency check
+
+Seeds --holds expired pending holds (plus live holds and confirmed
+bookings that must survive untouched) across --events events, then:
+
+1. Times release_expired_holds() cancelling every expired hold in
+   batches of --batch-size.
+2. Races the sweeper against confirmations: --race holds expire while
+   clients try to confirm them through the API and the sweeper runs in
+   a loop. Each hold must end up either confirmed or released.
+3. Checks that events.booked_count, ticket_types.availability_count and
+   the confirmed aggregates match what the bookings table says.
+
+Exits with status 1 if any counter is off.
+
+Usage:
+    python -m benchmarks.hold_expiry --holds 100000 --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import httpx
+
+from .common import inventory_mismatches, quiet_logs, seed_bookings, use_temp_database
+
+
+async def race(app, count: int, events: int) -> dict:
+    """Hold seats that expire after HOLD_TTL_SECONDS, then confirm them while the sweeper runs"""
+    from app.database import AsyncSessionLocal
+    from app.holds import release_expired_holds
+
+    outcomes = {"confirmed": 0, "expired": 0, "released": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        holds = []
+        for i in range(count):
+            event_id = i % events + 1
+            response = await client.post("/bookings", json={
+                "event_id": event_id, "venue_id": event_id % 10 + 1, "ticket_type_id": i % 3 + 1,
+                "customer_name": "Racer", "customer_email": f"racer{i}@example.com", "quantity": 2, "hold": True,
+            })
+            response.raise_for_status()
+            holds.append((response.json()["id"], time.monotonic()))
+
+        done = asyncio.Event()
+
+        async def sweeper():
+            while not done.is_set():
+                async with AsyncSessionLocal() as db:
+                    outcomes["released"] += await release_expired_holds(db, batch_size=50)
+                await asyncio.sleep(0.01)
+
+        async def confirm(booking_id: int, held_at: float):
+            # Half of the attempts land after the hold expired
+            await asyncio.sleep(max(0.0, held_at + random.uniform(0.5, 2.5) - time.monotonic()))
+            response = await client.post(f"/bookings/{booking_id}/confirm")
+            outcomes["confirmed" if response.status_code == 200 else "expired"] += 1
+
+        sweeping = asyncio.create_task(sweeper())
+        await asyncio.gather(*(confirm(booking_id, held_at) for booking_id, held_at in holds))
+        await asyncio.sleep(0.1)
+        done.set()
+        await sweeping
+        async with AsyncSessionLocal() as db:
+            outcomes["released"] += await release_expired_holds(db)
+    return outcomes
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holds", type=int, default=100_000, help="Expired holds to release")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--race", type=int, default=500, help="Holds confirmed while they expire")
+    args = parser.parse_args()
+
+    use_temp_database("hold_expiry")
+    # Holds made during the race expire while they are being confirmed
+    os.environ["HOLD_TTL_SECONDS"] = "2"
+    live = confirmed = args.holds // 10
+    started = time.perf_counter()
+    seed_bookings(args.holds, live, confirmed, args.events)
+    print(f"\nSeeded {args.holds} expired holds, {live} live holds and {confirmed} confirmed bookings "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    from app.database import AsyncSessionLocal
+    from app.holds import release_expired_holds
+    from app.main import app
+    quiet_logs()
+
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        released = await release_expired_holds(db, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - started
+    print(f"released {released} holds in {elapsed:.2f}s ({released / elapsed:.0f} holds/s, "
+          f"batches of {args.batch_size})")
+
+    outcomes = await race(app, args.race, args.events)
+    print(f"race over {args.race} holds: {outcomes['confirmed']} confirmed, "
+          f"{outcomes['expired']} rejected as expired, {outcomes['released']} released by the sweeper")
+
+    mismatches = inventory_mismatches()
+    lost = args.race - outcomes["confirmed"] - outcomes["released"]
+    if mismatches or lost or outcomes["expired"] != outcomes["released"]:
+        print(f"FAIL: {mismatches} counters disagree with bookings, {lost} holds neither confirmed nor released")
+        sys.exit(1)
+    print("inventory and confirmed aggregates match the bookings table")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
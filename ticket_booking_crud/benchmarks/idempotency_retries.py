@@ -0,0 +1,118 @@
+"""
+Idempotency-Key check: concurrent retries of the same POST
+
+1. --clients concurrent POST /bookings attempts share one Idempotency-Key
+   (a client retrying a request that timed out, several times over):
+   exactly one booking must be created and every attempt must get the
+   same response.
+2. --keys distinct keys, each sent --retries times concurrently, in
+   --rounds rounds: one booking per key, replay latency vs first attempt.
+3. Replays after the in-process cache is cleared are answered from the
+   idempotency_keys table; a key reused for a different body gets 422.
+4. Baseline: the same retries without the header create a booking each.
+
+Exits with status 1 when any check fails.
+
+Usage:
+    python -m benchmarks.idempotency_retries --clients 50 --keys 200 --retries 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from .common import quiet_logs, seed_bookings, summarize, use_temp_database
+
+BOOKING = {"event_id": 1, "venue_id": 2, "ticket_type_id": 1, "customer_name": "Retry", "customer_email": "retry@example.com",
+           "quantity": 1}
+
+
+def count_bookings() -> int:
+    from sqlalchemy import func, select
+    from app.database import engine
+    from app.models import Booking
+
+    with engine.connect() as conn:
+        return conn.scalar(select(func.count(Booking.id)))
+
+
+async def post(client, key, body=BOOKING):
+    headers = {"Idempotency-Key": key} if key else {}
+    started = time.perf_counter()
+    response = await client.post("/bookings", json=body, headers=headers)
+    return response, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent attempts sharing one key")
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--retries", type=int, default=5, help="Concurrent attempts per key")
+    parser.add_argument("--rounds", type=int, default=3, help="Times every key is retried")
+    args = parser.parse_args()
+
+    use_temp_database("idempotency_retries")
+    seed_bookings(0, 0, 0, 1)
+
+    from app.idempotency import idempotency_store
+    from app.main import app
+    quiet_logs()
+
+    failures = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/")
+        before = count_bookings()
+
+        results = await asyncio.gather(*(post(client, "one-key") for _ in range(args.clients)))
+        created = count_bookings() - before
+        bodies = {response.text for response, _ in results}
+        replayed = sum(response.headers.get("idempotent-replayed") == "true" for response, _ in results)
+        print(f"{args.clients} concurrent attempts, one key: {created} booking(s) created, "
+              f"{len(bodies)} distinct response(s), {replayed} replayed")
+        if created != 1 or len(bodies) != 1 or {r.status_code for r, _ in results} != {201}:
+            failures.append("concurrent attempts with one key")
+
+        before = count_bookings()
+        first, replays = [], []
+        for round_number in range(args.rounds):
+            results = await asyncio.gather(*(
+                post(client, f"key-{n}") for n in range(args.keys) for _ in range(args.retries)
+            ))
+            for response, latency in results:
+                replayed = response.headers.get("idempotent-replayed") == "true"
+                (replays if replayed else first).append(latency)
+        created = count_bookings() - before
+        print(f"{args.keys} keys x {args.retries} attempts x {args.rounds} rounds: {created} bookings created")
+        print(f"  first attempt p50 {summarize(first)['p50_ms']}ms  p99 {summarize(first)['p99_ms']}ms")
+        print(f"  replay        p50 {summarize(replays)['p50_ms']}ms  p99 {summarize(replays)['p99_ms']}ms")
+        if created != args.keys:
+            failures.append("one booking per key")
+
+        idempotency_store.cache.clear()
+        response, latency = await post(client, "key-0")
+        print(f"replay from the table: {response.status_code}, replayed={response.headers.get('idempotent-replayed')}"
+              f" in {latency * 1000:.1f}ms")
+        if response.headers.get("idempotent-replayed") != "true":
+            failures.append("replay from the table")
+
+        response, _ = await post(client, "key-0", {**BOOKING, "quantity": 2})
+        print(f"key reused for a different body: {response.status_code}")
+        if response.status_code != 422:
+            failures.append("key reuse rejected")
+
+        before = count_bookings()
+        await asyncio.gather(*(post(client, None) for _ in range(args.retries)))
+        print(f"baseline, {args.retries} retries without a key: {count_bookings() - before} bookings created")
+
+    if failures:
+        print(f"FAIL: {', '.join(failures)}")
+        sys.exit(1)
+    print("all idempotency checks passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
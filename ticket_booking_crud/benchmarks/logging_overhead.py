@@ -0,0 +1,138 @@
+"""
+Logging overhead micro-benchmark
+
+1. Per call: the cost of one log statement when its level is disabled
+   (f-string vs %-style arguments) and when it is enabled (synchronous
+   StreamHandler vs the queue handler from app.logs).
+2. Per request: --requests GET /health calls driven straight through
+   the ASGI app (no HTTP client in the way), with
+   - access log off (baseline),
+   - access log on, JSON written synchronously by the request,
+   - access log on, JSON written through the queue listener,
+   - the same with the route sampled at --sample-rate.
+   Each configuration writes once to a temporary file and once to a
+   slow sink whose writes block for --sink-latency-us (a pipe or log
+   collector applying back-pressure). Reports microseconds per request.
+
+The queue does not make formatting cheaper, it moves it and the write
+off the request path: with a fast file both cost about the same, with a
+blocking sink only the synchronous handler makes requests wait.
+
+Usage:
+    python -m benchmarks.logging_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+import timeit
+
+from .common import use_temp_database
+
+
+class SlowStream:
+    """Text stream whose writes block like a congested pipe"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def write(self, text: str):
+        time.sleep(self.latency)
+
+    def flush(self):
+        pass
+
+
+def per_call(stream, calls: int):
+    from app.logs import JsonFormatter, setup_logging, stop_logging
+
+    logger = logging.getLogger("bench.calls")
+    booking = {"id": 42, "confirmation_code": "BK7D2QX9MAF"}
+
+    def run(statement) -> float:
+        return timeit.timeit(statement, number=calls) / calls * 1e6
+
+    logger.setLevel(logging.WARNING)
+    print(f"\n{'disabled, f-string':<34}{run(lambda: logger.info(f'Created booking: {booking}')):>8.2f} us/call")
+    print(f"{'disabled, %-style':<34}{run(lambda: logger.info('Created booking: %s', booking)):>8.2f} us/call")
+
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    logging.getLogger().handlers[:] = [handler]
+    print(f"{'enabled, synchronous JSON':<34}{run(lambda: logger.info('Created booking: %s', booking)):>8.2f} us/call")
+
+    setup_logging(stream=stream)
+    print(f"{'enabled, queue handler':<34}{run(lambda: logger.info('Created booking: %s', booking)):>8.2f} us/call")
+    stop_logging()
+
+
+async def per_request(app, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/health", "raw_path": b"/health", "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--sink-latency-us", type=float, default=200)
+    args = parser.parse_args()
+
+    use_temp_database("logging_overhead")
+    from app import logs
+    from app.main import app
+
+    stream = tempfile.TemporaryFile("w")
+    per_call(stream, args.calls)
+
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("app.access").setLevel(logging.INFO)
+    rates = logs.ACCESS_LOG_ROUTE_SAMPLE_RATES
+    rates.clear()
+
+    sinks = {"file": stream, "slow sink": SlowStream(args.sink_latency_us / 1e6)}
+    results = {}
+    for sink_name, sink in sinks.items():
+        logging.getLogger("app.access").setLevel(logging.WARNING)
+        results[("access log off", sink_name)] = await per_request(app, args.requests)
+        logging.getLogger("app.access").setLevel(logging.INFO)
+
+        rates["GET /health"] = 1.0
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logs.JsonFormatter())
+        logging.getLogger().handlers[:] = [handler]
+        results[("synchronous JSON", sink_name)] = await per_request(app, args.requests)
+
+        logs.setup_logging(stream=sink)
+        results[("queue listener", sink_name)] = await per_request(app, args.requests)
+        rates["GET /health"] = args.sample_rate
+        results[(f"queue, sampled {args.sample_rate:g}", sink_name)] = await per_request(app, args.requests)
+        logs.stop_logging()
+
+    print(f"\n{'GET /health, us/request':<34}" + "".join(f"{name:>12}" for name in sinks))
+    for label in dict.fromkeys(label for label, _ in results):
+        print(f"{label:<34}" + "".join(f"{results[(label, name)]:>12.1f}" for name in sinks))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Pagination benchmark: OFFSET vs keyset cursors at increasing page depth
+
+Seeds --pages * --page-size events and times GET /events at several page
+numbers, once with `skip` (OFFSET) and once with the equivalent cursor.
+OFFSET latency grows with depth; cursor latency should stay flat.
+
+Usage:
+    python -m benchmarks.pagination_depth --pages 10000 --page-size 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from .common import quiet_logs, use_temp_database
+
+
+def seed(total_events: int, venues: int = 10):
+    """Insert `total_events` events spread over `venues` venues"""
+    from sqlalchemy import insert
+    from app.database import SessionLocal, create_tables
+    from app.models import Event, Venue
+
+    create_tables()
+    start = datetime.now() + timedelta(days=1)
+    with SessionLocal() as db:
+        db.execute(insert(Venue), [
+            {"name": f"Venue {v}", "address": f"{v} Main St", "city": "Springfield",
+             "country": "USA", "capacity": 50000}
+            for v in range(1, venues + 1)
+        ])
+        batch = 50000
+        for offset in range(0, total_events, batch):
+            db.execute(insert(Event), [
+                {"name": f"Event {n}", "event_date": start + timedelta(minutes=n // 3),
+                 "duration_minutes": 120, "venue_id": n % venues + 1, "max_capacity": 40000,
+                 "status": "active"}
+                for n in range(offset, min(offset + batch, total_events))
+            ])
+        db.commit()
+
+
+def cursor_for_offset(offset: int) -> str:
+    """Build the cursor a client would hold after reading `offset` rows"""
+    from sqlalchemy import select
+    from app.database import SessionLocal
+    from app.models import Event
+    from app.pagination import encode_cursor
+
+    with SessionLocal() as db:
+        row = db.execute(
+            select(Event.event_date, Event.id)
+            .order_by(Event.event_date, Event.id)
+            .offset(offset - 1)
+            .limit(1)
+        ).one()
+    return encode_cursor(list(row))
+
+
+async def time_request(client: httpx.AsyncClient, url: str, repeat: int) -> float:
+    """Median latency of `repeat` requests to `url`, in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(url)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return statistics.median(samples) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=10000, help="Deepest page to fetch")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20, help="Requests per measurement")
+    args = parser.parse_args()
+
+    use_temp_database("pagination_depth")
+    seed(args.pages * args.page_size)
+
+    from app.main import app
+    quiet_logs()
+
+    depths = sorted({1, 10, 100, 1000, args.pages} & set(range(1, args.pages + 1)))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n{'page':>8}{'offset_ms':>12}{'cursor_ms':>12}")
+        for page in depths:
+            skip = (page - 1) * args.page_size
+            offset_url = f"/events?skip={skip}&limit={args.page_size}"
+            cursor_url = f"/events?limit={args.page_size}"
+            if skip:
+                cursor_url += f"&cursor={cursor_for_offset(skip)}"
+            offset_ms = await time_request(client, offset_url, args.repeat)
+            cursor_ms = await time_request(client, cursor_url, args.repeat)
+            print(f"{page:>8}{offset_ms:>12.2f}{cursor_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
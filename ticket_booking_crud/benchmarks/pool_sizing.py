@@ -0,0 +1,66 @@
+"""
+Pool sizing benchmark: checkout waits vs pool size under concurrency
+
+Runs --clients concurrent tasks that each hold a connection for a query
+plus --hold-ms of simulated work, once per pool size, and reports
+throughput with the checkout wait histogram collected by the
+instrumented pool. Pick the smallest pool whose p95 wait stays near 0.
+
+Usage:
+    python -m benchmarks.pool_sizing --clients 50 --sizes 2,5,10,20,50
+"""
+
+import argparse
+import asyncio
+import time
+
+from .common import use_temp_database
+
+
+async def run(url: str, pool_size: int, clients: int, iterations: int, hold: float) -> dict:
+    from sqlalchemy import text
+    from app.database import create_async_db_engine
+    from app.pool import pool_stats
+
+    engine = create_async_db_engine(url, pool_size=pool_size, max_overflow=0, pool_timeout=60)
+
+    async def client():
+        for _ in range(iterations):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await asyncio.sleep(hold)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    stats = pool_stats(engine.pool)
+    await engine.dispose()
+
+    wait = stats["checkout_wait_seconds"]
+    return {
+        "ops_per_sec": clients * iterations / elapsed,
+        "mean_wait_ms": wait["sum"] / wait["count"] * 1000,
+        "p95_wait_ms": None if wait["p95_upper_bound"] is None else wait["p95_upper_bound"] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20, help="Checkouts per client")
+    parser.add_argument("--hold-ms", type=float, default=5.0, help="Time each checkout holds its connection")
+    parser.add_argument("--sizes", default="2,5,10,20,50", help="Comma-separated pool sizes")
+    args = parser.parse_args()
+
+    use_temp_database("pool_sizing")
+    from app.database import ASYNC_DATABASE_URL
+
+    print(f"\n{'pool_size':>10}{'ops/sec':>12}{'mean_wait_ms':>14}{'p95_wait_ms<=':>15}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        result = await run(ASYNC_DATABASE_URL, size, args.clients, args.iterations, args.hold_ms / 1000)
+        p95 = "inf" if result["p95_wait_ms"] is None else f"{result['p95_wait_ms']:g}"
+        print(f"{size:>10}{result['ops_per_sec']:>12.0f}{result['mean_wait_ms']:>14.2f}{p95:>15}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
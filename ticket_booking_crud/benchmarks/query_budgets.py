@@ -0,0 +1,135 @@
+"""
+Query budget check: SQL statements per request for every budgeted route
+
+Runs with QUERY_BUDGET_ENFORCE on, so a route that executes more
+statements than its query_budget() fails with a 500. Requests each GET
+route that declares a budget (plus POST /bookings) against seeded data
+and prints the statement count and DB time reported in Server-Timing
+next to the budget.
+
+Requests the ?include= expansions of events and venues with small and
+large limits and checks their statement count does not grow with the
+number of related rows returned.
+
+Then mounts a deliberately N+1 route (one SELECT per event of a venue)
+to show the detector: the repeated statement is logged as a warning and
+the over-budget request is rejected.
+
+Exits with status 1 when a budgeted route exceeds its budget or an
+include's statement count depends on its result size. The same checks
+run in pytest (tests/test_query_budgets.py) with the
+enforce_query_budgets fixture.
+
+Usage:
+    python -m benchmarks.query_budgets --bookings 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import sys
+
+import httpx
+
+from .common import quiet_logs, seed_bookings, use_temp_database
+
+INCLUDES = [
+    "/events/1?include=venue",
+    "/events/1?include=ticket_types",
+    "/events/1?include=bookings",
+    "/events/1?include=venue,ticket_types,bookings",
+    "/venues/2?include=events",
+]
+
+# Values for path parameters of the budgeted routes; "code" is filled in
+# from the booking created by POST /bookings, which is declared before
+# the lookup by code
+PATH_PARAMS = {"venue_id": 2, "event_id": 1}
+
+
+def budgeted_routes(app):
+    """(method, path, budget) of every route declaring a query budget"""
+    for route in app.routes:
+        for dependency in getattr(route, "dependencies", []):
+            budget = getattr(dependency.dependency, "max_queries", None)
+            if budget is not None:
+                yield sorted(route.methods)[0], route.path, budget
+
+
+def parse_timing(header: str):
+    match = re.search(r'db;dur=([\d.]+);desc="(\d+) queries"', header or "")
+    return (int(match.group(2)), float(match.group(1))) if match else (None, None)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=20_000)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["QUERY_BUDGET_ENFORCE"] = "1"
+    use_temp_database("query_budgets")
+    seed_bookings(0, 0, args.bookings, args.events)
+
+    from fastapi import Depends
+    from sqlalchemy import select
+    from app.database import get_db
+    from app.main import app
+    from app.models import Event
+    from app.query_stats import query_budget
+    quiet_logs()
+    logging.getLogger("app.query_stats").setLevel(logging.WARNING)
+
+    over_budget = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.get("/")
+        print(f"\n{'route':<40}{'queries':>8}{'budget':>8}{'db ms':>9}")
+        for method, path, budget in budgeted_routes(app):
+            url = path.format(**PATH_PARAMS)
+            if method == "POST":
+                response = await client.post(url, json={
+                    "event_id": 1, "venue_id": 2, "ticket_type_id": 1,
+                    "customer_name": "Budget", "customer_email": "budget@example.com",
+                })
+                PATH_PARAMS["code"] = response.json()["confirmation_code"]
+            else:
+                response = await client.get(url)
+            queries, duration = parse_timing(response.headers.get("server-timing"))
+            print(f"{method + ' ' + path:<40}{queries if queries is not None else '-':>8}{budget:>8}"
+                  f"{duration if duration is not None else '-':>9}")
+            if response.status_code >= 500:
+                over_budget.append(f"{method} {path}: {response.json()['detail']}")
+
+        print(f"\n{'include':<48}{'rows':>6}{'queries':>9}{'rows':>6}{'queries':>9}")
+        for url in INCLUDES:
+            counts, sizes = [], []
+            for limit in (1, 1000):
+                response = await client.get(f"{url}&limit={limit}")
+                body = response.json()
+                sizes.append(sum(len(value) for value in body.values() if isinstance(value, list)))
+                counts.append(parse_timing(response.headers.get("server-timing"))[0])
+            print(f"{url:<48}{sizes[0]:>6}{counts[0]:>9}{sizes[1]:>6}{counts[1]:>9}")
+            if response.status_code >= 500 or counts[0] != counts[1]:
+                over_budget.append(f"GET {url}: {counts[0]} vs {counts[1]} queries")
+
+        @app.get("/bench/venues/{venue_id}/events-n-plus-one", dependencies=[Depends(query_budget(2))])
+        async def events_one_by_one(venue_id: int, db=Depends(get_db)):
+            ids = (await db.scalars(select(Event.id).where(Event.venue_id == venue_id))).all()
+            return [(await db.get(Event, event_id)).name for event_id in ids]
+
+        for venue_id in (1, 2):
+            response = await client.get(f"/bench/venues/{venue_id}/events-n-plus-one")
+            print(f"\ndeliberate N+1 for venue {venue_id}: {response.status_code} "
+                  f"{response.json() if response.status_code >= 500 else response.headers.get('server-timing')}")
+
+    if over_budget:
+        print("FAIL:\n  " + "\n  ".join(over_budget))
+        sys.exit(1)
+    print("every budgeted route is within its query budget; includes run a fixed number of queries")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
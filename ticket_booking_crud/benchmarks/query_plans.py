@@ -0,0 +1,203 @@
+"""
+Query-plan regression check for the hot queries of the booking schema
+
+Seeds a SQLite database (1M bookings by default), runs
+EXPLAIN QUERY PLAN for each hot query issued by the API and fails when a
+query regresses to a full table scan, or has to sort a whole filtered
+set in a temp B-tree just to return one page.
+
+Exit status is 1 when any plan regresses. tests/test_query_plans.py runs
+the same checks on a smaller dataset under pytest; this script checks
+them at full size:
+
+    python -m benchmarks.query_plans --bookings 1000000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects import sqlite
+
+from .common import use_temp_database
+
+# "SCAN bookings" (or "SCAN TABLE bookings" on older SQLite) with no index
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+$")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE FOR (ORDER|GROUP) BY")
+
+
+def seed(bookings: int, events: int, venues: int, seed_value: int = 7, engine=None):
+    """
+    Insert venues, ticket types, events and `bookings` bookings
+
+    Into `engine`, which must have the schema already, or by default
+    into the app's database after creating the schema.
+    """
+    from sqlalchemy import insert
+    from app.database import create_tables
+    from app.models import Booking, BookingStatus, Event, TicketType, Venue
+
+    if engine is None:
+        from app.database import engine
+
+        create_tables()
+    rng = random.Random(seed_value)
+    start = datetime.now() + timedelta(days=1)
+    statuses = [BookingStatus.CONFIRMED] * 8 + [BookingStatus.PENDING, BookingStatus.CANCELLED]
+    with engine.begin() as conn:
+        conn.execute(insert(Venue), [
+            {"name": f"Venue {v}", "address": f"{v} Main St", "city": f"City {v % 50}",
+             "country": "USA", "capacity": 100000}
+            for v in range(1, venues + 1)
+        ])
+        conn.execute(insert(TicketType), [
+            {"name": name, "price": price, "availability_count": 10 ** 9}
+            for name, price in [("VIP", 300.0), ("Standard", 100.0), ("Economy", 50.0)]
+        ])
+        conn.execute(insert(Event), [
+            {"name": f"Event {e}", "event_date": start + timedelta(hours=e), "duration_minutes": 120,
+             "venue_id": e % venues + 1, "max_capacity": 100000,
+             "status": "active" if e % 10 else "completed"}
+            for e in range(1, events + 1)
+        ])
+        batch = 50000
+        for offset in range(0, bookings, batch):
+            rows = []
+            for n in range(offset, min(offset + batch, bookings)):
+                event_id = rng.randint(1, events)
+                quantity = rng.randint(1, 4)
+                status = rng.choice(statuses)
+                rows.append({
+                    "event_id": event_id,
+                    "venue_id": event_id % venues + 1,
+                    "ticket_type_id": rng.randint(1, 3),
+                    "customer_name": f"Customer {n}",
+                    "customer_email": f"customer{n % 200000}@example.com",
+                    "quantity": quantity,
+                    "total_amount": quantity * 100.0,
+                    "status": status,
+                    "confirmation_code": f"SEED{n:012d}",
+                    "booking_date": start - timedelta(minutes=n),
+                    "expires_at": start + timedelta(minutes=n % 600) if status == BookingStatus.PENDING else None,
+                })
+            conn.execute(insert(Booking), rows)
+
+
+def hot_queries():
+    """
+    (name, statement, allow_sort) for each query the API issues per request
+
+    allow_sort marks queries whose filtered result is small enough that
+    sorting it in a temp B-tree is acceptable.
+    """
+    from app.models import Booking, BookingStatus, Event, Venue
+
+    when = datetime.now() + timedelta(days=30)
+    page = 100
+    return [
+        ("list events", select(Event).order_by(Event.event_date, Event.id).limit(page), False),
+        ("list events, cursor",
+         select(Event).where(tuple_(Event.event_date, Event.id) > tuple_(when, 10))
+         .order_by(Event.event_date, Event.id).limit(page), False),
+        ("list events by venue",
+         select(Event).where(Event.venue_id == 7).order_by(Event.event_date, Event.id).limit(page), False),
+        ("list events by status",
+         select(Event).where(Event.status == "active").order_by(Event.event_date, Event.id).limit(page), False),
+        ("list events by status, cursor",
+         select(Event).where(Event.status == "active", tuple_(Event.event_date, Event.id) > tuple_(when, 10))
+         .order_by(Event.event_date, Event.id).limit(page), False),
+        ("count events at venue", select(func.count(Event.id)).where(Event.venue_id == 7), False),
+        ("list venues, cursor", select(Venue).where(Venue.id > 100).order_by(Venue.id).limit(page), False),
+        ("event bookings page",
+         select(Booking).where(Booking.event_id == 42).order_by(Booking.id).limit(page), False),
+        ("event bookings page, cursor",
+         select(Booking).where(Booking.event_id == 42, Booking.id > 500000).order_by(Booking.id).limit(page), False),
+        ("confirmed tickets for event",
+         select(func.sum(Booking.quantity)).where(
+             Booking.event_id == 42, Booking.status == BookingStatus.CONFIRMED), False),
+        ("confirmed tickets for venue",
+         select(func.sum(Booking.quantity)).where(
+             Booking.venue_id == 7, Booking.status == BookingStatus.CONFIRMED), False),
+        ("bookings by ticket type",
+         select(func.count(Booking.id)).where(Booking.ticket_type_id == 2), False),
+        ("bookings by customer email",
+         select(Booking).where(Booking.customer_email == "customer123@example.com"), False),
+        ("confirmed bookings in date range",
+         select(func.sum(Booking.total_amount)).where(
+             Booking.status == BookingStatus.CONFIRMED,
+             Booking.booking_date >= when - timedelta(days=7), Booking.booking_date < when), False),
+        ("search bookings by date range",
+         select(Booking).where(Booking.booking_date >= when - timedelta(days=7), Booking.booking_date < when)
+         .order_by(Booking.booking_date, Booking.id).limit(page), False),
+        ("search bookings by status",
+         select(Booking).where(Booking.status == BookingStatus.CANCELLED).order_by(Booking.id).limit(page), False),
+        ("search bookings by status, cursor",
+         select(Booking).where(Booking.status == BookingStatus.CANCELLED, Booking.id > 500000)
+         .order_by(Booking.id).limit(page), False),
+        ("search bookings by ticket type",
+         select(Booking).where(Booking.ticket_type_id == 2).order_by(Booking.id).limit(page), False),
+        ("resolve event name prefix for search",
+         select(Event.id, func.lower(Event.name))
+         .where(func.lower(Event.name) >= "rock", func.lower(Event.name) < "rock\uffff")
+         .order_by(func.lower(Event.name)).limit(501), False),
+        ("booking by confirmation code",
+         select(Booking).where(Booking.confirmation_code == "SEED000000012345"), False),
+        ("expired holds batch",
+         select(Booking.id).where(Booking.status == BookingStatus.PENDING, Booking.expires_at <= when)
+         .order_by(Booking.expires_at).limit(1000), False),
+    ]
+
+
+def explain(conn, statement) -> list:
+    """Return the plan detail lines for a statement"""
+    sql = str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def check_plans(conn) -> int:
+    """Print each plan and return the number of regressions"""
+    failures = 0
+    for name, statement, allow_sort in hot_queries():
+        plan = explain(conn, statement)
+        problems = [line for line in plan if FULL_SCAN.match(line)]
+        if not allow_sort:
+            problems += [line for line in plan if TEMP_SORT.search(line)]
+        failures += bool(problems)
+        print(f"{'FAIL' if problems else 'ok':<5}{name}")
+        for line in plan:
+            print(f"       {line}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=1_000_000)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--venues", type=int, default=500)
+    parser.add_argument("--analyze", action="store_true", help="Run ANALYZE before explaining")
+    args = parser.parse_args()
+
+    use_temp_database("query_plans")
+    started = time.perf_counter()
+    seed(args.bookings, args.events, args.venues)
+    print(f"Seeded {args.bookings} bookings in {time.perf_counter() - started:.1f}s\n")
+
+    from app.database import engine
+
+    with engine.connect() as conn:
+        if args.analyze:
+            conn.exec_driver_sql("ANALYZE")
+        failures = check_plans(conn)
+
+    if failures:
+        print(f"\n{failures} hot queries regressed to a full scan or sort")
+        sys.exit(1)
+    print("\nAll hot queries use an index")
+
+
+if __name__ == "__main__":
+    main()
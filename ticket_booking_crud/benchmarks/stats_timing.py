@@ -0,0 +1,64 @@
+"""
+Statistics benchmark: dashboard endpoints on a large bookings table
+
+Seeds --bookings bookings (10M by default - expect several minutes of
+seeding) and times /stats/system, /stats/bookings and /reports/revenue
+for each period, once cold (cache cleared) and once warm (cached).
+
+Usage:
+    python -m benchmarks.stats_timing --bookings 10000000
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from .common import quiet_logs, use_temp_database
+from .query_plans import seed
+
+
+async def timed_get(client: httpx.AsyncClient, url: str) -> float:
+    started = time.perf_counter()
+    response = await client.get(url)
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    return elapsed * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, default=10_000_000)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--venues", type=int, default=500)
+    args = parser.parse_args()
+
+    use_temp_database("stats_timing")
+    started = time.perf_counter()
+    seed(args.bookings, args.events, args.venues)
+
+    from app.aggregates import rebuild_booking_aggregates
+    from app.database import engine
+    with engine.begin() as conn:
+        rebuild_booking_aggregates(conn)
+    print(f"Seeded {args.bookings} bookings in {time.perf_counter() - started:.1f}s")
+
+    from app.cache import stats_cache
+    from app.main import app
+    from app.stats import REPORT_PERIODS
+    quiet_logs()
+
+    urls = ["/stats/system", "/stats/bookings"] + [f"/reports/revenue?period={p}" for p in REPORT_PERIODS]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"\n{'endpoint':<32}{'cold_ms':>12}{'warm_ms':>12}")
+        for url in urls:
+            stats_cache.clear()
+            cold = await timed_get(client, url)
+            warm = await timed_get(client, url)
+            print(f"{url:<32}{cold:>12.1f}{warm:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
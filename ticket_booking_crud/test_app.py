@@ -9,9 +9,12 @@ os.environ["DATABASE_URL"] = "sqlite:///./ticket_booking.db"
 os.environ["SECRET_KEY"] = "development-secret-key"
 
 # Import and run the app
+from app.database import create_tables
 from app.main import app
 
 if __name__ == "__main__":
+    # Migrations run once here, not in every (reloaded) worker
+    create_tables()
     print("🚀 Starting FastAPI Ticket Booking System...")
     print("📝 Documentation available at: http://127.0.0.1:8000/docs")
     print("🔄 ReDoc available at: http://127.0.0.1:8000/redoc")
@@ -0,0 +1,123 @@
+"""
+Shared fixtures for the ticket booking tests
+
+The app's engines are created when `app.database` is imported, so the
+test database is configured here, before any test module imports the
+app. Every test runs against one migrated SQLite file and creates the
+venues, events and ticket types it needs, so tests do not depend on
+each other's rows.
+"""
+
+import asyncio
+import itertools
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='ticket-tests-'), 'test.db')}"
+# Background loops would race the tests; tests run the sweeps themselves
+os.environ.setdefault("HOLD_SWEEP_INTERVAL", "0")
+os.environ.setdefault("IDEMPOTENCY_PURGE_INTERVAL", "0")
+os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+
+_names = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One loop for the whole session, like a server worker's"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(event_loop):
+    """Run a coroutine to completion on the session loop"""
+    return event_loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.database import create_tables
+    from app.main import app
+
+    create_tables()
+    return app
+
+
+@pytest.fixture
+def client(app, run):
+    """httpx client calling the app in-process on the session loop"""
+    import httpx
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    yield client
+    run(client.aclose())
+
+
+@pytest.fixture
+def enforce_query_budgets(monkeypatch):
+    """Fail requests over their route's query_budget() with a 500, as CI runs do"""
+    monkeypatch.setattr("app.query_stats.QUERY_BUDGET_ENFORCE", True)
+
+
+@pytest.fixture
+def make_event(client, run):
+    """
+    Create a venue, a ticket type and an event
+
+    The venue and the event get unique names; the ticket type is a
+    "Standard" one, as the API only serves the fixed ticket type names.
+    Returns their ids and the event name. There is no single-row ticket
+    type route, so the ticket type is inserted directly and the cached
+    ticket type names are dropped, as the API's writes do.
+    """
+    from sqlalchemy import insert
+
+    from app.database import engine
+    from app.models import TicketType
+    from app.search import invalidate_lookups
+
+    def make(capacity: int = 100, tickets: int = 1000, price: float = 50.0, name: str = None) -> dict:
+        name = name or f"Test Event {next(_names)}"
+        with engine.begin() as conn:
+            ticket_type_id = conn.execute(
+                insert(TicketType)
+                .values(name="Standard", price=price, availability_count=tickets)
+                .returning(TicketType.id)
+            ).scalar_one()
+        invalidate_lookups("ticket_types")
+
+        async def create():
+            venue = await client.post("/venues", json={
+                "name": f"{name} Hall", "address": "1 Test St", "city": "Testville", "capacity": capacity,
+            })
+            assert venue.status_code == 201, venue.text
+            event = await client.post("/events", json={
+                "name": name, "event_date": (datetime.utcnow() + timedelta(days=30)).isoformat(),
+                "venue_id": venue.json()["id"], "max_capacity": capacity,
+            })
+            assert event.status_code == 201, event.text
+            return {
+                "name": name,
+                "venue_id": venue.json()["id"],
+                "ticket_type_id": ticket_type_id,
+                "event_id": event.json()["id"],
+            }
+        return run(create())
+    return make
+
+
+@pytest.fixture
+def book(client, run):
+    """POST /bookings for an event made by make_event and return the response"""
+    def book(event: dict, quantity: int = 1, hold: bool = False, email: str = "fan@example.com"):
+        return run(client.post("/bookings", json={
+            "event_id": event["event_id"], "venue_id": event["venue_id"],
+            "ticket_type_id": event["ticket_type_id"], "customer_name": "Test Fan",
+            "customer_email": email, "quantity": quantity, "hold": hold,
+        }))
+    return book
@@ -0,0 +1,93 @@
+"""
+Incrementally maintained booking aggregates against a full rebuild
+
+Every write path adjusts event_booking_stats, venue_booking_stats and
+events.booked_count in its own transaction. After a mix of bookings,
+confirmations, cancellations and deletions the counters must equal what
+rebuild_booking_aggregates() computes from the bookings table.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.aggregates import rebuild_booking_aggregates
+from app.database import engine
+from app.models import Event, EventBookingStats, VenueBookingStats
+
+
+def aggregates(conn, venue_id: int) -> dict:
+    """Aggregates of a venue and its events, leaving out all-zero stats rows"""
+    def counters(row):
+        return (row.confirmed_tickets, round(row.confirmed_revenue, 2), row.confirmed_bookings)
+
+    events = conn.execute(
+        select(EventBookingStats.__table__).where(EventBookingStats.venue_id == venue_id)
+    )
+    venue = conn.execute(
+        select(VenueBookingStats.__table__).where(VenueBookingStats.venue_id == venue_id)
+    )
+    return {
+        "events": {row.event_id: counters(row) for row in events if any(counters(row))},
+        "venue": [counters(row) for row in venue if any(counters(row))],
+        "booked_count": dict(conn.execute(
+            select(Event.id, Event.booked_count).where(Event.venue_id == venue_id)
+        ).all()),
+    }
+
+
+def assert_matches_rebuild(venue_id: int):
+    # The rebuild is rolled back, so the incremental counters stay under test
+    with engine.connect() as conn:
+        incremental = aggregates(conn, venue_id)
+        rebuild_booking_aggregates(conn)
+        rebuilt = aggregates(conn, venue_id)
+        conn.rollback()
+    assert incremental == rebuilt
+    return incremental
+
+
+def test_aggregates_match_a_rebuild_after_confirm_cancel_and_delete(client, run, make_event, book):
+    first = make_event(capacity=100, price=40.0)
+    venue_id = first["venue_id"]
+    created = run(client.post("/events", json={
+        "name": f"{first['name']} Matinee", "event_date": (datetime.utcnow() + timedelta(days=31)).isoformat(),
+        "venue_id": venue_id, "max_capacity": 100,
+    }))
+    assert created.status_code == 201, created.text
+    second = {**first, "event_id": created.json()["id"]}
+    doomed = {**first, "event_id": run(client.post("/events", json={
+        "name": f"{first['name']} Late Show", "event_date": (datetime.utcnow() + timedelta(days=32)).isoformat(),
+        "venue_id": venue_id, "max_capacity": 100,
+    })).json()["id"]}
+
+    confirmed = [book(first, quantity=2).json()["id"], book(first, quantity=3).json()["id"],
+                 book(second, quantity=4).json()["id"]]
+    holds = [book(first, quantity=1, hold=True).json()["id"], book(second, quantity=5, hold=True).json()["id"]]
+    assert_matches_rebuild(venue_id)
+
+    # Confirm one hold, cancel a confirmed booking and the other hold
+    assert run(client.post(f"/bookings/{holds[0]}/confirm")).status_code == 200
+    cancelled = run(client.patch("/bookings/status", json={
+        "status": "cancelled", "booking_ids": [confirmed[1], holds[1]],
+    }))
+    assert cancelled.status_code == 200, cancelled.text
+    assert assert_matches_rebuild(venue_id)["events"] == {
+        first["event_id"]: (3, 120.0, 2),
+        second["event_id"]: (4, 160.0, 1),
+    }
+
+    # Cancel everything of the second event, then delete an event whose bookings were all cancelled
+    assert run(client.patch("/bookings/status", json={
+        "status": "cancelled", "event_id": second["event_id"],
+    })).status_code == 200
+    doomed_booking = book(doomed, quantity=2).json()["id"]
+    assert run(client.patch("/bookings/status", json={
+        "status": "cancelled", "booking_ids": [doomed_booking],
+    })).status_code == 200
+    assert run(client.delete(f"/events/{doomed['event_id']}")).status_code == 200
+
+    final = assert_matches_rebuild(venue_id)
+    assert final["events"] == {first["event_id"]: (3, 120.0, 2)}
+    assert final["venue"] == [(3, 120.0, 2)]
+    assert final["booked_count"] == {first["event_id"]: 3, second["event_id"]: 0}
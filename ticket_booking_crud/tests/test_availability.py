@@ -0,0 +1,74 @@
+"""GET /events/{event_id}/available-tickets: concurrent misses share one load"""
+
+import asyncio
+
+import pytest
+
+import app.main
+from app.availability import SingleFlightCache, availability_cache, load_availability
+
+
+@pytest.fixture
+def counted_loads(monkeypatch):
+    """Count load_availability calls; each takes long enough for requests to pile up"""
+    calls = []
+
+    async def slow_load(session_factory, event_id):
+        calls.append(event_id)
+        await asyncio.sleep(0.05)
+        return await load_availability(session_factory, event_id)
+
+    monkeypatch.setattr(app.main, "load_availability", slow_load)
+    return calls
+
+
+def fetch_all(client, run, event_id: int, requests: int) -> list:
+    async def gather():
+        return await asyncio.gather(*[
+            client.get(f"/events/{event_id}/available-tickets") for _ in range(requests)
+        ])
+    return run(gather())
+
+
+def test_concurrent_misses_load_availability_once(client, run, make_event, counted_loads):
+    event = make_event(capacity=10)
+    availability_cache.invalidate(event["event_id"])
+
+    responses = fetch_all(client, run, event["event_id"], 50)
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.text for response in responses}) == 1
+    assert counted_loads == [event["event_id"]]
+    assert responses[0].json()["available_tickets"] == 10
+
+
+def test_booking_drops_the_cached_availability(client, run, make_event, book, counted_loads):
+    event = make_event(capacity=10)
+    availability_cache.invalidate(event["event_id"])
+    fetch_all(client, run, event["event_id"], 5)
+    assert book(event, quantity=3).status_code == 201
+
+    responses = fetch_all(client, run, event["event_id"], 20)
+    assert {response.json()["available_tickets"] for response in responses} == {7}
+    assert counted_loads == [event["event_id"]] * 2
+
+
+def test_failed_load_is_shared_and_then_retried(run):
+    cache = SingleFlightCache(ttl=60, max_staleness=60)
+    attempts = []
+
+    async def load():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("database unavailable")
+        return "fresh"
+
+    async def gather():
+        return await asyncio.gather(*[cache.get("key", load) for _ in range(10)], return_exceptions=True)
+
+    results = run(gather())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(attempts) == 1
+    # Failures are not cached
+    assert run(gather()) == ["fresh"] * 10
+    assert len(attempts) == 2
@@ -0,0 +1,65 @@
+"""POST /bookings under contention: events and ticket types never oversell"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import engine
+from app.models import Booking, BookingStatus, Event, TicketType
+
+
+def inventory(event: dict) -> dict:
+    """Counters of an event and its ticket type, and the seats its live bookings hold"""
+    with engine.connect() as conn:
+        return {
+            "booked_count": conn.scalar(select(Event.booked_count).where(Event.id == event["event_id"])),
+            "seats": conn.scalar(
+                select(func.coalesce(func.sum(Booking.quantity), 0)).where(
+                    Booking.event_id == event["event_id"],
+                    Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+                )
+            ),
+            "available": conn.scalar(
+                select(TicketType.availability_count).where(TicketType.id == event["ticket_type_id"])
+            ),
+        }
+
+
+def rush(client, run, event: dict, requests: int, quantity: int) -> list:
+    """Send `requests` concurrent bookings and return their status codes"""
+    async def gather():
+        return await asyncio.gather(*[
+            client.post("/bookings", json={
+                "event_id": event["event_id"], "venue_id": event["venue_id"],
+                "ticket_type_id": event["ticket_type_id"], "customer_name": f"Rush Fan {n}",
+                "customer_email": f"rush{n}@example.com", "quantity": quantity,
+            })
+            for n in range(requests)
+        ])
+    return [response.status_code for response in run(gather())]
+
+
+@pytest.mark.parametrize("quantity", [1, 3])
+def test_concurrent_bookings_never_oversell_the_event(client, run, make_event, quantity):
+    capacity, tickets = 10, 1000
+    event = make_event(capacity=capacity, tickets=tickets)
+
+    statuses = rush(client, run, event, requests=25, quantity=quantity)
+    sold = capacity // quantity
+    assert statuses.count(201) == sold
+    assert statuses.count(409) == 25 - sold
+    assert inventory(event) == {
+        "booked_count": sold * quantity,
+        "seats": sold * quantity,
+        "available": tickets - sold * quantity,
+    }
+
+
+def test_concurrent_bookings_never_oversell_the_ticket_type(client, run, make_event):
+    event = make_event(capacity=100, tickets=7)
+
+    statuses = rush(client, run, event, requests=20, quantity=1)
+    assert statuses.count(201) == 7
+    assert statuses.count(409) == 13
+    assert inventory(event) == {"booked_count": 7, "seats": 7, "available": 0}
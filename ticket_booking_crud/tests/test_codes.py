@@ -0,0 +1,82 @@
+"""Confirmation codes: uniqueness across workers, check digits and lookups by code"""
+
+import asyncio
+
+from sqlalchemy import update
+
+from app.codes import (
+    CODE_PREFIX, CROCKFORD_ALPHABET, ConfirmationCodeGenerator, encode_code, normalize_code,
+    reserve_code_block, scramble, unscramble,
+)
+from app.database import engine
+from app.models import Booking
+from tests.test_query_budgets import query_count
+
+
+def single_digit_typos(code: str):
+    """Every code that differs from `code` in exactly one digit"""
+    for position in range(len(CODE_PREFIX), len(code)):
+        for char in CROCKFORD_ALPHABET:
+            if char != code[position]:
+                yield code[:position] + char + code[position + 1:]
+
+
+def test_codes_are_unique_across_blocks_and_workers(app, run):
+    # Small blocks so every worker reserves several, interleaved with the others
+    workers = [ConfirmationCodeGenerator(reserve_code_block, block_size=7) for _ in range(4)]
+
+    async def issue(generator, count):
+        return [await generator.next_code() for _ in range(count)]
+
+    async def gather():
+        return await asyncio.gather(*[issue(worker, 50) for worker in workers for _ in range(2)])
+
+    batches = run(gather())
+    codes = [code for batch in batches for code in batch]
+    assert len(codes) == 400
+    assert len(set(codes)) == len(codes)
+    assert all(worker.blocks >= 100 // 7 for worker in workers)
+
+
+def test_scramble_is_a_permutation():
+    numbers = [*range(5000), *(1 << shift for shift in range(40)), (1 << 40) - 1]
+    assert [unscramble(scramble(number)) for number in numbers] == numbers
+    assert len({encode_code(number) for number in numbers}) == len(set(numbers))
+
+
+def test_every_code_passes_its_check_digit():
+    for number in [*range(2000), (1 << 40) - 1]:
+        code = encode_code(number)
+        assert code.startswith(CODE_PREFIX) and len(code) == 11
+        assert normalize_code(code) == code
+        assert normalize_code(f"{code[:6]}-{code[6:]}".lower()) == code
+
+
+def test_single_digit_typos_fail_the_check_digit():
+    for number in (0, 1, 123456, (1 << 40) - 1):
+        code = encode_code(number)
+        assert [typo for typo in single_digit_typos(code) if normalize_code(typo)] == []
+
+
+def test_mistyped_code_is_rejected_without_a_query(client, run, make_event, book):
+    code = book(make_event()).json()["confirmation_code"]
+    found = run(client.get(f"/bookings/by-code/{code.lower()}"))
+    assert found.status_code == 200
+    assert query_count(found) == 1
+
+    typo = next(single_digit_typos(code))
+    rejected = run(client.get(f"/bookings/by-code/{typo}"))
+    assert rejected.status_code == 404
+    assert query_count(rejected) == 0
+
+
+def test_legacy_hex_codes_still_resolve(client, run, make_event, book):
+    booking = book(make_event()).json()
+    legacy = f"BK{booking['id']:010X}"
+    with engine.begin() as conn:
+        conn.execute(update(Booking).where(Booking.id == booking["id"]).values(confirmation_code=legacy))
+
+    for typed in (legacy, legacy.lower(), f"{legacy[:7]}-{legacy[7:]}"):
+        found = run(client.get(f"/bookings/by-code/{typed}"))
+        assert found.status_code == 200, typed
+        assert found.json()["id"] == booking["id"]
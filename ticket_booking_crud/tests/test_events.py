@@ -0,0 +1,49 @@
+"""Event date validation: future dates on writes, any date on reads"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.database import engine
+from app.models import Event
+
+
+def move_event(event_id: int, days: int):
+    """Move an event's date directly in the database, as time passing would"""
+    with engine.begin() as conn:
+        conn.execute(
+            update(Event).where(Event.id == event_id)
+            .values(event_date=datetime.utcnow() + timedelta(days=days))
+        )
+
+
+def test_past_event_is_still_served(client, run, make_event):
+    event = make_event()
+    move_event(event["event_id"], -3)
+
+    response = run(client.get(f"/events/{event['event_id']}"))
+    assert response.status_code == 200, response.text
+    assert run(client.get(f"/events/{event['event_id']}?include=venue")).status_code == 200
+    listed = run(client.get(f"/venues/{event['venue_id']}/events"))
+    assert listed.status_code == 200, listed.text
+    assert [e["id"] for e in listed.json()] == [event["event_id"]]
+
+
+def test_create_rejects_a_past_date(client, run, make_event):
+    venue_id = make_event()["venue_id"]
+    response = run(client.post("/events", json={
+        "name": "Yesterday's Show", "event_date": (datetime.utcnow() - timedelta(days=1)).isoformat(),
+        "venue_id": venue_id, "max_capacity": 10,
+    }))
+    assert response.status_code == 422
+
+
+def test_update_rejects_a_past_date_but_not_other_fields_of_a_past_event(client, run, make_event):
+    event = make_event()
+    past = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    assert run(client.put(f"/events/{event['event_id']}", json={"event_date": past})).status_code == 422
+
+    move_event(event["event_id"], -3)
+    response = run(client.put(f"/events/{event['event_id']}", json={"status": "completed"}))
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "completed"
@@ -0,0 +1,66 @@
+"""GET /events/{event_id}/bookings/export: every matching booking, in either format"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from app import exports
+from app.exports import EXPORT_COLUMNS
+
+HEADER = [column.key for column in EXPORT_COLUMNS]
+
+
+@pytest.fixture
+def export(client, run, monkeypatch):
+    """Export with a small batch size, so the rows span several cursor batches"""
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 3)
+
+    def export(event: dict, export_format: str, **filters):
+        response = run(client.get(
+            f"/events/{event['event_id']}/bookings/export", params={"format": export_format, **filters},
+        ))
+        assert response.status_code == 200, response.text
+        assert response.headers["content-disposition"] == (
+            f'attachment; filename="event-{event["event_id"]}-bookings.{export_format}"'
+        )
+        return response.text
+    return export
+
+
+@pytest.fixture
+def exported_event(make_event, book, client, run):
+    """An event with eight bookings, one of them cancelled, and their ids"""
+    event = make_event()
+    ids = [book(event, email=f"export{n}@example.com").json()["id"] for n in range(8)]
+    cancelled = run(client.patch("/bookings/status", json={"status": "cancelled", "booking_ids": [ids[3]]}))
+    assert cancelled.status_code == 200, cancelled.text
+    return event, ids
+
+
+def test_csv_export_has_a_header_and_every_booking(export, exported_event):
+    event, ids = exported_event
+    rows = list(csv.reader(io.StringIO(export(event, "csv"))))
+    assert rows[0] == HEADER
+    assert [int(row[0]) for row in rows[1:]] == ids
+    assert all(len(row) == len(HEADER) for row in rows)
+
+    confirmed = list(csv.reader(io.StringIO(export(event, "csv", status="confirmed"))))
+    assert confirmed[0] == HEADER
+    assert [int(row[0]) for row in confirmed[1:]] == ids[:3] + ids[4:]
+
+
+def test_ndjson_export_has_one_object_per_booking(export, exported_event):
+    event, ids = exported_event
+    lines = export(event, "ndjson").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["id"] for record in records] == ids
+    assert all(list(record) == HEADER for record in records)
+    assert records[3]["status"] == "cancelled"
+
+
+def test_export_of_an_event_without_bookings(export, make_event):
+    event = make_event()
+    assert list(csv.reader(io.StringIO(export(event, "csv")))) == [HEADER]
+    assert export(event, "ndjson") == ""
@@ -0,0 +1,161 @@
+"""
+Seat holds: confirmation, expiry and the sweeper's release of seats
+
+The sweeper is run directly (HOLD_SWEEP_INTERVAL=0 keeps the background
+loop off during tests). Every test checks the event's counters against
+its bookings afterwards.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, update
+
+from app.database import AsyncSessionLocal, engine
+from app.holds import release_expired_holds
+from app.models import Booking, BookingStatus, Event, EventBookingStats, TicketType
+
+# Holds released by the scale test, 100k like a sold-out on-sale rush
+SCALE_HOLDS = int(os.getenv("TEST_SCALE_HOLDS", "100000"))
+
+
+def expire(*booking_ids: int):
+    """Move holds' expiry into the past, as time passing would"""
+    with engine.begin() as conn:
+        conn.execute(
+            update(Booking).where(Booking.id.in_(booking_ids))
+            .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+
+
+def sweep(run, now: datetime = None) -> int:
+    async def release():
+        async with AsyncSessionLocal() as db:
+            return await release_expired_holds(db, now=now)
+    return run(release())
+
+
+def counters(event: dict) -> dict:
+    """The event's counters next to the totals its bookings add up to"""
+    reserved = Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED])
+    confirmed = Booking.status == BookingStatus.CONFIRMED
+    of_event = Booking.event_id == event["event_id"]
+    with engine.connect() as conn:
+        return {
+            "booked_count": conn.scalar(select(Event.booked_count).where(Event.id == event["event_id"])),
+            "reserved": conn.scalar(select(func.coalesce(func.sum(Booking.quantity), 0)).where(of_event, reserved)),
+            "available": conn.scalar(
+                select(TicketType.availability_count).where(TicketType.id == event["ticket_type_id"])),
+            "confirmed_tickets": conn.scalar(
+                select(EventBookingStats.confirmed_tickets).where(EventBookingStats.event_id == event["event_id"])
+            ) or 0,
+            "confirmed": conn.scalar(select(func.coalesce(func.sum(Booking.quantity), 0)).where(of_event, confirmed)),
+        }
+
+
+def assert_consistent(event: dict, tickets: int):
+    state = counters(event)
+    assert state["booked_count"] == state["reserved"], state
+    assert state["available"] == tickets - state["reserved"], state
+    assert state["confirmed_tickets"] == state["confirmed"], state
+
+
+def booking_status(booking_id: int) -> BookingStatus:
+    with engine.connect() as conn:
+        return conn.scalar(select(Booking.status).where(Booking.id == booking_id))
+
+
+def test_hold_reserves_seats_until_confirmed(client, run, make_event, book):
+    event = make_event(capacity=10, tickets=10)
+    hold = book(event, quantity=4, hold=True)
+    assert hold.status_code == 201, hold.text
+    assert hold.json()["status"] == "pending"
+    assert counters(event)["booked_count"] == 4
+
+    confirmed = run(client.post(f"/bookings/{hold.json()['id']}/confirm"))
+    assert confirmed.status_code == 200, confirmed.text
+    assert confirmed.json()["status"] == "confirmed"
+    sweep(run)
+    assert booking_status(hold.json()["id"]) == BookingStatus.CONFIRMED
+    assert counters(event)["confirmed_tickets"] == 4
+    assert_consistent(event, tickets=10)
+
+
+def test_expired_hold_is_released_and_its_seats_restored(client, run, make_event, book):
+    event = make_event(capacity=5, tickets=5)
+    hold = book(event, quantity=5, hold=True).json()
+    assert book(event, quantity=1).status_code == 409  # sold out while held
+
+    expire(hold["id"])
+    late = run(client.post(f"/bookings/{hold['id']}/confirm"))
+    assert late.status_code == 409
+    assert "expired" in late.json()["detail"]
+
+    assert sweep(run) >= 1
+    assert booking_status(hold["id"]) == BookingStatus.CANCELLED
+    assert counters(event)["booked_count"] == 0
+    assert_consistent(event, tickets=5)
+
+    # The released seats can be booked again, and a second sweep finds nothing of ours
+    assert book(event, quantity=5).status_code == 201
+    sweep(run)
+    assert counters(event)["booked_count"] == 5
+    assert_consistent(event, tickets=5)
+
+
+def test_confirmations_racing_the_sweeper_end_confirmed_or_released(client, run, make_event, book):
+    event = make_event(capacity=200, tickets=200)
+    holds = [book(event, quantity=2, hold=True).json()["id"] for _ in range(40)]
+    # The sweeper's clock runs ahead, so every hold counts as expired to it
+    ahead = datetime.utcnow() + timedelta(days=1)
+
+    async def race():
+        async def sweeper():
+            async with AsyncSessionLocal() as db:
+                return await release_expired_holds(db, now=ahead, batch_size=5)
+        return await asyncio.gather(
+            sweeper(), *[client.post(f"/bookings/{booking_id}/confirm") for booking_id in holds],
+        )
+
+    released, *confirms = run(race())
+    statuses = [booking_status(booking_id) for booking_id in holds]
+    confirmed = sum(response.status_code == 200 for response in confirms)
+    assert statuses.count(BookingStatus.CONFIRMED) == confirmed
+    assert statuses.count(BookingStatus.CANCELLED) == len(holds) - confirmed
+    assert released >= len(holds) - confirmed
+    assert_consistent(event, tickets=200)
+
+
+def test_sweeper_releases_many_simultaneous_holds(client, run, make_event, book):
+    """SCALE_HOLDS expired holds on one event, next to live holds and confirmed bookings"""
+    live, confirmed = 20, 20
+    tickets = (SCALE_HOLDS + live + confirmed) * 2
+    event = make_event(capacity=tickets, tickets=tickets)
+    live_ids = [book(event, quantity=2, hold=True).json()["id"] for _ in range(live)]
+    for _ in range(confirmed):
+        assert book(event, quantity=2).status_code == 201
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Booking), [
+            {"event_id": event["event_id"], "venue_id": event["venue_id"],
+             "ticket_type_id": event["ticket_type_id"], "customer_name": "Rush Fan",
+             "customer_email": f"rush{n}@example.com", "quantity": 2, "total_amount": 100.0,
+             "status": BookingStatus.PENDING, "confirmation_code": f"RUSH{event['event_id']}-{n}",
+             "booking_date": now - timedelta(minutes=15), "expires_at": now - timedelta(seconds=1 + n % 600)}
+            for n in range(SCALE_HOLDS)
+        ])
+        # The booking engine would have claimed these seats when the holds were made
+        conn.execute(update(Event).where(Event.id == event["event_id"])
+                     .values(booked_count=Event.booked_count + SCALE_HOLDS * 2))
+        conn.execute(update(TicketType).where(TicketType.id == event["ticket_type_id"])
+                     .values(availability_count=TicketType.availability_count - SCALE_HOLDS * 2))
+    assert_consistent(event, tickets)
+
+    assert sweep(run) >= SCALE_HOLDS
+    state = counters(event)
+    assert state["booked_count"] == (live + confirmed) * 2
+    assert state["confirmed_tickets"] == confirmed * 2
+    assert_consistent(event, tickets)
+    assert {booking_status(booking_id) for booking_id in live_ids} == {BookingStatus.PENDING}
@@ -0,0 +1,141 @@
+"""Idempotency-Key handling of POST requests"""
+
+import asyncio
+import json
+import uuid
+
+from sqlalchemy import func, select
+
+from app.database import engine
+from app.idempotency import REPLAYED_HEADER, IdempotencyMiddleware
+from app.models import Booking, Event
+
+
+def booking_body(event: dict, quantity: int = 2) -> dict:
+    return {
+        "event_id": event["event_id"], "venue_id": event["venue_id"],
+        "ticket_type_id": event["ticket_type_id"], "customer_name": "Retrying Fan",
+        "customer_email": "retry@example.com", "quantity": quantity,
+    }
+
+
+def event_bookings(event: dict) -> tuple:
+    """(number of bookings, booked_count) of an event"""
+    with engine.connect() as conn:
+        bookings = conn.scalar(select(func.count(Booking.id)).where(Booking.event_id == event["event_id"]))
+        booked = conn.scalar(select(Event.booked_count).where(Event.id == event["event_id"]))
+    return bookings, booked
+
+
+def test_concurrent_retries_create_one_booking(client, run, make_event):
+    event = make_event()
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    async def retries():
+        return await asyncio.gather(*[
+            client.post("/bookings", json=booking_body(event), headers=headers) for _ in range(10)
+        ])
+
+    responses = run(retries())
+    assert {response.status_code for response in responses} == {201}
+    assert len({response.json()["id"] for response in responses}) == 1
+    replayed = [response for response in responses if response.headers.get(REPLAYED_HEADER) == "true"]
+    assert len(replayed) == 9
+    assert event_bookings(event) == (1, 2)
+
+
+def test_replay_after_completion(client, run, make_event):
+    event = make_event()
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    first = run(client.post("/bookings", json=booking_body(event), headers=headers))
+    assert first.status_code == 201, first.text
+    assert REPLAYED_HEADER not in first.headers
+
+    again = run(client.post("/bookings", json=booking_body(event), headers=headers))
+    assert again.status_code == 201
+    assert again.headers[REPLAYED_HEADER] == "true"
+    assert again.json() == first.json()
+    assert event_bookings(event) == (1, 2)
+
+
+def test_same_key_with_a_different_body_is_rejected(client, run, make_event):
+    event = make_event()
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    assert run(client.post("/bookings", json=booking_body(event), headers=headers)).status_code == 201
+
+    other = run(client.post("/bookings", json=booking_body(event, quantity=3), headers=headers))
+    assert other.status_code == 422
+    assert "different request" in other.json()["detail"]
+    assert event_bookings(event) == (1, 2)
+
+
+def test_client_errors_are_replayed(client, run, make_event):
+    event = make_event(capacity=1)
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    sold_out = run(client.post("/bookings", json=booking_body(event, quantity=2), headers=headers))
+    assert sold_out.status_code in (400, 409)
+
+    # Only 5xx responses release the key; a client error is the request's answer
+    again = run(client.post("/bookings", json=booking_body(event, quantity=2), headers=headers))
+    assert again.status_code == sold_out.status_code
+    assert again.headers[REPLAYED_HEADER] == "true"
+
+
+def test_ndjson_import_with_a_key_streams_and_replays(client, run):
+    headers = {"Idempotency-Key": str(uuid.uuid4()), "Content-Type": "application/x-ndjson"}
+    rows = [
+        json.dumps({"name": f"Streamed Hall {uuid.uuid4().hex[:8]}", "address": "1 Stream St",
+                    "city": "Streamville", "capacity": 100}).encode() + b"\n"
+        for _ in range(3)
+    ]
+
+    async def chunks(rows):
+        for row in rows:
+            yield row
+
+    first = run(client.post("/venues/bulk", content=chunks(rows), headers=headers))
+    assert first.status_code == 200, first.text
+    assert first.json()["inserted"] == 3
+
+    again = run(client.post("/venues/bulk", content=chunks(rows), headers=headers))
+    assert again.headers[REPLAYED_HEADER] == "true"
+    assert again.json() == first.json()
+
+    different = run(client.post("/venues/bulk", content=chunks(rows[:2]), headers=headers))
+    assert different.status_code == 422
+
+
+def test_body_reaches_the_handler_unbuffered(app, run):
+    """Every chunk is handed on before the next one is received"""
+    seen = []
+
+    async def handler(scope, receive, send):
+        while True:
+            message = await receive()
+            seen.append(message["body"])
+            if not message["more_body"]:
+                break
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    chunks = [b"a" * 10, b"b" * 10, b"c" * 10]
+    received = []
+
+    async def receive():
+        # The handler must have seen every chunk received so far
+        assert seen == chunks[:len(received)]
+        received.append(chunks[len(received)])
+        return {"type": "http.request", "body": received[-1], "more_body": len(received) < len(chunks)}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/stream", "query_string": b"",
+        "headers": [(b"idempotency-key", uuid.uuid4().hex.encode())],
+    }
+    run(IdempotencyMiddleware(handler)(scope, receive, send))
+    assert seen == chunks
+    assert sent[0]["status"] == 201
@@ -0,0 +1,229 @@
+"""
+Upgrading databases created by earlier releases to the head revision
+
+An old database is simulated by stripping the latest schema back to what
+a release created: the tables, columns and indexes added since are
+dropped, and alembic_version records the release's revision. Release 0
+predates the migrations and has no version at all.
+"""
+
+import io
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+
+from app import migrations
+from app.database import Base
+from schema_migrations import SchemaVersionError
+
+HEAD = ScriptDirectory.from_config(migrations.alembic_config()).get_current_head()
+
+# Indexes of the original schema; every other index came from a revision
+BASELINE_INDEXES = {
+    "ix_venues_id", "ix_venues_name", "ix_venues_city",
+    "ix_events_id", "ix_events_name", "ix_events_event_date",
+    "ix_ticket_types_id", "ix_ticket_types_name",
+    "ix_bookings_id", "ix_bookings_customer_email", "ix_bookings_confirmation_code",
+}
+BASELINE_TABLES = {"venues", "events", "ticket_types", "bookings"}
+
+# Indexes on the baseline tables added by each revision
+REVISION_INDEXES = {
+    3: {
+        "ix_events_venue_id_event_date", "ix_events_status_event_date", "ix_bookings_event_id",
+        "ix_bookings_event_id_status", "ix_bookings_venue_id_status", "ix_bookings_ticket_type_id",
+        "ix_bookings_status_booking_date",
+    },
+    4: {"ix_bookings_booking_date", "ix_bookings_status"},
+    5: {"ix_bookings_status_expires_at"},
+    6: {"ix_events_name_lower"},
+}
+# Tables added by each revision
+REVISION_TABLES = {
+    2: {"event_booking_stats", "venue_booking_stats"},
+    7: {"code_sequences", "idempotency_keys"},
+}
+
+
+def index_names(conn, table: str) -> set:
+    # SQLAlchemy's SQLite reflection skips expression indexes such as lower(name)
+    return set(conn.exec_driver_sql(
+        f"SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = '{table}'"
+    ).scalars())
+
+
+def revision(conn):
+    return MigrationContext.configure(conn).get_current_revision()
+
+
+def legacy_database(path, version: int, version_table: str = "alembic_version"):
+    """
+    Engine on a database shaped like release `version` left it, with a few bookings
+
+    Releases before alembic recorded their version in the numbered
+    runner's schema_version table; pass version_table="schema_version".
+    """
+    kept = BASELINE_INDEXES | {
+        index for step, indexes in REVISION_INDEXES.items() if step <= version for index in indexes
+    }
+    dropped_tables = {table for step, tables in REVISION_TABLES.items() if step > version for table in tables}
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        for table in BASELINE_TABLES:
+            for index in index_names(conn, table):
+                if index not in kept and not index.startswith("sqlite_autoindex"):
+                    conn.exec_driver_sql(f"DROP INDEX {index}")
+        if version < 5:
+            conn.exec_driver_sql("ALTER TABLE bookings DROP COLUMN expires_at")
+        if version < 1:
+            conn.exec_driver_sql("ALTER TABLE events DROP COLUMN booked_count")
+        for table in dropped_tables:
+            conn.exec_driver_sql(f"DROP TABLE {table}")
+        assert set(inspect(conn).get_table_names()) <= set(Base.metadata.tables)
+
+        if version_table == "schema_version":
+            conn.exec_driver_sql("CREATE TABLE schema_version (version INTEGER NOT NULL)")
+            conn.exec_driver_sql(f"INSERT INTO schema_version (version) VALUES ({version})")
+        elif version > 0:
+            conn.exec_driver_sql("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)")
+            conn.exec_driver_sql(f"INSERT INTO alembic_version (version_num) VALUES ('{version:04d}')")
+
+        conn.exec_driver_sql(
+            "INSERT INTO venues (id, name, address, city, country, capacity) "
+            "VALUES (1, 'Old Hall', '1 Old St', 'Oldtown', 'USA', 500)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO events (id, name, event_date, duration_minutes, venue_id, max_capacity, status) "
+            "VALUES (1, 'Old Event', '2099-01-01 20:00:00', 120, 1, 500, 'active')"
+        )
+        # Releases from version 1 on keep the counter current as they book, and from 2 the aggregates
+        if version >= 1:
+            conn.exec_driver_sql("UPDATE events SET booked_count = 5 WHERE id = 1")
+        conn.exec_driver_sql(
+            "INSERT INTO ticket_types (id, name, price, availability_count) VALUES (1, 'Standard', 10.0, 100)"
+        )
+        for booking_id, quantity, status in [(1, 2, "CONFIRMED"), (2, 3, "PENDING"), (3, 5, "CANCELLED")]:
+            conn.exec_driver_sql(
+                "INSERT INTO bookings (id, event_id, venue_id, ticket_type_id, customer_name, customer_email, "
+                "quantity, total_amount, status, confirmation_code, booking_date) "
+                f"VALUES ({booking_id}, 1, 1, 1, 'Old Customer', 'old@example.com', {quantity}, "
+                f"{quantity * 10.0}, '{status}', 'OLD{booking_id:07d}', '2024-01-01 12:00:00')"
+            )
+        if version >= 2:
+            conn.exec_driver_sql(
+                "INSERT INTO event_booking_stats (event_id, venue_id, confirmed_tickets, confirmed_revenue, "
+                "confirmed_bookings) VALUES (1, 1, 2, 20.0, 1)"
+            )
+    return engine
+
+
+def assert_schema_matches_models(conn):
+    """Every table, column and index of the models exists in the database"""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        assert inspector.has_table(table.name), table.name
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert {column.name for column in table.columns} <= columns, table.name
+        assert {index.name for index in table.indexes} <= index_names(conn, table.name), table.name
+
+
+@pytest.mark.parametrize("version", [0, 1, 2, 5])
+def test_upgrade_legacy_database_to_head(tmp_path, version):
+    engine = legacy_database(tmp_path / f"v{version}.db", version)
+    with engine.connect() as conn:
+        migrations.upgrade(conn)
+        assert migrations.check_schema_version(conn) == HEAD
+        assert_schema_matches_models(conn)
+
+        # Counters and aggregates are backfilled from, or kept in step with, the existing bookings
+        assert conn.exec_driver_sql("SELECT booked_count FROM events WHERE id = 1").scalar() == 5
+        assert conn.exec_driver_sql(
+            "SELECT confirmed_tickets, confirmed_bookings FROM event_booking_stats WHERE event_id = 1"
+        ).one() == (2, 1)
+    engine.dispose()
+
+
+@pytest.mark.filterwarnings("ignore:.*expression-based index")
+def test_revisions_reproduce_the_models(tmp_path):
+    engine = legacy_database(tmp_path / "v0.db", 0)
+    with engine.connect() as conn:
+        migrations.upgrade(conn)
+        # Autogenerate finds nothing the revisions left out
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+    engine.dispose()
+
+
+def test_downgrade_to_the_original_schema_and_back(tmp_path):
+    engine = legacy_database(tmp_path / "v0.db", 0)
+    with engine.connect() as conn:
+        migrations.upgrade(conn)
+        command.downgrade(migrations.alembic_config(conn), "base")
+        assert revision(conn) is None
+        assert set(inspect(conn).get_table_names()) == BASELINE_TABLES | {"alembic_version"}
+        assert "booked_count" not in {column["name"] for column in inspect(conn).get_columns("events")}
+        for table in BASELINE_TABLES:
+            assert index_names(conn, table) - BASELINE_INDEXES <= {f"sqlite_autoindex_{table}_1"}, table
+        conn.commit()
+
+        migrations.upgrade(conn)
+        assert revision(conn) == HEAD
+        assert_schema_matches_models(conn)
+    engine.dispose()
+
+
+def test_new_database_is_created_at_head(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    with engine.connect() as conn:
+        migrations.upgrade(conn)
+        migrations.upgrade(conn)
+        assert migrations.check_schema_version(conn) == HEAD
+        assert_schema_matches_models(conn)
+    engine.dispose()
+
+
+def test_startup_check_rejects_an_old_schema(tmp_path):
+    engine = legacy_database(tmp_path / "v2.db", 2)
+    with engine.connect() as conn:
+        with pytest.raises(SchemaVersionError, match="alembic upgrade head"):
+            migrations.check_schema_version(conn)
+    engine.dispose()
+
+
+def test_startup_check_accepts_a_newer_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'newer.db'}")
+    with engine.connect() as conn:
+        migrations.upgrade(conn)
+        conn.exec_driver_sql("UPDATE alembic_version SET version_num = '9999'")
+        assert migrations.check_schema_version(conn) == "9999"
+    engine.dispose()
+
+
+def test_schema_version_of_the_numbered_runner_is_carried_over(tmp_path):
+    # The numbered runner created tables without a step on every run
+    engine = legacy_database(tmp_path / "runner-v5.db", 5, version_table="schema_version")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn, tables=[Base.metadata.tables["code_sequences"]])
+    with engine.connect() as conn:
+        with pytest.raises(SchemaVersionError):
+            migrations.check_schema_version(conn)
+        conn.rollback()
+        migrations.upgrade(conn)
+        assert revision(conn) == HEAD
+        assert_schema_matches_models(conn)
+    engine.dispose()
+
+
+def test_offline_mode_prints_the_sql():
+    output = io.StringIO()
+    config = Config(str(migrations.ALEMBIC_INI), output_buffer=output)
+    command.upgrade(config, "0005:head", sql=True)
+    sql = output.getvalue()
+    assert "CREATE INDEX ix_events_name_lower ON events (lower(name))" in sql
+    assert "CREATE TABLE idempotency_keys" in sql
+    assert "UPDATE alembic_version SET version_num='0007'" in sql
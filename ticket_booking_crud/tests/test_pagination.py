@@ -0,0 +1,80 @@
+"""Walking cursor pages: every row exactly once, also while rows are inserted"""
+
+from datetime import datetime, timedelta
+
+from app.pagination import NEXT_CURSOR_HEADER
+
+
+def walk(client, run, url: str, limit: int, between_pages=None) -> list:
+    """Follow X-Next-Cursor from the first page to the last and return every row"""
+    rows, cursor, pages = [], None, 0
+    while True:
+        response = run(client.get(url, params={"limit": limit, **({"cursor": cursor} if cursor else {})}))
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page) <= limit
+        rows += page
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return rows
+        assert len(page) == limit
+        if between_pages:
+            between_pages(pages)
+
+
+def test_booking_pages_return_every_booking_once_under_inserts(client, run, make_event, book):
+    event = make_event()
+    existing = [book(event).json()["id"] for _ in range(10)]
+    inserted = []
+
+    def insert(page):
+        inserted.append(book(event).json()["id"])
+
+    rows = walk(client, run, f"/events/{event['event_id']}/bookings", limit=3, between_pages=insert)
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids))
+    # New bookings sort after the cursor, so the walk picks them all up too
+    assert ids == existing + inserted
+    assert walk(client, run, f"/events/{event['event_id']}/bookings", limit=100) == rows
+
+
+def test_event_pages_keep_their_place_when_earlier_rows_appear(client, run, make_event):
+    event = make_event()
+    venue_id = event["venue_id"]
+    now = datetime.utcnow()
+
+    def create(name: str, days: int) -> int:
+        created = run(client.post("/events", json={
+            "name": f"{event['name']} {name}", "event_date": (now + timedelta(days=days)).isoformat(),
+            "venue_id": venue_id, "max_capacity": 100,
+        }))
+        assert created.status_code == 201, created.text
+        return created.json()["id"]
+
+    # Several events share a date, so pages must break ties by id
+    for days in (5, 5, 5, 10, 40, 40, 50, 60):
+        create(f"Day {days}", days)
+    before = walk(client, run, f"/venues/{venue_id}/events", limit=100)
+    assert len(before) == 9
+
+    added_late = []
+
+    def insert(page):
+        # One event before everything already read, one after
+        create(f"Early {page}", 1)
+        added_late.append(create(f"Late {page}", 90 + page))
+
+    rows = walk(client, run, f"/venues/{venue_id}/events", limit=2, between_pages=insert)
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids))
+    assert ids == [row["id"] for row in before] + added_late
+    dates_and_ids = [(row["event_date"], row["id"]) for row in rows]
+    assert dates_and_ids == sorted(dates_and_ids)
+
+
+def test_invalid_cursor_is_rejected(client, run, make_event):
+    event = make_event()
+    for cursor in ("not-a-cursor", "WzFd"):
+        response = run(client.get(f"/venues/{event['venue_id']}/events", params={"cursor": cursor}))
+        assert response.status_code == 400, cursor
@@ -0,0 +1,147 @@
+"""
+SQL statements per request against the routes' query budgets
+
+With the enforce_query_budgets fixture a request over its route's
+query_budget() fails with a 500, as it does in CI. Counts are read from
+the Server-Timing header, so they cover everything the request ran.
+"""
+
+import re
+
+import pytest
+from fastapi import Depends, HTTPException
+from sqlalchemy import select
+
+from app.database import engine, get_db
+from app.models import Event
+from app.query_stats import query_budget
+
+
+def budgeted_routes(app):
+    """(method, path, budget) of every route declaring a query budget"""
+    for route in app.routes:
+        for dependency in getattr(route, "dependencies", []):
+            budget = getattr(dependency.dependency, "max_queries", None)
+            if budget is not None:
+                yield sorted(route.methods)[0], route.path, budget
+
+
+def query_count(response) -> int:
+    match = re.search(r'desc="(\d+) queries"', response.headers["server-timing"])
+    return int(match.group(1))
+
+
+@pytest.fixture
+def budget_event(make_event, book):
+    """An event with a few bookings, and the path parameters to request it by"""
+    event = make_event(capacity=100)
+    booking = None
+    for _ in range(3):
+        booking = book(event)
+        assert booking.status_code == 201, booking.text
+    return event, {
+        "venue_id": event["venue_id"],
+        "event_id": event["event_id"],
+        "code": booking.json()["confirmation_code"],
+    }
+
+
+def test_every_budgeted_route_is_within_budget(app, client, run, enforce_query_budgets, budget_event):
+    event, params = budget_event
+    routes = list(budgeted_routes(app))
+    assert ("POST", "/bookings", 8) in routes
+
+    for method, path, budget in routes:
+        if method == "POST":
+            response = run(client.post(path, json={
+                "event_id": event["event_id"], "venue_id": event["venue_id"],
+                "ticket_type_id": event["ticket_type_id"], "customer_name": "Budget Fan",
+                "customer_email": "budget@example.com",
+            }))
+        elif path == "/bookings/search":
+            response = run(client.get(path, params={"event": event["name"]}))
+        else:
+            response = run(client.get(path.format(**params)))
+        assert response.status_code < 500, f"{method} {path}: {response.text}"
+        assert query_count(response) <= budget, f"{method} {path}"
+
+
+@pytest.mark.parametrize("url", [
+    "/events/{event_id}?include=venue",
+    "/events/{event_id}?include=ticket_types",
+    "/events/{event_id}?include=bookings",
+    "/events/{event_id}?include=venue,ticket_types,bookings",
+    "/venues/{venue_id}?include=events",
+])
+def test_includes_run_a_fixed_number_of_queries(client, run, enforce_query_budgets, make_event, book, url):
+    counts = []
+    for related in (1, 20):
+        event = make_event(capacity=100)
+        for _ in range(related):
+            assert book(event).status_code == 201
+        for _ in range(related - 1):
+            encore = run(client.post("/events", json={
+                "name": f"{event['name']} Encore", "event_date": "2099-01-01T20:00:00",
+                "venue_id": event["venue_id"], "max_capacity": 100,
+            }))
+            assert encore.status_code == 201, encore.text
+        response = run(client.get(url.format(**event), params={"limit": 1000}))
+        assert response.status_code == 200, response.text
+        counts.append(query_count(response))
+    assert counts[0] == counts[1]
+
+
+def test_n_plus_one_over_budget_fails_when_enforced(app, client, run, enforce_query_budgets, make_event):
+    @app.get("/test/venues/{venue_id}/events-one-by-one", dependencies=[Depends(query_budget(2))])
+    async def events_one_by_one(venue_id: int, db=Depends(get_db)):
+        ids = (await db.scalars(select(Event.id).where(Event.venue_id == venue_id))).all()
+        return [(await db.get(Event, event_id)).name for event_id in ids]
+
+    try:
+        event = make_event()
+        response = run(client.get(f"/test/venues/{event['venue_id']}/events-one-by-one"))
+        assert response.status_code == 200, response.text
+        assert query_count(response) == 2
+
+        for day in range(1, 4):
+            created = run(client.post("/events", json={
+                "name": f"{event['name']} Night {day}", "event_date": f"2099-01-0{day}T20:00:00",
+                "venue_id": event["venue_id"], "max_capacity": 100,
+            }))
+            assert created.status_code == 201, created.text
+        response = run(client.get(f"/test/venues/{event['venue_id']}/events-one-by-one"))
+        assert response.status_code == 500
+        assert "Query budget exceeded" in response.json()["detail"]
+    finally:
+        app.router.routes.pop()
+
+
+def test_write_over_budget_is_rolled_back(app, client, run, enforce_query_budgets, make_event):
+    @app.post("/test/venues/{venue_id}/renamed-one-by-one", dependencies=[Depends(query_budget(2))])
+    async def rename_one_by_one(venue_id: int, db=Depends(get_db)):
+        try:
+            ids = (await db.scalars(select(Event.id).where(Event.venue_id == venue_id))).all()
+            for event_id in ids:
+                (await db.get(Event, event_id)).name += " (Renamed)"
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to rename events: {e}")
+
+    try:
+        event = make_event()
+        created = run(client.post("/events", json={
+            "name": f"{event['name']} Encore", "event_date": "2099-01-01T20:00:00",
+            "venue_id": event["venue_id"], "max_capacity": 100,
+        }))
+        assert created.status_code == 201, created.text
+
+        response = run(client.post(f"/test/venues/{event['venue_id']}/renamed-one-by-one"))
+        assert response.status_code == 500
+        assert "Query budget exceeded" in response.json()["detail"]
+        # The commit was refused, so nothing was renamed
+        with engine.connect() as conn:
+            names = conn.scalars(select(Event.name).where(Event.venue_id == event["venue_id"])).all()
+        assert sorted(names) == [event["name"], f"{event['name']} Encore"]
+    finally:
+        app.router.routes.pop()
@@ -0,0 +1,40 @@
+"""
+EXPLAIN QUERY PLAN of the hot queries
+
+Every query the API issues per request must be served by an index: no
+full table scans, and no temp B-tree sorts of a whole filtered set just
+to return one page. benchmarks/query_plans.py runs the same checks on
+1M bookings.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from app import migrations
+from benchmarks.query_plans import FULL_SCAN, TEMP_SORT, explain, hot_queries, seed
+
+HOT_QUERIES = hot_queries()
+
+
+@pytest.fixture(scope="module")
+def plans_engine(tmp_path_factory):
+    """A migrated database with 20k bookings"""
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    with engine.connect() as conn:
+        migrations.upgrade(conn)
+    seed(20_000, 2_000, 100, engine=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "statement, allow_sort", [(statement, allow_sort) for _, statement, allow_sort in HOT_QUERIES],
+    ids=[name for name, _, _ in HOT_QUERIES],
+)
+def test_hot_query_uses_an_index(plans_engine, statement, allow_sort):
+    with plans_engine.connect() as conn:
+        plan = explain(conn, statement)
+    assert plan
+    assert not [line for line in plan if FULL_SCAN.match(line)], plan
+    if not allow_sort:
+        assert not [line for line in plan if TEMP_SORT.search(line)], plan
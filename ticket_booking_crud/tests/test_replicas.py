@@ -0,0 +1,110 @@
+"""
+Read-replica routing with a SQLite copy of the primary as the replica
+
+The replica is configured per test by pointing app.replicas at a copy of
+the test database. Reads go through GET /events/{id}/bookings, which is
+not response-cached, so the number of bookings returned tells which
+database served the request: the replica is copied before the last
+booking is made.
+"""
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app import replicas
+from app.database import DATABASE_URL, create_async_db_engine, get_async_url
+from app.replicas import STICKY_COOKIE, ReadYourWritesMiddleware
+
+
+@pytest.fixture
+def replica(monkeypatch, tmp_path, run):
+    """Configure a SQLite replica file, never copied yet"""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_async_db_engine(get_async_url(url))
+    monkeypatch.setattr(replicas, "DATABASE_REPLICA_URL", url)
+    monkeypatch.setattr(replicas, "replica_engine", engine)
+    monkeypatch.setattr(replicas, "ReplicaSessionLocal", async_sessionmaker(
+        bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False,
+    ))
+    # Measure the lag on every request
+    monkeypatch.setattr(replicas, "REPLICA_LAG_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(replicas, "_lag_check", (0.0, None))
+    monkeypatch.setattr(replicas, "_sqlite_copied_from", None)
+    yield engine
+    run(engine.dispose())
+
+
+@pytest.fixture
+def sticky_client(app, run):
+    """Client through ReadYourWritesMiddleware, which keeps the cookies it is sent"""
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=ReadYourWritesMiddleware(app)), base_url="http://test",
+    )
+    yield client
+    run(client.aclose())
+
+
+@pytest.fixture
+def copied_event(replica, make_event, book, run):
+    """An event with one booking on both databases and a second on the primary only"""
+    event = make_event()
+    assert book(event).status_code == 201
+    assert run(replicas.sync_sqlite_replica())
+    assert book(event).status_code == 201
+    return event
+
+
+def booking_count(client, run, event, **kwargs) -> int:
+    response = run(client.get(f"/events/{event['event_id']}/bookings", **kwargs))
+    assert response.status_code == 200, response.text
+    return len(response.json())
+
+
+def test_reads_are_served_from_the_replica(client, run, copied_event):
+    assert booking_count(client, run, copied_event) == 1
+
+
+def test_client_reads_its_own_writes_from_the_primary(sticky_client, client, run, copied_event):
+    created = run(sticky_client.post("/bookings", json={
+        "event_id": copied_event["event_id"], "venue_id": copied_event["venue_id"],
+        "ticket_type_id": copied_event["ticket_type_id"], "customer_name": "Sticky Fan",
+        "customer_email": "sticky@example.com",
+    }))
+    assert created.status_code == 201, created.text
+    assert STICKY_COOKIE in created.cookies
+
+    # The writer sees all three bookings; everyone else reads the copy
+    assert booking_count(sticky_client, run, copied_event) == 3
+    assert booking_count(client, run, copied_event) == 1
+
+
+def test_failed_writes_do_not_pin_the_client(sticky_client, run, copied_event):
+    rejected = run(sticky_client.post("/bookings", json={
+        "event_id": copied_event["event_id"], "venue_id": copied_event["venue_id"],
+        "ticket_type_id": copied_event["ticket_type_id"], "customer_name": "Sold Out Fan",
+        "customer_email": "sold-out@example.com", "quantity": 10_000,
+    }))
+    assert rejected.status_code >= 400
+    assert STICKY_COOKIE not in rejected.cookies
+    assert booking_count(sticky_client, run, copied_event) == 1
+
+
+def test_expired_or_malformed_cookie_reads_from_the_replica(client, run, copied_event):
+    for value in ("0", "not-a-time"):
+        assert booking_count(client, run, copied_event, cookies={STICKY_COOKIE: value}) == 1
+
+
+def test_lagging_replica_falls_back_to_the_primary(monkeypatch, client, run, copied_event):
+    primary_modified = replicas._last_modified(replicas._sqlite_path(DATABASE_URL))
+    lag = replicas.REPLICA_MAX_LAG_SECONDS + 60
+    monkeypatch.setattr(replicas, "_sqlite_copied_from", primary_modified - lag)
+    assert run(replicas.replica_lag()) == pytest.approx(lag, abs=1)
+    assert booking_count(client, run, copied_event) == 2
+
+
+def test_replica_never_copied_falls_back_to_the_primary(replica, client, run, make_event, book):
+    event = make_event()
+    assert book(event).status_code == 201
+    assert run(replicas.replica_lag()) is None
+    assert booking_count(client, run, event) == 1
@@ -0,0 +1,121 @@
+"""
+Cached event and venue reads: conditional requests and invalidation
+
+Responses are cached in the in-process MemoryBackend. The X-Cache header
+tells whether a response came from the cache, and every write must bump
+the tag versions its changes affect, so the next read is fresh.
+"""
+
+from app.response_cache import CACHE_STATUS_HEADER, response_cache
+
+
+def get(client, run, url: str, **kwargs):
+    response = run(client.get(url, **kwargs))
+    assert response.status_code in (200, 304), response.text
+    return response
+
+
+def test_etag_answers_a_matching_if_none_match_with_304(client, run, make_event):
+    url = f"/events/{make_event()['event_id']}"
+    first = get(client, run, url)
+    assert first.headers[CACHE_STATUS_HEADER] == "MISS"
+    etag = first.headers["ETag"]
+
+    cached = get(client, run, url)
+    assert cached.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert cached.headers["ETag"] == etag
+    assert cached.json() == first.json()
+
+    for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+        not_modified = get(client, run, url, headers={"If-None-Match": if_none_match})
+        assert not_modified.status_code == 304, if_none_match
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+
+    assert get(client, run, url, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_update_event_serves_the_new_version(client, run, make_event):
+    event = make_event()
+    url = f"/events/{event['event_id']}"
+    etag = get(client, run, url).headers["ETag"]
+    listed = get(client, run, f"/venues/{event['venue_id']}/events")
+
+    updated = run(client.put(url, json={"name": f"{event['name']} (Moved)"}))
+    assert updated.status_code == 200, updated.text
+
+    fresh = get(client, run, url, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers[CACHE_STATUS_HEADER] == "MISS"
+    assert fresh.json()["name"] == f"{event['name']} (Moved)"
+    relisted = get(client, run, f"/venues/{event['venue_id']}/events")
+    assert relisted.headers["ETag"] != listed.headers["ETag"]
+    assert [row["name"] for row in relisted.json()] == [f"{event['name']} (Moved)"]
+
+
+def test_delete_event_serves_the_new_version(client, run, make_event):
+    event = make_event()
+    url = f"/events/{event['event_id']}"
+    get(client, run, url)
+    assert [row["id"] for row in get(client, run, f"/venues/{event['venue_id']}?include=events").json()["events"]] \
+        == [event["event_id"]]
+
+    assert run(client.delete(url)).status_code == 200
+
+    assert run(client.get(url)).status_code == 404
+    venue = get(client, run, f"/venues/{event['venue_id']}?include=events")
+    assert venue.headers[CACHE_STATUS_HEADER] == "MISS"
+    assert venue.json()["events"] == []
+
+
+def test_update_venue_serves_the_new_version(client, run, make_event):
+    event = make_event()
+    venue_url = f"/venues/{event['venue_id']}"
+    event_url = f"/events/{event['event_id']}?include=venue"
+    get(client, run, venue_url)
+    assert get(client, run, event_url).json()["venue"]["name"] == f"{event['name']} Hall"
+
+    updated = run(client.put(venue_url, json={"name": f"{event['name']} Arena"}))
+    assert updated.status_code == 200, updated.text
+
+    assert get(client, run, venue_url).json()["name"] == f"{event['name']} Arena"
+    # The event embeds its venue, so it depends on the venues tag too
+    assert get(client, run, event_url).json()["venue"]["name"] == f"{event['name']} Arena"
+
+
+def test_delete_venue_serves_the_new_version(client, run):
+    created = run(client.post("/venues", json={
+        "name": "Short-Lived Hall", "address": "1 Test St", "city": "Testville", "capacity": 10,
+    }))
+    assert created.status_code == 201, created.text
+    url = f"/venues/{created.json()['id']}"
+    assert get(client, run, url).headers[CACHE_STATUS_HEADER] == "MISS"
+    assert get(client, run, url).headers[CACHE_STATUS_HEADER] == "HIT"
+
+    assert run(client.delete(url)).status_code == 200
+    assert run(client.get(url)).status_code == 404
+
+
+def test_unreadable_tag_versions_serve_uncached(monkeypatch, client, run, make_event, caplog):
+    event = make_event()
+    url = f"/events/{event['event_id']}"
+    etag = get(client, run, url).headers["ETag"]
+
+    async def unavailable(tags):
+        raise ConnectionError("cache down")
+
+    monkeypatch.setattr(response_cache.backend, "get_versions", unavailable)
+    updated = run(client.put(url, json={"name": f"{event['name']} (Renamed)"}))
+    assert updated.status_code == 200, updated.text
+
+    # Without versions a stale entry cannot be told apart, so nothing is read from or written to the cache
+    for _ in range(2):
+        response = get(client, run, url)
+        assert response.headers[CACHE_STATUS_HEADER] == "MISS"
+        assert response.json()["name"] == f"{event['name']} (Renamed)"
+    assert "Response cache version lookup failed" in caplog.text
+
+    # ETags are still sent, so conditional requests keep working
+    assert get(client, run, url, headers={"If-None-Match": etag}).status_code == 200
+    assert get(client, run, url, headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+
@@ -0,0 +1,62 @@
+"""GET /bookings/search name filters"""
+
+import pytest
+
+from app import search
+
+
+def search_ids(client, run, **params) -> set:
+    response = run(client.get("/bookings/search", params=params))
+    assert response.status_code == 200, response.text
+    return {booking["id"] for booking in response.json()}
+
+
+def test_event_filter_prefers_exact_name(client, run, make_event, book):
+    exact = make_event(name="Search Gala")
+    longer = make_event(name="Search Gala Encore")
+    exact_booking = book(exact).json()["id"]
+    longer_booking = book(longer).json()["id"]
+
+    assert search_ids(client, run, event="search gala") == {exact_booking}
+    assert search_ids(client, run, event="SEARCH GALA EN") == {longer_booking}
+    assert search_ids(client, run, event="Search G") == {exact_booking, longer_booking}
+
+
+def test_event_filter_without_match_returns_nothing(client, run, make_event, book):
+    book(make_event(name="Search Recital"))
+    assert search_ids(client, run, event="Recital") == set()
+    assert search_ids(client, run, event="Search Recitals") == set()
+
+
+def test_event_filter_sees_events_created_after_a_search(client, run, make_event, book):
+    assert search_ids(client, run, event="Search Premiere") == set()
+    booking = book(make_event(name="Search Premiere")).json()["id"]
+    assert search_ids(client, run, event="Search Premiere") == {booking}
+
+
+def test_venue_and_ticket_type_filters_match_substrings(client, run, make_event, book):
+    event = make_event(name="Search Matinee")
+    booking = book(event).json()["id"]
+    assert search_ids(client, run, venue="matinee hall") == {booking}
+    assert search_ids(client, run, ticket_type="standard", event="Search Matinee") == {booking}
+    assert search_ids(client, run, ticket_type="VIP", event="Search Matinee") == set()
+
+
+@pytest.mark.parametrize("max_resolved_ids", [500, 1])
+def test_filters_match_the_same_bookings_past_the_resolved_id_limit(
+    monkeypatch, client, run, make_event, book, max_resolved_ids,
+):
+    # With a limit of 1 every filter below resolves to a subquery instead of an id list
+    monkeypatch.setattr(search, "MAX_RESOLVED_IDS", max_resolved_ids)
+    name = f"Search Crossover {max_resolved_ids} Gala"
+    exact = [book(make_event(name=name)).json()["id"] for _ in range(2)]
+    annex = book(make_event(name=f"{name} Hall Annex")).json()["id"]
+
+    assert search_ids(client, run, event=name.lower()) == set(exact)
+    assert search_ids(client, run, event=name[:-2]) == {*exact, annex}
+    assert search_ids(client, run, venue=f"{name} Hall".upper()) == set(exact)
+    assert search_ids(client, run, venue=f"crossover {max_resolved_ids} gala hall") == {*exact, annex}
+    # LIKE wildcards in the filter are matched literally
+    assert search_ids(client, run, venue=f"crossover {max_resolved_ids} gala_hall") == set()
+    assert search_ids(client, run, venue=f"crossover {max_resolved_ids} gala%annex") == set()
+    assert search_ids(client, run, ticket_type="STANDARD", event=name) == set(exact)
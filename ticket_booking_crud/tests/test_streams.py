@@ -0,0 +1,81 @@
+"""
+Availability stream: bookings reach subscribers as coalesced events
+
+httpx's ASGI transport buffers whole responses, so the test reads the
+SSE generator the endpoint returns instead of an open HTTP connection.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.availability import availability_broker
+from app.streams import sse_stream
+
+
+@pytest.fixture
+def slow_broker(monkeypatch):
+    """Publish at most once a second, so a burst of bookings lands in one update"""
+    monkeypatch.setattr(availability_broker, "min_interval", 1.0)
+    return availability_broker
+
+
+def parse(message: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in message.strip().splitlines())
+    return {**fields, "data": json.loads(fields["data"])}
+
+
+def test_bookings_reach_the_subscriber_as_one_coalesced_event(client, run, make_event, slow_broker):
+    event = make_event(capacity=10)
+
+    async def scenario():
+        stream = sse_stream(slow_broker, event["event_id"], "availability", heartbeat=30)
+        try:
+            assert (await anext(stream)).startswith("retry:")
+            first = parse(await anext(stream))
+            loads = slow_broker.loads
+
+            for quantity in (1, 2, 3):
+                created = await client.post("/bookings", json={
+                    "event_id": event["event_id"], "venue_id": event["venue_id"],
+                    "ticket_type_id": event["ticket_type_id"], "customer_name": "Stream Fan",
+                    "customer_email": "stream@example.com", "quantity": quantity,
+                })
+                assert created.status_code == 201, created.text
+            update = parse(await asyncio.wait_for(anext(stream), 5))
+            return first, update, slow_broker.loads - loads
+        finally:
+            await stream.aclose()
+
+    first, update, loads = run(scenario())
+    assert first["event"] == "availability"
+    assert first["data"]["booked_tickets"] == 0
+    # Three notifications, one reload and one message with all of them
+    assert update["event"] == "availability"
+    assert int(update["id"]) == int(first["id"]) + 1
+    assert update["data"]["booked_tickets"] == 6
+    assert update["data"]["available_tickets"] == 4
+    assert loads == 1
+    assert slow_broker.subscribers == 0
+
+
+def test_deleted_event_ends_the_stream_with_gone(client, run, make_event):
+    event = make_event()
+
+    async def scenario():
+        stream = sse_stream(availability_broker, event["event_id"], "availability", heartbeat=30)
+        try:
+            await anext(stream)
+            await anext(stream)
+            assert (await client.delete(f"/events/{event['event_id']}")).status_code == 200
+            gone = parse(await asyncio.wait_for(anext(stream), 5))
+            with pytest.raises(StopAsyncIteration):
+                await anext(stream)
+            return gone
+        finally:
+            await stream.aclose()
+
+    gone = run(scenario())
+    assert gone["event"] == "gone"
+    assert gone["data"] == {"id": event["event_id"]}
@@ -0,0 +1,93 @@
+"""PATCH /bookings/status: batch transitions, released seats and aggregates"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.database import engine
+from app.models import Booking, BookingStatus
+from tests.test_aggregates import assert_matches_rebuild
+from tests.test_bookings import inventory
+
+
+def statuses(booking_ids: list) -> dict:
+    with engine.connect() as conn:
+        return dict(conn.execute(select(Booking.id, Booking.status).where(Booking.id.in_(booking_ids))).all())
+
+
+def change(client, run, **batch):
+    response = run(client.patch("/bookings/status", json=batch))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_mixed_batch_reports_counts_by_previous_status(client, run, make_event, book):
+    event = make_event(capacity=100, tickets=1000, price=10.0)
+    pending = [book(event, quantity=2, hold=True).json()["id"] for _ in range(2)]
+    confirmed = [book(event, quantity=3).json()["id"] for _ in range(3)]
+    already_cancelled = book(event, quantity=1).json()["id"]
+    change(client, run, status="cancelled", booking_ids=[already_cancelled])
+    missing = max(pending + confirmed) + 1000
+
+    result = change(client, run, status="cancelled",
+                    booking_ids=pending + confirmed[:2] + [already_cancelled, missing, pending[0]])
+    assert result == {
+        "status": "cancelled", "requested": 6, "updated": 4,
+        "updated_from": {"pending": 2, "confirmed": 2}, "unchanged": 2, "tickets_released": 10,
+    }
+    assert statuses(pending + confirmed) == {
+        **{booking_id: BookingStatus.CANCELLED for booking_id in pending + confirmed[:2]},
+        confirmed[2]: BookingStatus.CONFIRMED,
+    }
+
+
+def test_cancelling_confirmed_bookings_releases_seats_and_aggregates(client, run, make_event, book):
+    event = make_event(capacity=12, tickets=50, price=25.0)
+    confirmed = [book(event, quantity=quantity).json()["id"] for quantity in (4, 6)]
+    hold = book(event, quantity=2, hold=True).json()["id"]
+    assert inventory(event) == {"booked_count": 12, "seats": 12, "available": 38}
+    assert book(event).status_code == 409
+
+    result = change(client, run, status="cancelled", event_id=event["event_id"], current_status="confirmed")
+    assert result["updated_from"] == {"confirmed": 2}
+    assert result["tickets_released"] == 10
+    assert inventory(event) == {"booked_count": 2, "seats": 2, "available": 48}
+    assert statuses([hold]) == {hold: BookingStatus.PENDING}
+    assert assert_matches_rebuild(event["venue_id"])["events"] == {}
+
+    # The released seats can be booked again
+    assert book(event, quantity=10).status_code == 201
+    assert book(event).status_code == 409
+
+
+def test_invalid_transitions_are_left_alone(client, run, make_event, book):
+    event = make_event(capacity=100, tickets=1000)
+    confirmed = book(event, quantity=2).json()["id"]
+    cancelled = book(event, quantity=3).json()["id"]
+    change(client, run, status="cancelled", booking_ids=[cancelled])
+    hold, expired = (book(event, hold=True).json()["id"] for _ in range(2))
+    with engine.begin() as conn:
+        conn.execute(
+            update(Booking).where(Booking.id == expired)
+            .values(expires_at=datetime.utcnow() - timedelta(minutes=1))
+        )
+    before = inventory(event)
+
+    # Only the live hold can be confirmed; cancelled bookings are never reopened
+    result = change(client, run, status="confirmed", booking_ids=[confirmed, cancelled, hold, expired])
+    assert result["updated_from"] == {"pending": 1}
+    assert result["unchanged"] == 3
+    assert result["tickets_released"] == 0
+    assert statuses([confirmed, cancelled, hold, expired]) == {
+        confirmed: BookingStatus.CONFIRMED, cancelled: BookingStatus.CANCELLED,
+        hold: BookingStatus.CONFIRMED, expired: BookingStatus.PENDING,
+    }
+    assert inventory(event) == before
+    assert_matches_rebuild(event["venue_id"])
+
+    # Transitions no booking could make are rejected outright
+    for batch in ({"status": "pending", "booking_ids": [confirmed]},
+                  {"status": "confirmed", "event_id": event["event_id"], "current_status": "cancelled"}):
+        rejected = run(client.patch("/bookings/status", json=batch))
+        assert rejected.status_code == 400, batch
+    assert statuses([confirmed, cancelled]) == {confirmed: BookingStatus.CONFIRMED, cancelled: BookingStatus.CANCELLED}
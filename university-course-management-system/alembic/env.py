@@ -0,0 +1,11 @@
+"""Alembic environment of the university schema"""
+
+import importlib
+
+from schema_migrations import run_migrations
+
+# The app's package name is not a valid identifier, so it cannot be imported with `import`
+database = importlib.import_module("university-course-management-system.database")
+importlib.import_module("university-course-management-system.models")  # registers the tables
+
+run_migrations(database.Base.metadata, database.engine)
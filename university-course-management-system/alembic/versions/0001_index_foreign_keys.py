@@ -0,0 +1,32 @@
+"""Index enrollments.course_id and courses.professor_id
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 07:40:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Course rosters and professors' courses filter on these
+INDEXES = [
+    ("ix_courses_professor_id", "courses", ["professor_id"]),
+    ("ix_enrollments_course_id", "enrollments", ["course_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -1,12 +1,24 @@
+import os
+
 from fastapi import FastAPI
 
-from . import models
+from app_metrics import load_instrument_app
+from schema_migrations import check_schema
+
+# Prometheus metrics, unless METRICS_ENABLED turns them off (see app_metrics/loader.py)
+instrument_app = load_instrument_app(__name__)
+
 from . import database
 from .routers import student, course, professor
 
 app = FastAPI(title="University Course Management System")
 
-models.Base.metadata.create_all(bind=database.engine)
+# Migrations run out of band (see alembic.ini); startup only checks the revision
+with database.engine.connect() as conn:
+    check_schema(conn, os.path.join(os.path.dirname(__file__), "alembic.ini"))
+
+if instrument_app is not None:
+    instrument_app(app, "university", engines={"primary": database.engine})
 
 app.include_router(student.router)
 app.include_router(course.router)
@@ -36,7 +36,7 @@ class Courses(Base):
     name: Mapped[str] = mapped_column(String, nullable=False)
     code: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
     credits: Mapped[int] = mapped_column(Integer, nullable=False)
-    professor_id: Mapped[int] = mapped_column(Integer, ForeignKey("professors.id"), nullable=False)
+    professor_id: Mapped[int] = mapped_column(Integer, ForeignKey("professors.id"), index=True, nullable=False)
     max_capacity: Mapped[int] = mapped_column(Integer, nullable=False)
 
     professor: Mapped["Professors"] = relationship(back_populates="courses")
@@ -46,7 +46,7 @@ class Enrollments(Base):
     __tablename__ = "enrollments"
 
     student_id: Mapped[int] = mapped_column(Integer, ForeignKey("students.id"), primary_key=True)
-    course_id: Mapped[int] = mapped_column(Integer, ForeignKey("courses.id"), primary_key=True)
+    course_id: Mapped[int] = mapped_column(Integer, ForeignKey("courses.id"), primary_key=True, index=True)
     enrollment_date: Mapped[date] = mapped_column(Date, nullable=False, server_default=func.current_date())
     grade: Mapped[float] = mapped_column(Float)
 